@@ -40,101 +40,6 @@ function resolveBackend() {
   }
 }
 
-function hasBinFiles(dir) {
-  try {
-    const list = fssync.readdirSync(dir);
-    return list.some(n => n.toLowerCase().endsWith('.bin'));
-  } catch { return false; }
-}
-
-function waitForUnallocReady(baseDir, { timeoutMs = 120000, intervalMs = 800 } = {}) {
-  const unalloc = path.join(baseDir, 'p2_fs_unalloc');
-  const start = Date.now();
-  return new Promise((resolve, reject) => {
-    const tick = () => {
-      if (Date.now() - start > timeoutMs) {
-        return reject(new Error('waitForUnallocReady: timeout'));
-      }
-      if (fssync.existsSync(unalloc) && hasBinFiles(unalloc)) {
-        return resolve({ baseDir, unalloc });
-      }
-      setTimeout(tick, intervalMs);
-    };
-    tick();
-  });
-}
-
-function runVolCarver(baseDir, sender) {
-  volCarverStarted = true;
-  volCarverDone = false;
-
-  const be = resolveBackend();
-
-  return new Promise((resolve) => {
-    let cmd, args, opts;
-    if (be.mode === 'py') {
-      cmd = be.exe;
-      args = [be.engineMain, 'carve-vol', baseDir, '--ffmpeg-dir', be.ffmpegDir];
-      opts = {
-        cwd: be.backendDir,
-        shell: true,
-        env: { ...process.env, PYTHONPATH: __dirname, PYTHONIOENCODING: 'utf-8', PYTHONUTF8: '1' },
-      };
-    } else {
-      cmd = be.exe;
-      args = ['carve-vol', baseDir, '--ffmpeg-dir', be.ffmpegDir];
-      opts = {
-        cwd: be.backendDir,
-        shell: false,
-        env: process.env,
-      };
-    }
-
-    const child = spawn(cmd, args, opts);
-
-    child.on('error', (err) => {
-      console.error('[spawn error:runVolCarver]', err);
-      BrowserWindow.fromWebContents(sender)?.webContents
-        .send('recovery-error', String(err?.message || err));
-    });
-
-    child.stderr.on('data', (b) => console.warn('[vol_carver]', b.toString()));
-
-    child.on('close', async (code) => {
-      const win = BrowserWindow.fromWebContents(sender);
-      try {
-        const idxPath = path.join(baseDir, 'carved_index.json');
-        const raw = await fs.readFile(idxPath, 'utf-8');
-        const j = JSON.parse(raw);
-        const items = (j?.items || []).flatMap(it => {
-          const rebuilt = (it.rebuilt || [])
-            .filter(x => (x?.rebuilt && x?.ok) || x?.raw)
-            .map(x => ({
-              name: path.basename(x.rebuilt || x.raw),
-              path: (x.rebuilt || x.raw),
-              size: Number(x?.probe?.format?.size || 0),
-              _remuxFailed: !x?.rebuilt || !x?.ok
-            }));
-          const jdr = (it.jdr || [])
-            .filter(x => x?.ok && x?.rebuilt)
-            .map(x => ({
-              name: path.basename(x.rebuilt),
-              path: x.rebuilt,
-              size: Number(x?.probe?.format?.size || 0)
-            }));
-          return [...rebuilt, ...jdr];
-        });
-        win?.webContents.send('recovery-results', items);
-      } catch (e) {
-        console.warn('[vol_carver] no carved_index yet:', e?.message || e);
-      }
-
-      volCarverDone = true;
-      resolve(code);
-    });
-  });
-}
-
 if (process.env.NODE_ENV === 'development') {
   try {
     require('electron-reload')(__dirname, {
@@ -153,31 +58,10 @@ if (process.env.NODE_ENV === 'development') {
   }
 }
 
-const isSafeTempDir = (dir) => {
-  if (!dir) return false;
-  const tmp= path.resolve(os.tmpdir());
-  const abs = path.resolve(dir);
-  return abs.startsWith(tmp) && path.basename(abs).startsWith('Virex_');
-}
-
-const removeDirWithRetry = (dir, tries = 2, delay = 150) => {
-  const attempt = () => {
-    try {
-      if (dir && fssync.existsSync(dir)) {
-        fssync.rmSync(dir, { recursive: true, force: true });
-      }
-    } catch (e) {
-      if (tries > 0) setTimeout(() => removeDirWithRetry(dir, tries - 1, delay), delay);
-    }
-  };
-  attempt();
-}
-
 let mainWindow = null;
 let currentRecoveryProc = null;
 let currentTempDir = null;
 let isCancellingRecovery = false;
-let volCarverDone = false;   
 
 function openFileDialog(extensions) {
   return dialog.showOpenDialog({
@@ -435,6 +319,8 @@ ipcMain.handle('start-recovery', async (event, e01FilePath) => {
   // 2) (통과 시) 기존 파이썬 spawn 로직 실행
   return await new Promise((resolve, reject) => {
     let abortedByDiskFull = false;
+    // 파티션별 진행률 (여러 파티션이 동시에 처리되면 각자 processed/total 을 보냄)
+    const partProgress = new Map();
     let sentResults = false;
     const be = resolveBackend();
 
@@ -471,11 +357,7 @@ ipcMain.handle('start-recovery', async (event, e01FilePath) => {
           currentTempDir = data.tempDir;
           const win = BrowserWindow.fromWebContents(event.sender);
           win?.webContents.send('analysis-path', data.tempDir);
-
-          waitForUnallocReady(currentTempDir)
-            .then(() => runVolCarver(currentTempDir, event.sender))
-            .catch(err => console.warn('[waitForUnallocReady]', err.message));
-
+          // 비할당 영역 카빙은 엔진이 파티션 처리 중에 함께 수행 (결과는 완료 후 carved_index.json 으로 읽음)
           return;
         }
 
@@ -507,11 +389,15 @@ ipcMain.handle('start-recovery', async (event, e01FilePath) => {
 
         // 진행률
         if (data.processed !== undefined && data.total !== undefined) {
+          // partition 키별로 최신 값을 보관하고 전체 합계를 전달 (파티션 간 값이 섞이지 않도록)
+          partProgress.set(data.partition ?? null, { processed: data.processed, total: data.total });
+          let processed = 0, total = 0;
+          for (const p of partProgress.values()) {
+            processed += p.processed;
+            total += p.total;
+          }
           const win = BrowserWindow.fromWebContents(event.sender);
-          win?.webContents.send('recovery-progress', {
-            processed: data.processed,
-            total: data.total
-          });
+          win?.webContents.send('recovery-progress', { processed, total });
           return;
         }
 
@@ -581,8 +467,6 @@ ipcMain.handle('start-recovery', async (event, e01FilePath) => {
       console.log("[Debug] python exited with code : ", code);
       rl.close();
 
-      volCarverStarted = false;
-
       const win = BrowserWindow.fromWebContents(event.sender);
 
       if (!sentResults) {
@@ -595,11 +479,9 @@ ipcMain.handle('start-recovery', async (event, e01FilePath) => {
       currentRecoveryProc = null;
       isCancellingRecovery = false;
 
+      // 취소/디스크 부족으로 중단돼도 임시 폴더(Virex_...)는 남겨 둠
+      // → 같은 이미지로 다시 시작하면 일지(journal)로 이어서 처리. 삭제는 캐시 비우기에서만
       if (wasCancelling) {
-        const dir = currentTempDir;
-        if (isSafeTempDir(dir)) {
-          setTimeout(() => removeDirWithRetry(dir), 50);
-        }
         currentTempDir = null;
 
         try { win?.webContents.send('recovery-cancelled'); } catch {}
@@ -607,10 +489,6 @@ ipcMain.handle('start-recovery', async (event, e01FilePath) => {
       }
 
       if (wasDiskFull) {
-        const dir = currentTempDir;
-        if (isSafeTempDir(dir)) {
-          setTimeout(() => removeDirWithRetry(dir), 50);
-        }
         currentTempDir = null;
 
         return reject(new Error('aborted: disk_full'));
@@ -871,13 +749,16 @@ ipcMain.handle('readCarvedIndex', async (_event, outDir) => {
   return { items: [] };
 });
 
+// 중단된 작업의 재개용 폴더까지 모두 버리는 명시적 삭제 (진행 중인 작업 폴더는 제외)
 ipcMain.handle('clear-cache', async () => {
   const tempDir = os.tmpdir();
   const files = fssync.readdirSync(tempDir);
+  const activeDir = currentRecoveryProc && currentTempDir ? path.resolve(currentTempDir) : null;
   let deleted = 0;
   for (const file of files) {
     if (file.startsWith('Virex_')) {
       const fullPath = path.join(tempDir, file);
+      if (activeDir && path.resolve(fullPath) === activeDir) continue;
       try {
         fssync.rmSync(fullPath, { recursive: true, force: true });
         deleted++;
@@ -897,18 +778,25 @@ ipcMain.handle('dialog:openSupportedFile', async () => {
 // 볼륨 슬랙 리스트
 ipcMain.handle('listCarvedDir', async (_event, baseDir) => {
   if (!baseDir) return [];
-  const carvedDir = path.join(baseDir, 'carved');
-
+  // 카빙 결과는 baseDir/carved 또는 파티션/공백 영역별 하위 폴더(pN_fs_unalloc/carved, volume_gaps/carved)에 있음
+  const carvedDirs = [path.join(baseDir, 'carved')];
   try {
-    const entries = await fs.readdir(carvedDir, { withFileTypes: true });
+    for (const ent of await fs.readdir(baseDir, { withFileTypes: true })) {
+      if (ent.isDirectory()) carvedDirs.push(path.join(baseDir, ent.name, 'carved'));
+    }
+  } catch {}
 
+  try {
     const out = [];
-    for (const ent of entries) {
-      if (!ent.isFile()) continue;                    
-      const abs = path.join(carvedDir, ent.name);
-      const st = await fs.stat(abs).catch(() => null);  
-      if (!st || st.size <= 0) continue;               
-      out.push({ name: ent.name, path: abs, size: st.size });
+    for (const carvedDir of carvedDirs) {
+      const entries = await fs.readdir(carvedDir, { withFileTypes: true }).catch(() => []);
+      for (const ent of entries) {
+        if (!ent.isFile()) continue;
+        const abs = path.join(carvedDir, ent.name);
+        const st = await fs.stat(abs).catch(() => null);
+        if (!st || st.size <= 0) continue;
+        out.push({ name: ent.name, path: abs, size: st.size });
+      }
     }
 
     out.sort((a, b) => a.name.localeCompare(b.name, 'ko'));
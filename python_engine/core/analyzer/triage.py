@@ -0,0 +1,233 @@
+import os
+import struct
+
+from python_engine.core.analyzer.basic_info_parser import format_timestamp
+from python_engine.core.recovery.mp4.get_slack import normal_data_end
+from python_engine.core.recovery.utils.unit import bytes_to_unit
+
+# 인벤토리(트리아지) 모드: 원본을 쓰거나 ffmpeg 를 돌리지 않고
+# 각 형식 검사에 필요한 헤더/테이블만 읽어 손상 여부와 슬랙 크기를 추정
+
+MOOV_MAX = 64 * 1024 * 1024
+SEARCH_CHUNK = 4 * 1024 * 1024
+JDR_SIGNATURE = b'1VEJ'
+
+def _u32be(b, off=0):
+    return struct.unpack_from('>I', b, off)[0]
+
+def _u32le(b, off=0):
+    return struct.unpack_from('<I', b, off)[0]
+
+def _result(fmt):
+    return {"format": fmt, "damaged": False, "reasons": [], "normal_end": None, "slack_bytes": 0}
+
+def _finish(res, size):
+    if res["normal_end"] is not None and 0 < res["normal_end"] <= size:
+        res["slack_bytes"] = size - res["normal_end"]
+    return res
+
+def triage_mp4(read, size):
+    # 최상위 박스 헤더만 따라가며 moov/mdat 위치 확인 → moov 의 stco/co64 로 정상 데이터 끝 계산
+    res = _result("MP4")
+    off, moov, mdats, boxes = 0, None, [], []
+    while off + 8 <= size:
+        hdr = read(off, 16)
+        if len(hdr) < 8:
+            break
+        box_size, box_type, header_len = _u32be(hdr), hdr[4:8], 8
+        if box_size == 1:
+            if len(hdr) < 16:
+                break
+            box_size, header_len = struct.unpack_from('>Q', hdr, 8)[0], 16
+        elif box_size == 0:
+            box_size = size - off
+        if box_size < header_len or not all(32 <= c < 127 for c in box_type):
+            break
+        name = box_type.decode('ascii')
+        boxes.append(name)
+        if off + box_size > size:
+            res["damaged"] = True
+            res["reasons"].append(f"[잘림] '{name}' 박스가 파일 끝을 넘음")
+            break
+        if name == 'moov':
+            moov = (off, box_size)
+        elif name == 'mdat':
+            mdats.append((off, box_size, header_len))
+        off += box_size
+
+    res["boxes"] = boxes
+    if not boxes or boxes[0] != 'ftyp':
+        res["damaged"] = True
+        res["reasons"].append("[헤더 손상] 'ftyp' 박스 없음")
+    if moov is None:
+        res["damaged"] = True
+        res["reasons"].append("[필수 박스 누락] 'moov' 없음")
+
+    moov_bytes = None
+    if moov is not None and moov[1] <= MOOV_MAX:
+        moov_bytes = read(moov[0], moov[1])
+    if moov is not None or mdats:
+        res["normal_end"] = normal_data_end(
+            size, moov[0] if moov else None, moov[1] if moov else None, moov_bytes, mdats
+        )
+    return _finish(res, size)
+
+def triage_avi(read, size):
+    # RIFF 선언 크기 + 최상위 청크(LIST hdrl/movi, idx1) 헤더만 확인, RIFF 밖은 슬랙
+    res = _result("AVI")
+    hdr = read(0, 12)
+    if len(hdr) < 12 or hdr[:4] not in (b'RIFF', b'RF64'):
+        res["damaged"] = True
+        res["reasons"].append("[헤더 손상] 'RIFF/RF64' 시그니처 누락")
+        return res
+
+    riff_end = _u32le(hdr, 4) + 8
+    if riff_end > size:
+        res["damaged"] = True
+        res["reasons"].append(f"[푸터 손상] 파일 잘림(선언 크기 > 실제 크기) 선언={riff_end}, 실제={size}")
+
+    chunks = []
+    off, limit = 12, min(riff_end, size)
+    while off + 8 <= limit:
+        ch = read(off, 12)
+        if len(ch) < 8:
+            break
+        fourcc, ch_size = ch[:4], _u32le(ch, 4)
+        name = fourcc.decode('ascii', 'replace')
+        if fourcc == b'LIST' and len(ch) >= 12:
+            name = f"LIST:{ch[8:12].decode('ascii', 'replace')}"
+        chunks.append(name)
+        off += 8 + ch_size + (ch_size & 1)
+
+    res["chunks"] = chunks
+    if 'LIST:movi' not in chunks:
+        res["damaged"] = True
+        res["reasons"].append("[필수 청크 누락] 'movi' 청크 없음")
+    if 'idx1' not in chunks:
+        res["reasons"].append("'idx1' 인덱스 없음")
+    res["normal_end"] = limit
+    return _finish(res, size)
+
+def _find_signature(read, size, sig):
+    # 앞에서부터 청크 단위로 시그니처 검색 (경계 겹침 처리)
+    off, keep = 0, len(sig) - 1
+    while off < size:
+        buf = read(off, min(SEARCH_CHUNK, size - off))
+        if not buf:
+            break
+        idx = buf.find(sig)
+        if idx != -1:
+            return off + idx
+        if len(buf) <= keep:
+            break
+        off += len(buf) - keep
+    return -1
+
+def triage_jdr(read, size):
+    # extract_jdr.classify_normal_slack_regions 와 같은 1VEJ 블록 테이블 규칙으로 슬랙 시작 위치만 계산
+    res = _result("JDR")
+    offset = _find_signature(read, size, JDR_SIGNATURE)
+    if offset == -1:
+        res["reasons"].append("'1VEJ' 블록 테이블 없음")
+        return res
+
+    count_offset = offset + len(JDR_SIGNATURE)
+    b = read(count_offset, 4)
+    if len(b) < 4:
+        res["damaged"] = True
+        res["reasons"].append("[테이블 손상] 블록 개수 위치가 범위를 벗어남")
+        return res
+    total_blocks = _u32le(b)
+    res["blocks"] = total_blocks
+
+    table_off = count_offset + 4 + 0x14 * (total_blocks - 1)
+    b = read(table_off, 4) if 0 <= table_off < size else b""
+    if len(b) < 4:
+        res["damaged"] = True
+        res["reasons"].append("[테이블 손상] 마지막 블록 오프셋 위치가 범위를 벗어남")
+        return res
+
+    ptr = (_u32le(b) >> 4) + 0xC8
+    b = read(ptr, 4) if ptr < size else b""
+    if len(b) < 4:
+        res["damaged"] = True
+        res["reasons"].append("[테이블 손상] 슬랙 offset 위치가 범위를 벗어남")
+        return res
+
+    slack_offset = _u32le(b)
+    if slack_offset > size:
+        res["damaged"] = True
+        res["reasons"].append("[테이블 손상] 슬랙 시작 offset 이 범위를 벗어남")
+        return res
+    res["normal_end"] = slack_offset
+    return _finish(res, size)
+
+TRIAGE_HANDLERS = {
+    '.mp4': triage_mp4,
+    '.avi': triage_avi,
+    '.jdr': triage_jdr,
+}
+
+def triage_entry(name, path, size, read, timestamps=None, category=None):
+    """
+    analysis.json 과 같은 형태의 항목 하나를 만듦 (slack_info 는 추정치, 복구 산출물 없음).
+    read(offset, size) 는 이미지 내 파일이든 로컬 파일이든 상관없음.
+    """
+    handler = TRIAGE_HANDLERS.get(os.path.splitext(name)[1].lower())
+    if handler is None or size <= 0:
+        tri = _result("Unknown")
+        tri["damaged"] = size <= 0
+        if size <= 0:
+            tri["reasons"].append("파일 크기가 0")
+    else:
+        try:
+            tri = handler(read, size)
+        except Exception as e:
+            tri = _result(handler.__name__.split('_')[-1].upper())
+            tri["damaged"] = True
+            tri["reasons"].append(f"구조 확인 실패: {e}")
+
+    timestamps = timestamps or {}
+    entry = {
+        'name': name,
+        'path': path,
+        'size': bytes_to_unit(size),
+        'slack_info': {
+            'recovered': False,
+            'video_path': None,
+            'image_path': None,
+            'is_image_fallback': False,
+            'estimated': True,
+            'slack_size': bytes_to_unit(tri["slack_bytes"]),
+            'slack_rate': round(tri["slack_bytes"] / size * 100, 2) if size else 0.0,
+        },
+        'analysis': {
+            'basic': {
+                'format': tri["format"],
+                'timestamps': {
+                    'created': format_timestamp(timestamps.get('crtime')),
+                    'modified': format_timestamp(timestamps.get('mtime')),
+                    'accessed': format_timestamp(timestamps.get('atime')),
+                },
+                'video_metadata': None,
+            },
+            'integrity': {'damaged': tri["damaged"], 'reasons': tri["reasons"]},
+            'structure': None,
+        },
+        'triage': tri,
+    }
+    if category:
+        entry['category'] = category
+    return entry
+
+def triage_local_file(file_path):
+    # 단일 영상 파일용
+    st = os.stat(file_path)
+    with open(file_path, 'rb') as f:
+        def _read(offset, n):
+            f.seek(offset)
+            return f.read(n)
+        return triage_entry(
+            os.path.basename(file_path), file_path, st.st_size, _read,
+            timestamps={'crtime': st.st_ctime, 'mtime': st.st_mtime, 'atime': st.st_atime}
+        )
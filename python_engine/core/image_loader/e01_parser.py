@@ -5,30 +5,156 @@ import logging
 import tempfile
 import shutil
 import json
+import hashlib
 import time
 import struct
-from io import BytesIO
+import sys
+import queue
+import threading
+from array import array
+from collections import OrderedDict
+from types import SimpleNamespace
+from concurrent.futures import ProcessPoolExecutor, as_completed, wait, FIRST_COMPLETED
+from concurrent.futures.process import BrokenProcessPool
+try:
+    import numpy as np
+except ImportError:  # numpy 미설치 환경에서는 순수 파이썬 경로 사용
+    np = None
+from python_engine.core.image_loader.read_ahead import ReadAhead
+from python_engine.core.image_loader.raw_image import RawImgInfo, is_raw_image, raw_segments
+from python_engine.core.image_loader.result_cache import content_digests, get_result_cache
+from python_engine.core.image_loader.journal import ExtractionJournal
+from python_engine.core.image_loader.image_verify import start_image_verify
 from python_engine.core.recovery.vol_recover import vol_carver
+from python_engine.core.recovery.vol_recover.extent_stream import ExtentStream
+from python_engine.core.recovery.vol_recover.sig_scan import SignatureScanner
 from python_engine.core.recovery.mp4.extract_slack import recover_mp4_slack
 from python_engine.core.recovery.avi.extract_slack import recover_avi_slack
 from python_engine.core.recovery.jdr.extract_jdr import recover_jdr
 from python_engine.core.analyzer.basic_info_parser import get_basic_info_with_meta
 from python_engine.core.analyzer.integrity import get_integrity_info
 from python_engine.core.analyzer.struc import get_structure_info
+from python_engine.core.analyzer.triage import triage_entry
 from python_engine.core.recovery.utils.unit import bytes_to_unit
+from python_engine.core.recovery.utils.hashing import HashingWriter, StreamHasher, hashing_enabled
+from python_engine.core.recovery.utils.disk_budget import (
+    DiskBudgetExceeded, budget_has_peers, get_disk_budget, init_disk_budget, set_budget_peers
+)
+from python_engine.core.recovery.utils.write_behind import open_output
 
 logger = logging.getLogger(__name__)
 VIDEO_EXTENSIONS = ('.mp4', '.avi', '.jdr')
+COPY_CHUNK_SIZE = 4 * 1024 * 1024
+INVENTORY_NAME = "inventory.json"
+# 이 이하로 여유 공간이 남으면 시작하지 않음 (그 외에는 임시 공간 예산 관리로 진행)
+TEMP_MIN_FREE = 2 * 1024 * 1024 * 1024
+
+# EWF 읽기 캐시: pyewf 는 32 KiB 청크 단위로 압축 해제
+EWF_CACHE_BLOCK = 32 * 1024
+EWF_CACHE_MB = 64
+EWF_CACHE_BYPASS = 1024 * 1024
+# 순차 읽기 선읽기 깊이(블록 수), 0 이면 비활성
+READ_AHEAD_DEPTH = 4
+# 0x00/0xFF 로만 채워진 블록 건너뛰기: 중간 구간은 이 길이 이상일 때만 제외 (VIREX_SKIP_UNIFORM=0 이면 비활성)
+SKIP_UNIFORM = os.environ.get("VIREX_SKIP_UNIFORM", "1").lower() not in ("0", "false", "no")
+SKIP_UNIFORM_MIN = 1024 * 1024
+UNIFORM_SCAN_CHUNK = 8 * 1024 * 1024
+ZERO_PAGE = bytes(UNIFORM_SCAN_CHUNK // 8)
+FF_PAGE = b"\xff" * (UNIFORM_SCAN_CHUNK // 8)
+# 파일 데이터 run 을 구해 이미지에서 직접 읽기 (0 이면 read_random 사용)
+USE_DATA_RUNS = os.environ.get("VIREX_DATA_RUNS", "1").lower() not in ("0", "false", "no")
+# VIREX_SCHEDULE=offset: 이미지 순차 접근이 되도록 첫 물리 클러스터 순서로 추출
+SCHEDULE_BY_OFFSET = os.environ.get("VIREX_SCHEDULE", "").lower() in ("offset", "physical")
+# FAT32 삭제 엔트리(0xE5)로 연속 저장된 영상을 먼저 복구하고 남은 빈 공간만 카빙 (0 이면 비활성)
+FAT_UNDELETE = os.environ.get("VIREX_FAT_UNDELETE", "1").lower() not in ("0", "false", "no")
+# 파티션 사이/뒤 미할당 볼륨 영역 카빙 (0 이면 비활성), 이보다 작은 공백은 무시
+CARVE_GAPS = os.environ.get("VIREX_CARVE_GAPS", "1").lower() not in ("0", "false", "no")
+GAP_MIN_MB = 1
+# 공백 영역은 크고 순차적이므로 큰 창 단위로 읽음
+GAP_WINDOW_MB = 16
+
+def _env_int(name, default):
+    val = os.environ.get(name, "").strip()
+    return int(val) if val.isdigit() else default
 
 class EWFImgInfo(pytsk3.Img_Info):
-    def __init__(self, ewf_handle):
+    def __init__(self, ewf_handle, cache_bytes=None, block_size=EWF_CACHE_BLOCK):
         self._ewf_handle = ewf_handle
+        # EWF 청크 정렬 블록 LRU 캐시 (메타데이터/FAT/디렉토리 등 작은 반복 읽기용)
+        if cache_bytes is None:
+            cache_bytes = _env_int("VIREX_EWF_CACHE_MB", EWF_CACHE_MB) * 1024 * 1024
+        self._block_size = block_size
+        self._cache_max_blocks = max(0, cache_bytes // block_size)
+        self._cache = OrderedDict()
+        self.cache_hits = 0
+        self.cache_misses = 0
+        # 선읽기(ReadAhead) 스레드와 핸들/캐시를 공유하므로 직렬화
+        self._lock = threading.RLock()
         super().__init__("", pytsk3.TSK_IMG_TYPE_EXTERNAL)
 
-    def read(self, offset, size):
+    def _read_raw(self, offset, size):
         self._ewf_handle.seek(offset)
         return self._ewf_handle.read(size)
 
+    def read(self, offset, size):
+        with self._lock:
+            return self._read_cached(offset, size)
+
+    def _read_cached(self, offset, size):
+        # 큰 순차 읽기는 캐시를 오염시키므로 우회
+        if not self._cache_max_blocks or size <= 0 or size >= EWF_CACHE_BYPASS:
+            return self._read_raw(offset, size)
+
+        bs = self._block_size
+        first = offset // bs
+        last = (offset + size - 1) // bs
+        parts = []
+        blk = first
+        while blk <= last:
+            data = self._cache.get(blk)
+            if data is not None:
+                self.cache_hits += 1
+                self._cache.move_to_end(blk)
+                parts.append(data)
+                blk += 1
+                continue
+
+            # 연속으로 없는 블록은 한 번에 읽음
+            run_end = blk + 1
+            while run_end <= last and run_end not in self._cache:
+                run_end += 1
+            raw = self._read_raw(blk * bs, (run_end - blk) * bs)
+            self.cache_misses += run_end - blk
+            for i in range(run_end - blk):
+                data = raw[i * bs:(i + 1) * bs]
+                if not data:
+                    break
+                self._cache_put(blk + i, data)
+                parts.append(data)
+            if len(raw) < (run_end - blk) * bs:
+                break
+            blk = run_end
+
+        buf = b"".join(parts)
+        start = offset - first * bs
+        return buf[start:start + size]
+
+    def _cache_put(self, blk, data):
+        self._cache[blk] = data
+        self._cache.move_to_end(blk)
+        while len(self._cache) > self._cache_max_blocks:
+            self._cache.popitem(last=False)
+
+    def cache_stats(self):
+        lookups = self.cache_hits + self.cache_misses
+        return {
+            "hits": self.cache_hits,
+            "misses": self.cache_misses,
+            "hit_rate": round(self.cache_hits / lookups, 4) if lookups else 0.0,
+            "blocks": len(self._cache),
+            "capacity_blocks": self._cache_max_blocks,
+        }
+
     def get_size(self):
         return self._ewf_handle.get_media_size()    
 
@@ -39,38 +165,110 @@ def open_image_file(img_path):
         ewf_handle = pyewf.handle()
         ewf_handle.open(ewf_paths)
         return EWFImgInfo(ewf_handle)
+    elif is_raw_image(img_path):
+        # dd 이미지(.001/.002… 분할 포함)는 mmap 으로 직접 매핑
+        return RawImgInfo(img_path)
     else:
         return pytsk3.Img_Info(img_path, pytsk3.TSK_IMG_TYPE_DETECT)
     
-def count_video_files(fs_info, path="/"):
-    count = 0
-    for entry in fs_info.open_dir(path=path):
-        name = entry.info.name.name
-        if name in (b'.', b'..') or entry.info.meta is None:
-            continue
-        name_str = name.decode('utf-8', 'ignore')
-        if entry.info.meta.type == pytsk3.TSK_FS_META_TYPE_DIR:
-            count += count_video_files(fs_info, path + "/" + name_str)
-        elif name_str.lower().endswith(VIDEO_EXTENSIONS):
-            count += 1
-    return count
+def _image_file_size(img_path):
+    # 분할 이미지(.E01/.E02…, .001/.002…)는 모든 세그먼트 파일 크기의 합
+    ext = os.path.splitext(img_path)[1].lower()
+    if ext in ('.e01', '.ex01'):
+        paths = pyewf.glob(img_path)
+    elif is_raw_image(img_path):
+        paths = raw_segments(img_path)
+    else:
+        paths = [img_path]
+    return sum(os.stat(p).st_size for p in paths)
+
+_DATA_ATTR_TYPES = (pytsk3.TSK_FS_ATTR_TYPE_DEFAULT, pytsk3.TSK_FS_ATTR_TYPE_NTFS_DATA)
+_RUN_SKIP_FLAGS = (pytsk3.TSK_FS_ATTR_RUN_FLAG_SPARSE | pytsk3.TSK_FS_ATTR_RUN_FLAG_FILLER)
+_ATTR_UNSUPPORTED = (pytsk3.TSK_FS_ATTR_RES | pytsk3.TSK_FS_ATTR_COMP | pytsk3.TSK_FS_ATTR_ENC)
+
+def file_data_runs(fs_info, file_obj):
+    """
+    파일 기본 데이터 속성의 run 목록을 한 번만 읽어 (이미지 절대 오프셋, 길이) 구간으로 변환.
+    인접 클러스터는 하나로 합치고 파일 크기에 맞춰 자름.
+    resident/압축/암호화/sparse 등 그대로 읽을 수 없는 경우 None (→ read_random 사용)
+    """
+    size = int(file_obj.info.meta.size)
+    block_size = fs_info.info.block_size
+    fs_offset = fs_info.info.offset
+    if size <= 0:
+        return None
 
-def read_file_content(file_obj):
+    for attr in file_obj:
+        if attr.info.type not in _DATA_ATTR_TYPES or attr.info.name:
+            continue
+        if int(attr.info.flags) & _ATTR_UNSUPPORTED:
+            return None
+
+        runs = []
+        remaining = size
+        for run in attr:
+            if remaining <= 0:
+                break
+            if int(run.flags) & _RUN_SKIP_FLAGS or run.len <= 0:
+                return None
+            off = fs_offset + run.addr * block_size
+            length = min(run.len * block_size, remaining)
+            if runs and runs[-1][0] + runs[-1][1] == off:
+                runs[-1][1] += length
+            else:
+                runs.append([off, length])
+            remaining -= length
+        if remaining > 0:
+            return None
+        return [(off, length) for off, length in runs]
+    return None
+
+class DataRunFile:
+    """
+    pytsk3 File 대신 넘겨 쓰는 래퍼. read_random 을 미리 구한 데이터 run 위에서
+    이미지 직접 읽기로 처리해 TSK 가 호출마다 클러스터 체인을 다시 따라가지 않게 함.
+    그 밖의 속성(info 등)은 원래 File 객체로 위임.
+    """
+
+    def __init__(self, file_obj, img_info, runs):
+        self._file = file_obj
+        self.info = file_obj.info
+        self.runs = runs
+        self._stream = ExtentStream(img_info, runs)
+
+    def read_random(self, offset, size):
+        return self._stream.read(offset, size)
+
+    def __getattr__(self, name):
+        return getattr(self._file, name)
+
+def extract_file_content(file_obj, out_path, chunk_size=COPY_CHUNK_SIZE, digests=None):
+    # 이미지 → 출력 파일로 고정 크기 청크 단위 스트리밍 복사 (파일 전체를 메모리에 올리지 않음)
+    # digests 에 dict 를 넘기면 복사하면서 계산한 MD5/SHA-256 을 채워 줌
     size = file_obj.info.meta.size
-    buffer = BytesIO()
     offset = 0
-    chunk_size = 4 * 1024 * 1024
-    while offset < size:
-        try:
-            chunk = file_obj.read_random(offset, min(chunk_size, size - offset))
-        except OSError as e:
-            logger.warning(f"read_random 오류 @ offset={offset}: {e}")
-            break
-        if not chunk:
-            break
-        buffer.write(chunk)
-        offset += len(chunk)
-    return buffer.getvalue()
+    depth = _env_int("VIREX_READAHEAD", READ_AHEAD_DEPTH)
+    budget = get_disk_budget()
+    if budget:
+        # 공간이 끝내 확보되지 않으면 DiskBudgetExceeded → 호출 측에서 이 파일만 실패 처리
+        # 추출은 중간 산출물을 정리하지 않으므로 다른 파티션이 동시에 처리 중일 때만 대기
+        budget.wait_for(size, "original", wait=budget_has_peers())
+    # 기록은 write-behind 스레드가 처리 → 다음 청크 읽기와 디스크 쓰기가 겹침
+    with open_output(out_path) as f, ReadAhead(file_obj.read_random, depth=depth, limit=size) as ra:
+        wf = HashingWriter(f) if digests is not None and hashing_enabled() else f
+        while offset < size:
+            try:
+                chunk = ra.read(offset, min(chunk_size, size - offset))
+            except OSError as e:
+                logger.warning(f"read_random 오류 @ offset={offset}: {e}")
+                break
+            if not chunk:
+                break
+            wf.write(chunk)
+            offset += len(chunk)
+        if wf is not f:
+            digests.update(wf.hexdigests())
+    return offset
 
 def build_analysis(basic_target_path, origin_video_path, meta):
     return {
@@ -79,13 +277,13 @@ def build_analysis(basic_target_path, origin_video_path, meta):
         'structure': get_structure_info(basic_target_path),
     }
 
-def handle_mp4_file(name, filepath, data, file_obj, output_dir, category):
+def handle_mp4_file(name, filepath, file_obj, output_dir, category):
     orig_dir = os.path.join(output_dir, category)
     os.makedirs(orig_dir, exist_ok=True)
 
     original_path = os.path.join(orig_dir, name)
-    with open(original_path, 'wb') as wf:
-        wf.write(data)
+    hashes = {}
+    written = extract_file_content(file_obj, original_path, digests=hashes)
 
     slack_dir = os.path.join(orig_dir, 'slack')
     os.makedirs(slack_dir, exist_ok=True)
@@ -127,20 +325,21 @@ def handle_mp4_file(name, filepath, data, file_obj, output_dir, category):
     return {
         'name': name,
         'path': filepath,
-        'size': bytes_to_unit(len(data)),
+        'size': bytes_to_unit(written),
+        'hashes': hashes,
         'origin_video': origin_video_path,
         'slack_info': slack_info,
         'analysis': build_analysis(analysis_target, origin_video_path, file_obj.info.meta)
     }
 
-def handle_avi_file(name, filepath, data, file_obj, output_dir, category):
+def handle_avi_file(name, filepath, file_obj, output_dir, category):
     video_stem = os.path.splitext(name)[0]
     orig_dir = os.path.join(output_dir, category, video_stem)
     os.makedirs(orig_dir, exist_ok=True)
 
     original_path = os.path.join(orig_dir, name)
-    with open(original_path, 'wb') as wf:
-        wf.write(data)
+    hashes = {}
+    written = extract_file_content(file_obj, original_path, digests=hashes)
 
     avi_info = recover_avi_slack(
         input_avi=original_path,
@@ -156,7 +355,8 @@ def handle_avi_file(name, filepath, data, file_obj, output_dir, category):
     result = {
         'name': name,
         'path': filepath,
-        'size': bytes_to_unit(len(data)),
+        'size': bytes_to_unit(written),
+        'hashes': hashes,
         'origin_video': origin_video_path,
         'channels': channels_only,
         'analysis': build_analysis(origin_video_path, origin_video_path, file_obj.info.meta)
@@ -177,14 +377,14 @@ def handle_avi_file(name, filepath, data, file_obj, output_dir, category):
 
     return result
 
-def handle_jdr_file(name, filepath, data, file_obj, output_dir, category):
+def handle_jdr_file(name, filepath, file_obj, output_dir, category):
     video_stem = os.path.splitext(name)[0]
     orig_dir = os.path.join(output_dir, category, video_stem)
     os.makedirs(orig_dir, exist_ok=True)
 
     original_path = os.path.join(orig_dir, name)
-    with open(original_path, 'wb') as wf:
-        wf.write(data)
+    hashes = {}
+    written = extract_file_content(file_obj, original_path, digests=hashes)
 
     jdr_info = recover_jdr(
         input_jdr=original_path,
@@ -199,12 +399,19 @@ def handle_jdr_file(name, filepath, data, file_obj, output_dir, category):
     return {
         'name': name,
         'path': filepath,
-        'size': bytes_to_unit(len(data)),
+        'size': bytes_to_unit(written),
+        'hashes': hashes,
         'channels': channels_only
     }
 
-def extract_video_files(fs_info, output_dir, path="/", total_count=None, progress=None):
-    results = []
+def _choose_workers(max_cap=8):
+    env = _env_int("VIREX_WORKERS", 0)
+    if env:
+        return env
+    cpu = os.cpu_count() or 1
+    return max(1, min(max_cap, cpu // 2))
+
+def _walk_video_entries(fs_info, path, entries):
     for entry in fs_info.open_dir(path=path):
         name = entry.info.name.name
         if name in [b'.', b'..'] or entry.info.meta is None:
@@ -212,37 +419,711 @@ def extract_video_files(fs_info, output_dir, path="/", total_count=None, progres
 
         name_str = name.decode('utf-8', 'ignore')
         filepath = path.rstrip('/') + '/' + name_str
+        meta = entry.info.meta
 
-
-        if entry.info.meta.type == pytsk3.TSK_FS_META_TYPE_DIR:
-            results += extract_video_files(fs_info, output_dir, filepath, total_count, progress)
+        if meta.type == pytsk3.TSK_FS_META_TYPE_DIR:
+            _walk_video_entries(fs_info, filepath, entries)
             continue
 
         if not name_str.lower().endswith(VIDEO_EXTENSIONS):
             continue
 
-        if progress:
-            progress[0] += 1
-            print(json.dumps({"processed": progress[0], "total": total_count}), flush=True)
+        entries.append({
+            "name": name_str,
+            "path": filepath,
+            "inode": int(meta.addr),
+            "size": int(meta.size),
+            "crtime": int(meta.crtime or 0),
+            "mtime": int(meta.mtime or 0),
+            "atime": int(meta.atime or 0),
+            "category": path.lstrip('/').split('/', 1)[0] or "root",
+            "deleted": bool(int(meta.flags) & pytsk3.TSK_FS_META_FLAG_UNALLOC),
+        })
+
+def build_video_inventory(fs_info, path="/"):
+    # 파일시스템 1회 순회로 비디오 목록(인벤토리) 구성 → 진행률 total 과 추출 모두 여기서 사용
+    entries = []
+    _walk_video_entries(fs_info, path, entries)
+    return entries
+
+def _image_identity(img_path):
+    st = os.stat(img_path)
+    return {"path": os.path.abspath(img_path), "size": st.st_size, "mtime": int(st.st_mtime)}
+
+def _resume_output_dir(temp_base, img_path):
+    # 출력 폴더 미지정 시 이미지 정보로 고정된 폴더 사용 → 중단 후 같은 이미지로 다시 실행하면 일지로 재개
+    # (Virex_ 접두어 유지: 앱의 취소/캐시 정리 대상)
+    key = hashlib.sha1(json.dumps(_image_identity(img_path), sort_keys=True).encode("utf-8")).hexdigest()
+    path = os.path.join(temp_base, f"Virex_{key[:16]}")
+    os.makedirs(path, exist_ok=True)
+    return path
+
+def load_inventory(output_dir, img_path):
+    inv_path = os.path.join(output_dir, INVENTORY_NAME)
+    if not os.path.isfile(inv_path):
+        return {}
+    try:
+        with open(inv_path, "r", encoding="utf-8") as rf:
+            saved = json.load(rf)
+        if saved.get("image") != _image_identity(img_path):
+            return {}
+        return saved.get("partitions") or {}
+    except Exception as e:
+        logger.warning(f"인벤토리 로드 실패: {e}")
+        return {}
+
+def save_inventory(output_dir, img_path, partitions):
+    inv_path = os.path.join(output_dir, INVENTORY_NAME)
+    tmp_path = inv_path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as wf:
+        json.dump({"image": _image_identity(img_path), "partitions": partitions},
+                wf, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, inv_path)
+
+def _handle_video_file(name, filepath, file_obj, output_dir, category):
+    lower = name.lower()
+    if lower.endswith('.mp4'):
+        return handle_mp4_file(name, filepath, file_obj, output_dir, category)
+    if lower.endswith('.avi'):
+        return handle_avi_file(name, filepath, file_obj, output_dir, category)
+    if lower.endswith('.jdr'):
+        return handle_jdr_file(name, filepath, file_obj, output_dir, category)
+    return None
+
+def _process_video_entry(fs_info, item, output_dir, img_info=None):
+    name_str, filepath, category = item["name"], item["path"], item["category"]
+    file_obj = fs_info.open_meta(inode=item["inode"])
+
+    # 데이터 run 을 한 번만 구해 이미지에서 큰 연속 단위로 직접 읽음
+    if img_info is not None and USE_DATA_RUNS:
+        try:
+            runs = file_data_runs(fs_info, file_obj)
+        except Exception as e:
+            logger.debug(f"data run 조회 실패 ({filepath}): {e}")
+            runs = None
+        if runs:
+            file_obj = DataRunFile(file_obj, img_info, runs)
+
+    # 이전 세션에서 같은 파일을 처리했으면 결과/산출물을 캐시에서 복원
+    cache = get_result_cache()
+    cache_key = None
+    if cache:
+        try:
+            digests = content_digests(file_obj, int(item.get("size") or 0))
+            cache_key = cache.file_key(item, digests)
+            cached = cache.restore(cache_key, output_dir)
+            if cached is not None:
+                # 증거 해시는 캐시에 저장된 값이 아니라 이번에 읽은 내용으로 보고
+                if cached.get("hashes"):
+                    cached["hashes"] = digests
+                return cached
+        except Exception as e:
+            logger.warning(f"캐시 조회 실패 ({filepath}): {e}")
+            cache_key = None
+
+    result = _handle_video_file(name_str, filepath, file_obj, output_dir, category)
+    if result is None:
+        return None
+
+    if cache_key and result:
+        cache.store(cache_key, result, output_dir)
+    return result
+
+# 워커 프로세스별 이미지/파일시스템 핸들 (pyewf/pytsk3 핸들은 프로세스 간 공유 불가)
+_worker_state = {}
+
+def _init_extract_worker(img_path, fs_byte_offset):
+    img_info = open_image_file(img_path)
+    _worker_state["img_info"] = img_info
+    _worker_state["fs_info"] = pytsk3.FS_Info(img_info, offset=fs_byte_offset)
+
+def _extract_entry_in_worker(item, output_dir):
+    return _process_video_entry(_worker_state["fs_info"], item, output_dir, _worker_state["img_info"])
+
+def _first_physical_offset(fs_info, item):
+    # 파일 첫 클러스터의 이미지 절대 오프셋 (구할 수 없으면 None)
+    file_obj = fs_info.open_meta(inode=item["inode"])
+    block_size = fs_info.info.block_size
+    for attr in file_obj:
+        if attr.info.type not in _DATA_ATTR_TYPES or attr.info.name:
+            continue
+        for run in attr:
+            if int(run.flags) & _RUN_SKIP_FLAGS:
+                continue
+            return fs_info.info.offset + run.addr * block_size
+        break
+    return None
+
+def _extraction_schedule(fs_info, inventory):
+    """
+    인벤토리를 첫 물리 클러스터 오프셋 순으로 정렬한 (원래 순번, 항목) 목록.
+    오프셋은 인벤토리 항목의 "offset" 에 저장해 재실행 시 다시 구하지 않음.
+    오프셋을 모르는 항목은 맨 뒤에 원래 순서대로 둠.
+    """
+    keyed = []
+    for seq, item in enumerate(inventory):
+        if "offset" not in item:
+            try:
+                item["offset"] = _first_physical_offset(fs_info, item)
+            except Exception as e:
+                logger.debug(f"첫 클러스터 조회 실패 ({item['path']}): {e}")
+                item["offset"] = None
+        off = item["offset"]
+        keyed.append(((off is None, off or 0, seq), seq, item))
+    keyed.sort(key=lambda k: k[0])
+    return [(seq, item) for _, seq, item in keyed]
+
+def _report_progress(progress, total_count, partition=None):
+    if progress:
+        progress[0] += 1
+        event = {"processed": progress[0], "total": total_count}
+        if partition is not None:
+            event["partition"] = partition
+        print(json.dumps(event), flush=True)
+
+def _extract_video_files_parallel(fs_info, output_dir, inventory, total_count, progress,
+                                img_path, fs_byte_offset, workers, partition=None, journal=None,
+                                img_info=None, schedule=None):
+    ordered = [None] * len(inventory)
+    pending = {}
+    max_pending = workers * 4
+    entries = iter(schedule if schedule is not None else enumerate(inventory))
+
+    def _collect(done):
+        for fut in done:
+            seq, item = pending.pop(fut)
+            try:
+                ordered[seq] = fut.result()
+                if journal:
+                    journal.record_file(item, ordered[seq])
+            except BrokenProcessPool:
+                pending[fut] = (seq, item)
+                raise
+            except Exception as e:
+                logger.warning(f"병렬 추출 실패: {item['path']} ({e})")
+            _report_progress(progress, total_count, partition)
+
+    def _run_local(seq, item):
+        try:
+            ordered[seq] = _process_video_entry(fs_info, item, output_dir, img_info)
+            if journal:
+                journal.record_file(item, ordered[seq])
+        except Exception as e:
+            logger.warning(f"추출 실패: {item['path']} ({e})")
+        _report_progress(progress, total_count, partition)
+
+    try:
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_extract_worker,
+            initargs=(img_path, fs_byte_offset)
+        ) as pool:
+            for seq, item in entries:
+                if journal and journal.has_file(item):
+                    # 이전 실행에서 끝난 파일은 일지의 결과를 그대로 사용
+                    ordered[seq] = journal.file_result(item)
+                    _report_progress(progress, total_count, partition)
+                    continue
+                try:
+                    fut = pool.submit(_extract_entry_in_worker, item, output_dir)
+                except BrokenProcessPool:
+                    _run_local(seq, item)
+                    raise
+                pending[fut] = (seq, item)
+                if len(pending) >= max_pending:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    _collect(done)
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                _collect(done)
+    except BrokenProcessPool as e:
+        # 워커 풀이 깨지면 남은 작업은 현재 프로세스에서 순차 처리
+        logger.warning(f"워커 풀 중단, 순차 처리로 전환: {e}")
+        # 풀이 깨지기 전에 끝난 작업은 결과를 그대로 쓰고 나머지만 다시 처리
+        _collect([f for f in list(pending) if f.done() and not f.cancelled()
+                  and not isinstance(f.exception(), BrokenProcessPool)])
+        for seq, item in sorted(pending.values()):
+            _run_local(seq, item)
+        pending.clear()
+        for seq, item in entries:
+            if journal and journal.has_file(item):
+                ordered[seq] = journal.file_result(item)
+                _report_progress(progress, total_count, partition)
+                continue
+            _run_local(seq, item)
+
+    return [r for r in ordered if r]
+
+def extract_video_files(fs_info, output_dir, inventory=None, total_count=None, progress=None,
+                        img_path=None, fs_byte_offset=0, workers=None, partition=None, journal=None,
+                        img_info=None):
+    if inventory is None:
+        inventory = build_video_inventory(fs_info)
+    if total_count is None:
+        total_count = len(inventory)
+
+    # 물리 오프셋 순서로 읽되 결과는 원래 디렉토리 순서로 돌려줌
+    schedule = _extraction_schedule(fs_info, inventory) if SCHEDULE_BY_OFFSET else None
+
+    workers = _choose_workers() if workers is None else workers
+    if img_path and workers > 1:
+        return _extract_video_files_parallel(
+            fs_info, output_dir, inventory, total_count, progress,
+            img_path, fs_byte_offset, workers, partition, journal, img_info, schedule
+        )
+
+    ordered = [None] * len(inventory)
+    for seq, item in (schedule if schedule is not None else enumerate(inventory)):
+        _report_progress(progress, total_count, partition)
+        if journal and journal.has_file(item):
+            ordered[seq] = journal.file_result(item)
+            continue
+        try:
+            ordered[seq] = _process_video_entry(fs_info, item, output_dir, img_info)
+            if journal:
+                journal.record_file(item, ordered[seq])
+        except Exception as e:
+            # 병렬 경로와 같이 파일 단위로 실패 처리 (임시 공간 부족 등)
+            logger.warning(f"추출 실패: {item['path']} ({e})")
+    return [r for r in ordered if r]
+
+def _process_partition(img_info, img_path, part, output_dir, entries, dump_unalloc, workers):
+    # 파티션 1개 처리: 비할당 카빙 → 파일시스템 내 비디오 추출. (결과, total, 인벤토리 엔트리) 반환
+    part_addr = part["addr"]
+
+    # 재시작 시 완료된 파일/카빙 bin 을 건너뛰기 위한 파티션별 작업 일지
+    identity = dict(_image_identity(img_path), partition=_inventory_key(part))
+    with ExtractionJournal(os.path.join(output_dir, f"journal_p{part_addr}.jsonl"), identity) as journal:
+        return _process_partition_journaled(
+            img_info, img_path, part, output_dir, entries, dump_unalloc, workers, journal
+        )
+
+def _process_partition_journaled(img_info, img_path, part, output_dir, entries, dump_unalloc,
+                                workers, journal):
+    part_addr, part_start = part["addr"], part["start"]
 
-        file_obj = fs_info.open(filepath)
-        data = read_file_content(file_obj)
-        category = path.lstrip('/').split('/', 1)[0] or "root"
+    # bps 자동 감지 후 FS_Info 마운트 오프셋 계산
+    bps = _detect_bps_for_partition(img_info, part_start)
+    fs_byte_offset = part_start * bps
+
+    try:
+        fs_info = pytsk3.FS_Info(img_info, offset=fs_byte_offset)
+    except Exception as e:
+        logger.warning(f"FS mount 실패 (offset={fs_byte_offset}): {e}")
+        # 파일시스템 마운트 실패해도 비할당 덤프/카빙은 계속 진행
+        fs_info = None
+
+    # FAT 는 한 번만 읽어 삭제 엔트리 복구와 비할당 구간 계산에 같이 사용
+    try:
+        fat_layout, _ = _fat32_read_fat(img_info, part_start)
+    except Exception as e:
+        logger.warning(f"FAT 읽기 실패 (p{part_addr}): {e}")
+        fat_layout = None
 
-        if name_str.lower().endswith('.mp4'):
-            result = handle_mp4_file(name_str, filepath, data, file_obj, output_dir, category)
-        elif name_str.lower().endswith('.avi'): 
-            result = handle_avi_file(name_str, filepath, data, file_obj, output_dir, category)
-        elif name_str.lower().endswith('.jdr'):
-            result = handle_jdr_file(name_str, filepath, data, file_obj, output_dir, category)
+    # FAT32 삭제 엔트리 복구: 클러스터가 비어 있는 연속 파일은 이름/시간 정보와 함께 바로 복구
+    deleted_results, deleted_clusters = [], []
+    if FAT_UNDELETE and fat_layout:
+        try:
+            deleted_results, deleted_clusters = recover_deleted_fat32(
+                img_info, part_start, output_dir, partition=part_addr, journal=journal, layout=fat_layout
+            )
+        except Exception as e:
+            logger.warning(f"삭제 엔트리 복구 실패 (p{part_addr}): {e}")
+
+    # 비할당 영역 (FAT32만 해당) + vol_carver 연계
+    # 기본은 이미지에서 직접 카빙, VIREX_DUMP_UNALLOC=1 이면 기존처럼 .bin 덤프 후 카빙
+    # 삭제 엔트리로 복구한 클러스터는 카빙 대상에서 제외
+    _carve_fs_unalloc(img_info, img_path, part_addr, part_start, output_dir, dump_unalloc,
+                      deleted_clusters, fat_layout, workers, journal)
+
+    # 기존 파일 시스템 내 비디오 스캔/추출
+    if fs_info is None:
+        return deleted_results, len(deleted_results), entries
+
+    if entries is None:
+        entries = build_video_inventory(fs_info)
+
+    # 삭제 엔트리 복구가 이미 처리한 파일은 TSK 순회 결과에서 제외 (인벤토리 자체는 그대로 저장)
+    todo = entries
+    if deleted_clusters:
+        cb, data_abs = fat_layout["cluster_bytes"], fat_layout["data_abs"]
+        todo = _skip_fat_recovered(
+            fs_info, entries, {data_abs + (first - 2) * cb for first, _ in deleted_clusters}, part_addr
+        )
+
+    total = len(todo)
+    print(json.dumps({"processed": 0, "total": total, "partition": part_addr}), flush=True)
+
+    t0 = time.time()
+    part_results = extract_video_files(
+        fs_info, output_dir, inventory=todo, total_count=total, progress=[0],
+        img_path=img_path, fs_byte_offset=fs_byte_offset, workers=workers,
+        partition=part_addr, journal=journal, img_info=img_info
+    )
+    # 파일당 처리 시간 (VIREX_DATA_RUNS=0 과 비교해 data run 직접 읽기 효과 확인용)
+    elapsed_ms = int((time.time() - t0) * 1000)
+    print(json.dumps({
+        "event": "extract_stats",
+        "partition": part_addr,
+        "files": total,
+        "data_runs": USE_DATA_RUNS,
+        "elapsed_ms": elapsed_ms,
+        "per_file_ms": round(elapsed_ms / total, 2) if total else 0
+    }), flush=True)
+    return deleted_results + part_results, total + len(deleted_results), entries
+
+class _ScanStopped(Exception):
+    """카빙 쪽이 먼저 끝나(오류 등) 비할당 스캔 스레드를 멈춤"""
+
+_SCAN_END = object()
+
+def _scan_stream(scan, result, depth=4):
+    """
+    scan(sink) 를 별도 스레드에서 돌리며 sink(item, hits) 로 확정된 구간을 (item, hits) 로 차례로 내줌.
+    큐가 차면 스캔 스레드가 기다림 → 카빙이 밀려도 히트가 메모리에 쌓이지 않음.
+    준비된 구간이 잠시 없으면 None 을 내줘 호출 측이 그동안 끝난 카빙 작업을 처리하게 함.
+    scan 의 반환값은 result 에 채우고, 스캔 중 예외는 소비 측으로 다시 던짐.
+    """
+    q = queue.Queue(maxsize=depth)
+    stop = threading.Event()
+
+    def _put(entry):
+        while not stop.is_set():
+            try:
+                q.put(entry, timeout=0.2)
+                return
+            except queue.Full:
+                continue
+        raise _ScanStopped()
+
+    def _sink(item, hits):
+        _put((item, hits))
+
+    def _worker():
+        try:
+            result.update(scan(_sink))
+            _put(_SCAN_END)
+        except _ScanStopped:
+            pass
+        except BaseException as e:
+            try:
+                _put(e)
+            except _ScanStopped:
+                pass
+
+    thread = threading.Thread(target=_worker, name="virex-unalloc-scan", daemon=True)
+    thread.start()
+    try:
+        while True:
+            try:
+                entry = q.get(timeout=0.5)
+            except queue.Empty:
+                yield None
+                continue
+            if entry is _SCAN_END:
+                thread.join()
+                return
+            if isinstance(entry, BaseException):
+                raise entry
+            yield entry
+    finally:
+        stop.set()
+
+def _carve_fs_unalloc(img_info, img_path, part_addr, part_start, output_dir, dump_unalloc,
+                      deleted_clusters, fat_layout, workers, journal):
+    # 파티션 비할당 영역 스캔(또는 덤프) → 카빙. 끝난 단계는 일지에 기록
+    # 재시작: 카빙까지 끝난 단계는 통째로, 스캔만 끝났으면 기록한 구간으로 바로 카빙 (빈 공간 재스캔 없음)
+    # 덤프 방식에 따라 스캔 결과(.bin 경로/이미지 구간)가 다르므로 단계 이름을 구분
+    scan_stage = "fs_unalloc_dump" if dump_unalloc else "fs_unalloc_scan"
+    done = journal.stage("fs_unalloc") if journal else None
+    if done is not None:
+        print(json.dumps({"event": "fs_unalloc_resume", "partition": part_addr, "stage": "carved", **done}), flush=True)
+        return
+
+    def _scan(sink=None, resume_after=None):
+        return dump_unalloc_fat32(
+            img_info,
+            part_start_sector=part_start,
+            out_dir=output_dir,
+            label=f"p{part_addr}_fs_unalloc",
+            dump=dump_unalloc,
+            exclude=deleted_clusters,
+            layout=fat_layout,
+            sink=sink,
+            resume_after=resume_after
+        )
+
+    def _record_scan(fat_res):
+        # 중간에 멈춘(truncated) 스캔은 기록하지 않음 → 다음 실행에서 다시 스캔
+        # 시그니처 히트(array)는 기록하지 않고, 재시작 시 남은 구간만 카빙 워커가 스캔
+        if journal and fat_res.get("ok") and not fat_res.get("truncated"):
+            journal.record_stage(scan_stage, {k: v for k, v in fat_res.items() if k != "hits"})
+
+    stream, scanned = None, []
+    fat_res = journal.stage(scan_stage) if journal else None
+    if fat_res is not None:
+        print(json.dumps({"event": "fs_unalloc_resume", "partition": part_addr, "stage": "scanned",
+                          "chunks": fat_res["chunks"]}), flush=True)
+    elif dump_unalloc:
+        fat_res = _scan()
+        _record_scan(fat_res)
+    else:
+        # 스캔은 별도 스레드에서 진행하고 확정된 구간부터 바로 샤드 카빙 (히트를 파티션 전체만큼 모아 두지 않음)
+        # 확정된 구간은 일지에 남겨, 스캔 도중 멈췄으면 기록된 구간은 바로 카빙하고 마지막 구간 뒤부터 이어서 스캔
+        scanned = journal.segments(scan_stage) if journal else []
+        resume_after = None
+        if scanned:
+            resume_after = scanned[-1]["offset"] + scanned[-1]["byte_len"]
+            print(json.dumps({"event": "fs_unalloc_resume", "partition": part_addr, "stage": "partial",
+                              "chunks": len(scanned)}), flush=True)
+        fat_res = {}
+
+        def _segments():
+            for entry in _scan_stream(lambda sink: _scan(sink, resume_after), fat_res):
+                if entry is not None:
+                    item, seg_hits = entry
+                    if journal:
+                        journal.record_segment(scan_stage, item)
+                    entry = ((item["offset"], item["byte_len"]), seg_hits)
+                yield entry
+        stream = _segments()
+
+    if stream is None and not fat_res.get("ok"):
+        print(json.dumps({
+            "event": "fs_unalloc_skip",
+            "partition": part_addr,
+            "reason": fat_res.get("reason", "unknown")
+        }), flush=True)
+        return
+
+    base_dir = os.path.join(output_dir, f"p{part_addr}_fs_unalloc")
+    try:
+        if dump_unalloc:
+            carved_result = vol_carver.carve_everything(
+                base_dir,
+                ffmpeg_dir_override=os.environ.get("VIREX_FFMPEG_DIR"),
+                journal=journal,
+                workers=workers
+            )
         else:
+            carved_result = vol_carver.carve_extents(
+                img_info,
+                [(it["offset"], it["byte_len"]) for it in (scanned if stream else fat_res["items"])],
+                base_dir,
+                ffmpeg_dir_override=os.environ.get("VIREX_FFMPEG_DIR"),
+                journal=journal,
+                image_path=img_path,
+                workers=workers,
+                hits=fat_res.get("hits"),
+                stream=stream
+            )
+    except Exception as e:
+        logger.warning(f"vol_carver run failed: {e}")
+        print(json.dumps({
+            "event": "carved_error",
+            "partition": part_addr,
+            "error": str(e)
+        }), flush=True)
+        return
+
+    if stream is not None:
+        # 스트림 카빙이 끝나야 스캔 결과(구간 목록/건너뛴 크기)가 확정됨
+        if not fat_res:
+            # 스캔 스레드 오류 → 기록한 구간까지만 카빙됨, 다음 실행에서 이어서 스캔
+            print(json.dumps({"event": "fs_unalloc_skip", "partition": part_addr, "reason": "scan_failed"}),
+                  flush=True)
+            return
+        if scanned:
+            # 이전 실행에서 기록한 구간 + 이어서 스캔한 구간 (건너뛴 크기는 이어서 스캔한 부분만)
+            items = scanned + fat_res.get("items", [])
+            for n, it in enumerate(items, start=1):
+                it["index"] = n
+            fat_res = dict(fat_res, ok=True, chunks=len(items), items=items,
+                           bytes=sum(it["byte_len"] for it in items))
+            fat_res.pop("reason", None)
+        _record_scan(fat_res)
+        if not fat_res.get("ok"):
+            print(json.dumps({
+                "event": "fs_unalloc_skip",
+                "partition": part_addr,
+                "reason": fat_res.get("reason", "unknown")
+            }), flush=True)
+            return
+
+    print(json.dumps({
+        "event": "fs_unalloc_done",
+        "partition": part_addr,
+        "chunks": fat_res["chunks"],
+        "bytes": fat_res["bytes"],
+        "skipped": fat_res.get("skipped", 0),
+        "truncated": fat_res.get("truncated")
+    }), flush=True)
+
+    try:
+        # carved_index.json 저장 (카빙 입력 구간과 덤프/스캔 중 계산한 해시 포함)
+        carved_result["unalloc"] = fat_res["items"]
+        carved_index_path = os.path.join(base_dir, "carved_index.json")
+        os.makedirs(base_dir, exist_ok=True)
+        with open(carved_index_path, "w", encoding="utf-8") as cf:
+            json.dump(carved_result, cf, ensure_ascii=False, indent=2)
+
+        print(json.dumps({
+            "event": "carved_done",
+            "partition": part_addr,
+            "carved_total": carved_result["summary"]["carved_total"],
+            "rebuilt_total": carved_result["summary"]["rebuilt_total"],
+            "targets": carved_result["targets"]
+        }, ensure_ascii=False), flush=True)
+        if journal:
+            journal.record_stage("fs_unalloc", {
+                "carved_total": carved_result["summary"]["carved_total"],
+                "rebuilt_total": carved_result["summary"]["rebuilt_total"]
+            })
+
+    except Exception as e:
+        logger.warning(f"vol_carver run failed: {e}")
+        print(json.dumps({
+            "event": "carved_error",
+            "partition": part_addr,
+            "error": str(e)
+        }), flush=True)
+
+def _skip_fat_recovered(fs_info, entries, recovered_offsets, partition=None):
+    # LFN 이 남은 0xE5 엔트리는 TSK 순회에도 삭제 파일로 나옴 → 첫 클러스터 위치가 같으면 같은 파일
+    kept, skipped = [], 0
+    for item in entries:
+        # 이전 버전 인벤토리에는 deleted 키가 없으므로 확인 대상에 포함
+        if item.get("deleted", True):
+            off = item.get("offset")
+            if off is None:
+                try:
+                    off = _first_physical_offset(fs_info, item)
+                except Exception as e:
+                    logger.debug(f"첫 클러스터 조회 실패 ({item['path']}): {e}")
+            if off in recovered_offsets:
+                skipped += 1
+                continue
+        kept.append(item)
+    if skipped:
+        print(json.dumps({
+            "event": "fat32_deleted_dedup",
+            "partition": partition,
+            "skipped": skipped
+        }), flush=True)
+    return kept
+
+def _run_partition_job(img_path, part, output_dir, entries, dump_unalloc, workers):
+    # 파티션별 프로세스: 이미지 핸들을 따로 연다
+    img_info = open_image_file(img_path)
+    return _process_partition(img_info, img_path, part, output_dir, entries, dump_unalloc, workers)
+
+def volume_gap_extents(volume, image_size, min_size=None):
+    # 파티션 테이블상 미할당 영역 + 마지막 파티션 뒤 남은 영역 → [(이미지 절대 오프셋, 길이), ...]
+    if min_size is None:
+        min_size = _env_int("VIREX_GAP_MIN_MB", GAP_MIN_MB) * 1024 * 1024
+    bs = int(volume.info.block_size or 512)
+    raw, covered = [], 0
+    for partition in volume:
+        start, length = int(partition.start) * bs, int(partition.len) * bs
+        covered = max(covered, start + length)
+        if partition.flags == pytsk3.TSK_VS_PART_FLAG_UNALLOC:
+            raw.append((start, length))
+    if image_size > covered:
+        raw.append((covered, image_size - covered))
+
+    # 이미지 크기로 자르고 인접 구간 병합
+    gaps = []
+    for start, length in sorted(raw):
+        length = min(length, image_size - start)
+        if length <= 0:
             continue
+        if gaps and start <= gaps[-1][0] + gaps[-1][1]:
+            prev_start, prev_len = gaps[-1]
+            gaps[-1] = (prev_start, max(prev_len, start + length - prev_start))
+        else:
+            gaps.append((start, length))
+    return [(o, n) for o, n in gaps if n >= min_size]
+
+def _carve_volume_gaps(img_info, img_path, gaps, output_dir):
+    # 재포맷 등으로 파티션 밖에 남은 옛 영상: 덤프 없이 이미지에서 직접 카빙 (결과는 이미지 절대 오프셋 포함)
+    root = os.path.join(output_dir, "volume_gaps")
+    os.makedirs(root, exist_ok=True)
+    print(json.dumps({
+        "event": "volume_gaps",
+        "count": len(gaps),
+        "bytes": sum(n for _, n in gaps),
+        "extents": [[o, n] for o, n in gaps]
+    }), flush=True)
+
+    identity = dict(_image_identity(img_path), partition="volume_gaps")
+    window = _env_int("VIREX_GAP_WINDOW_MB", GAP_WINDOW_MB) * 1024 * 1024
+    try:
+        with ExtractionJournal(os.path.join(output_dir, "journal_gaps.jsonl"), identity) as journal:
+            carved_result = vol_carver.carve_extents(
+                img_info, gaps, root,
+                ffmpeg_dir_override=os.environ.get("VIREX_FFMPEG_DIR"),
+                journal=journal,
+                window=window,
+                image_path=img_path
+            )
+        carved_result["gaps"] = [{"offset": o, "byte_len": n} for o, n in gaps]
+        with open(os.path.join(root, "carved_index.json"), "w", encoding="utf-8") as cf:
+            json.dump(carved_result, cf, ensure_ascii=False, indent=2)
+
+        print(json.dumps({
+            "event": "carved_done",
+            "partition": "volume_gaps",
+            "carved_total": carved_result["summary"]["carved_total"],
+            "rebuilt_total": carved_result["summary"]["rebuilt_total"],
+            "targets": carved_result["targets"]
+        }, ensure_ascii=False), flush=True)
+    except Exception as e:
+        logger.warning(f"볼륨 공백 카빙 실패: {e}")
+        print(json.dumps({
+            "event": "carved_error",
+            "partition": "volume_gaps",
+            "error": str(e)
+        }), flush=True)
+
+def _inventory_key(part):
+    return f"{part['addr']}@{part['start']}"
+
+def _triage_partition(img_info, part):
+    # 인벤토리 모드: 파일시스템 순회 + 형식별 헤더/테이블만 읽어 목록 작성 (원본 기록/ffmpeg 없음)
+    part_addr = part["addr"]
+    bps = _detect_bps_for_partition(img_info, part["start"])
+    try:
+        fs_info = pytsk3.FS_Info(img_info, offset=part["start"] * bps)
+    except Exception as e:
+        logger.warning(f"FS mount 실패 (p{part_addr}): {e}")
+        return [], 0, None
 
-        if result:
-            results.append(result)
-    return results
+    entries = part.get("entries")
+    if entries is None:
+        entries = build_video_inventory(fs_info)
+    total = len(entries)
+    progress = [0]
+    print(json.dumps({"processed": 0, "total": total, "partition": part_addr}), flush=True)
 
-def extract_videos_from_e01(e01_path):
+    results = []
+    for item in entries:
+        try:
+            file_obj = fs_info.open_meta(inode=item["inode"])
+            runs = file_data_runs(fs_info, file_obj) if USE_DATA_RUNS else None
+            if runs:
+                file_obj = DataRunFile(file_obj, img_info, runs)
+            results.append(triage_entry(
+                item["name"], item["path"], item["size"], file_obj.read_random,
+                timestamps=item, category=item["category"]
+            ))
+        except Exception as e:
+            logger.warning(f"트리아지 실패: {item['path']} ({e})")
+        _report_progress(progress, total, part_addr)
+    return results, total, entries
+
+def extract_videos_from_e01(e01_path, output_dir=None, mode="full"):
+    # mode="inventory": 비할당 카빙/원본 추출 없이 목록과 손상/슬랙 추정치만 생성
+    inventory_only = mode == "inventory"
     logger.info(f"▶ 분석용 E01 파일: {e01_path}")
     start_time = time.time()
 
@@ -255,92 +1136,127 @@ def extract_videos_from_e01(e01_path):
 
     # 임시 출력 디렉토리 준비 + 여유 공간 확인
     temp_base = tempfile.gettempdir()
-    e01_size = os.stat(e01_path).st_size
+    e01_size = _image_file_size(e01_path)
     needed = int(e01_size * 1.2) + 1_000_000_000
     free = shutil.disk_usage(temp_base).free
-    if free < needed:
-        print(json.dumps({"event": "disk_full", "free": free, "needed": needed}), flush=True)
-        return [], None, 0
-
-    output_dir = tempfile.mkdtemp(prefix="Virex_", dir=temp_base)
+    if free < needed and not inventory_only:
+        # 예상치보다 적어도 바로 중단하지 않고 예산 관리(대기/중간 산출물 정리)로 진행
+        # 최소 여유 공간조차 없을 때만 중단
+        if free < TEMP_MIN_FREE:
+            print(json.dumps({"event": "disk_full", "free": free, "needed": needed}), flush=True)
+            return [], None, 0
+        print(json.dumps({"event": "disk_budget", "state": "low", "free": free, "needed": needed}), flush=True)
+
+    if output_dir:
+        output_dir = os.path.abspath(output_dir)
+        os.makedirs(output_dir, exist_ok=True)
+    else:
+        output_dir = _resume_output_dir(temp_base, e01_path)
     print(json.dumps({"tempDir": output_dir}), flush=True)
+    budget = None if inventory_only else init_disk_budget(output_dir)
+    # 저장 해시 검증은 별도 핸들로 추출과 동시에 진행 (VIREX_VERIFY_IMAGE=1)
+    # 인벤토리(분류)만 할 때는 이미지 전체를 다시 읽는 검증/캐시 정리를 하지 않음
+    verifier = None if inventory_only else start_image_verify(e01_path)
 
-    all_results, all_total = [], 0
+    dump_unalloc = os.environ.get("VIREX_DUMP_UNALLOC", "").lower() in ("1", "true", "yes")
+    # 같은 이미지로 이전에 만든 인벤토리가 있으면 디렉토리 순회 생략
+    inventory = load_inventory(output_dir, e01_path)
+
+    cache = None if inventory_only else get_result_cache()
 
+    parts = []
     for partition in volume:
         if partition.flags == pytsk3.TSK_VS_PART_FLAG_UNALLOC or partition.start == 0:
             logger.info(f"건너뜀: Unallocated 파티션 (offset: {partition.start})")
             continue
+        parts.append({"addr": int(partition.addr), "start": int(partition.start)})
 
-        # bps 자동 감지 후 FS_Info 마운트 오프셋 계산
-        bps = _detect_bps_for_partition(img_info, partition.start)
-        fs_byte_offset = partition.start * bps
+    workers = _choose_workers()
+    outcomes = [None] * len(parts)
 
+    def _merge(i, outcome):
+        outcomes[i] = outcome
+        entries = outcome[2]
+        key = _inventory_key(parts[i])
+        if entries is not None and inventory.get(key) is None:
+            inventory[key] = entries
+            try:
+                save_inventory(output_dir, e01_path, inventory)
+            except Exception as e:
+                logger.warning(f"인벤토리 저장 실패: {e}")
+
+    if inventory_only:
+        for i, part in enumerate(parts):
+            _merge(i, _triage_partition(
+                img_info, dict(part, entries=inventory.get(_inventory_key(part)))
+            ))
+    elif len(parts) > 1 and workers > 1:
+        # 파티션마다 별도 프로세스/이미지 핸들로 동시에 처리
+        # 전체 워커 수를 동시 처리 파티션 수로 나눈 몫을 추출/카빙 풀 모두의 상한으로 넘김
+        concurrent = min(len(parts), workers)
+        part_workers = max(1, workers // concurrent)
+        # 동시에 도는 다른 파티션이 공간을 정리할 수 있으므로 임시 공간 부족 시 대기 허용
+        set_budget_peers(True)
         try:
-            fs_info = pytsk3.FS_Info(img_info, offset=fs_byte_offset)
-        except Exception as e:
-            logger.warning(f"FS mount 실패 (offset={fs_byte_offset}): {e}")
-            # 파일시스템 마운트 실패해도 비할당 덤프/카빙은 계속 진행
-            fs_info = None
-
-        # 비할당 덤프 (FAT32만 해당) + vol_carver 연계
-        fat_res = dump_unalloc_fat32(
-            img_info,
-            part_start_sector=partition.start,
-            out_dir=output_dir,
-            label=f"p{partition.addr}_fs_unalloc"
-        )
-        if fat_res.get("ok"):
-            print(json.dumps({
-                "event": "fs_unalloc_done",
-                "chunks": fat_res["chunks"],
-                "bytes": fat_res["bytes"]
-            }), flush=True)
-
+            with ProcessPoolExecutor(max_workers=concurrent) as pool:
+                futures = {
+                    pool.submit(_run_partition_job, e01_path, part, output_dir,
+                                inventory.get(_inventory_key(part)), dump_unalloc, part_workers): i
+                    for i, part in enumerate(parts)
+                }
+                for fut in as_completed(futures):
+                    i = futures[fut]
+                    try:
+                        _merge(i, fut.result())
+                    except Exception as e:
+                        logger.warning(f"파티션 처리 실패 (p{parts[i]['addr']}): {e}")
+        finally:
+            set_budget_peers(False)
+    else:
+        for i, part in enumerate(parts):
             try:
-                base_dir = os.path.join(output_dir, f"p{partition.addr}_fs_unalloc")
+                _merge(i, _process_partition(
+                    img_info, e01_path, part, output_dir,
+                    inventory.get(_inventory_key(part)), dump_unalloc, workers
+                ))
+            except Exception as e:
+                logger.warning(f"파티션 처리 실패 (p{part['addr']}): {e}")
 
-                carved_result = vol_carver.carve_everything(
-                    base_dir,
-                    ffmpeg_dir_override=os.environ.get("VIREX_FFMPEG_DIR")
-                )
-                
-                # carved_index.json 저장
-                carved_index_path = os.path.join(base_dir, "carved_index.json")
-                with open(carved_index_path, "w", encoding="utf-8") as cf:
-                    json.dump(carved_result, cf, ensure_ascii=False, indent=2)
+    # 파티션 밖(미할당 볼륨 영역) 카빙
+    if CARVE_GAPS and not inventory_only:
+        try:
+            gaps = volume_gap_extents(volume, img_info.get_size())
+        except Exception as e:
+            logger.warning(f"볼륨 공백 영역 계산 실패: {e}")
+            gaps = []
+        if gaps:
+            _carve_volume_gaps(img_info, e01_path, gaps, output_dir)
 
-                print(json.dumps({
-                    "event": "carved_done",
-                    "partition": partition.addr,
-                    "carved_total": carved_result["summary"]["carved_total"],
-                    "rebuilt_total": carved_result["summary"]["rebuilt_total"],
-                    "targets": carved_result["targets"]
-                }, ensure_ascii=False), flush=True)
+    # 파티션 순서대로 결과 결합
+    all_results, all_total = [], 0
+    for outcome in outcomes:
+        if outcome is None:
+            continue
+        all_results.extend(outcome[0])
+        all_total += outcome[1]
 
-            except Exception as e:
-                logger.warning(f"vol_carver run failed: {e}")
-                print(json.dumps({
-                    "event": "carved_error",
-                    "partition": partition.addr,
-                    "error": str(e)
-                }), flush=True)
-        else:
-            print(json.dumps({
-                "event": "fs_unalloc_skip",
-                "reason": fat_res.get("reason", "unknown")
-            }), flush=True)
+    if hasattr(img_info, "cache_stats"):
+        stats = img_info.cache_stats()
+        logger.info(f"EWF 캐시: hit={stats['hits']} miss={stats['misses']} rate={stats['hit_rate']}")
+        print(json.dumps({"event": "ewf_cache", **stats}), flush=True)
 
-        # 기존 파일 시스템 내 비디오 스캔/추출
-        if fs_info is not None:
-            total = count_video_files(fs_info)
-            all_total += total
-            print(json.dumps({"processed": 0, "total": total}), flush=True)
+    if budget:
+        budget.summary()
 
-            part_results = extract_video_files(
-                fs_info, output_dir, path="/", total_count=total, progress=[0]
-            )
-            all_results.extend(part_results)
+    if cache:
+        try:
+            stats = cache.evict()
+            print(json.dumps({"event": "result_cache", **stats}), flush=True)
+        except Exception as e:
+            logger.warning(f"캐시 정리 실패: {e}")
+
+    if verifier:
+        verifier.join()
 
     elapsed = int(time.time() - start_time)
     h, rem = divmod(elapsed, 3600)
@@ -378,17 +1294,165 @@ def _fat32_parse_layout(bpb: bytes):
     return fat_start_bytes, fat_bytes, data_start_bytes, cluster_bytes
 
 
-def dump_unalloc_fat32(img_info, part_start_sector, out_dir, label="fs_unalloc_fat32"):
-    # BPB 확인
+def _fat32_free_runs(fat):
+    # FAT 엔트리(클러스터 2부터)에서 값이 0인 연속 구간 → (시작 클러스터 배열, 길이 배열)
+    total_entries = len(fat) // 4
+    if total_entries <= 2:
+        empty = array("Q")
+        return empty, empty
+
+    if np is not None:
+        entries = np.frombuffer(fat, dtype="<u4", count=total_entries)[2:]
+        free = ((entries & 0x0FFFFFFF) == 0).view(np.int8)
+        edges = np.diff(free, prepend=np.int8(0), append=np.int8(0))
+        starts = np.flatnonzero(edges == 1)
+        ends = np.flatnonzero(edges == -1)
+        return starts + 2, ends - starts
+
+    # numpy 미설치 시: array 로 한 번에 언팩 후 순회
+    entries = array("I")
+    entries.frombytes(bytes(fat[:total_entries * 4]))
+    if sys.byteorder == "big":
+        entries.byteswap()
+    starts, lengths = array("Q"), array("Q")
+    cl = 2
+    while cl < total_entries:
+        if entries[cl] & 0x0FFFFFFF == 0:
+            start = cl
+            while cl < total_entries and entries[cl] & 0x0FFFFFFF == 0:
+                cl += 1
+            starts.append(start)
+            lengths.append(cl - start)
+        else:
+            cl += 1
+    return starts, lengths
+
+def _uniform_runs(buf, block):
+    """
+    buf 를 block(클러스터) 단위로 나눠 전부 0x00 또는 0xFF 인 블록을 판별하고,
+    같은 판정이 이어지는 구간을 (uniform 여부, 시작, 끝) 바이트 범위 목록으로 반환.
+    """
+    size = len(buf)
+    n = size // block
+    if np is not None:
+        # 블록을 행으로 보고 행별 최소/최대가 같은 0x00/0xFF 인지 한 번에 판정 (블록 복사/파이썬 루프 없음)
+        if n:
+            rows = np.frombuffer(buf, dtype=np.uint8, count=n * block).reshape(n, block)
+            lo, hi = rows.min(axis=1), rows.max(axis=1)
+            uniform = (lo == hi) & ((lo == 0) | (lo == 0xFF))
+            cuts = (np.flatnonzero(uniform[1:] != uniform[:-1]) + 1).tolist()
+            bounds = [0] + cuts + [n]
+            flags = uniform[bounds[:-1]].tolist()
+        else:
+            bounds, flags = [0], []
+    else:
+        # numpy 미설치 시: 미리 만든 0x00/0xFF 페이지와 블록 단위 비교 (memcmp 라 데이터 블록은 첫 바이트에서 바로 판정됨)
+        # memoryview 끼리 비교는 원소 단위라 훨씬 느리므로 bytes 슬라이스 사용
+        zero, ff = ZERO_PAGE[:block], FF_PAGE[:block]
+        bounds, flags = [0], []
+        for i in range(n):
+            blk = buf[i * block:(i + 1) * block]
+            u = blk == zero or blk == ff
+            if not flags or flags[-1] != u:
+                if flags:
+                    bounds.append(i)
+                flags.append(u)
+        bounds.append(n)
+
+    runs = [(u, a * block, b * block) for u, a, b in zip(flags, bounds[:-1], bounds[1:])]
+    if size > n * block:
+        # 블록보다 짧은 꼬리는 데이터로 취급
+        runs.append((False, n * block, size))
+    return runs
+
+def _image_reader(img_info, depth):
+    # RawImgInfo 는 mmap 위 memoryview 를 복사 없이 돌려줌 (view) → 선읽기 스레드 없이 OS 순차 선읽기에 맡김
+    # pytsk3 가 호출하는 read 는 bytes 를 요구하므로 그대로 두고, 파이썬 쪽 순차 읽기만 view 사용
+    view = getattr(img_info, "view", None)
+    return (view, 0) if view is not None else (img_info.read, depth)
+
+def nonuniform_segments(read_fn, offset, size, block, min_skip=None, on_data=None, depth=None,
+                        on_segment=None):
+    """
+    [offset, offset+size) 를 읽으며 0x00/0xFF 로만 채워진 구간을 걸러낸 데이터 구간 목록을 구함.
+    양 끝의 균일 구간은 항상, 중간의 균일 구간은 min_skip 이상일 때만 건너뜀
+    (영상 내부의 짧은 0 패딩으로 파일이 쪼개지지 않도록).
+    on_data(seg_no, buf) 가 있으면 각 구간에 속한 데이터를 순서대로 넘겨줌 (.bin 덤프용).
+    on_segment(seg_no, 오프셋, 길이) 는 구간이 확정되는 즉시 호출 (전체 순회가 끝나기 전에 카빙 시작용).
+    반환: ([(절대 오프셋, 길이), ...], 건너뛴 바이트 수)
+    """
+    if min_skip is None:
+        min_skip = SKIP_UNIFORM_MIN
+    chunk = max(block, (UNIFORM_SCAN_CHUNK // block) * block)
+    if depth is None:
+        depth = _env_int("VIREX_READAHEAD", READ_AHEAD_DEPTH)
+
+    segs, skipped = [], 0
+    seg_open = False
+    pend, pend_len = [], 0
+    end = offset + size
+    with ReadAhead(read_fn, depth=depth, limit=end) as ra:
+        cur = offset
+        while cur < end:
+            buf = ra.read(cur, min(chunk, end - cur))
+            if not buf:
+                break
+            view = memoryview(buf)
+            for uniform, a, b in _uniform_runs(buf, block):
+                n = b - a
+                if uniform:
+                    if not seg_open:
+                        skipped += n
+                    elif pend_len + n >= min_skip:
+                        skipped += pend_len + n
+                        pend, pend_len = [], 0
+                        seg_open = False
+                        if on_segment:
+                            on_segment(len(segs) - 1, *segs[-1])
+                    else:
+                        if on_data:
+                            pend.append(bytes(view[a:b]))
+                        pend_len += n
+                    continue
+
+                if seg_open:
+                    if on_data:
+                        for p in pend:
+                            on_data(len(segs) - 1, p)
+                    segs[-1][1] += pend_len
+                    pend, pend_len = [], 0
+                else:
+                    segs.append([cur + a, 0])
+                    seg_open = True
+                if on_data:
+                    on_data(len(segs) - 1, view[a:b])
+                segs[-1][1] += n
+            cur += len(buf)
+    skipped += pend_len
+    if seg_open and on_segment:
+        on_segment(len(segs) - 1, *segs[-1])
+    return [(o, n) for o, n in segs], skipped
+
+def _report_uniform_skip(start, length, skipped):
+    if skipped:
+        print(json.dumps({
+            "event": "fat32_skip_uniform",
+            "clusters": [int(start), int(start + length - 1)],
+            "skipped": skipped
+        }), flush=True)
+    return skipped
+
+def _fat32_read_fat(img_info, part_start_sector):
+    # BPB 확인 후 FAT 전체와 레이아웃 반환 → (layout, None) 또는 (None, 실패 사유)
     part_off = part_start_sector * 512
     bpb = img_info.read(part_off, 512)
     if not _fat32_looks_like_bpb(bpb):
-        return {"ok": False, "reason": "not_fat32"}
+        return None, "not_fat32"
 
     # BPB에서 실제 bytes per sector 읽기
     bps = struct.unpack_from("<H", bpb, 11)[0]
     if bps not in (512, 1024, 2048, 4096):
-        return {"ok": False, "reason": f"weird_sector_size_{bps}"}
+        return None, f"weird_sector_size_{bps}"
 
     # 파티션 오프셋 재계산
     part_off = part_start_sector * bps
@@ -397,58 +1461,423 @@ def dump_unalloc_fat32(img_info, part_start_sector, out_dir, label="fs_unalloc_f
     fat_off_rel, fat_bytes, data_off_rel, cluster_bytes = _fat32_parse_layout(bpb)
     fat = img_info.read(part_off + fat_off_rel, fat_bytes)
     if not fat:
-        return {"ok": False, "reason": "fat_read_fail"}
+        return None, "fat_read_fail"
+
+    return {
+        "part_off": part_off,
+        "fat": fat,
+        "data_abs": part_off + data_off_rel,
+        "cluster_bytes": cluster_bytes,
+        "root_cluster": _b_u32(bpb, 44),
+    }, None
+
+def _subtract_cluster_runs(starts, lengths, exclude):
+    # 빈 클러스터 구간에서 exclude [(첫 클러스터, 개수), ...] 를 뺀 나머지 구간
+    cuts = sorted((int(a), int(a) + int(n)) for a, n in exclude)
+    out_starts, out_lengths = [], []
+    for start, length in zip(starts, lengths):
+        cur, end = start, start + length
+        for a, b in cuts:
+            if b <= cur or a >= end:
+                continue
+            if a > cur:
+                out_starts.append(cur)
+                out_lengths.append(a - cur)
+            cur = max(cur, b)
+        if cur < end:
+            out_starts.append(cur)
+            out_lengths.append(end - cur)
+    return out_starts, out_lengths
+
+def dump_unalloc_fat32(img_info, part_start_sector, out_dir, label="fs_unalloc_fat32", dump=True,
+                       exclude=None, layout=None, sink=None, resume_after=None):
+    # dump=False 이면 .bin 을 쓰지 않고 빈 클러스터 구간(이미지 절대 오프셋)만 반환 → vol_carver.carve_extents 로 직접 카빙
+    # exclude: 삭제 엔트리로 이미 복구한 클러스터 구간 [(첫 클러스터, 개수), ...] → 덤프/카빙 대상에서 제외
+    # layout: 이미 읽은 _fat32_read_fat 결과 (없으면 여기서 읽음)
+    # sink(item, hits): dump=False 일 때 구간이 확정될 때마다 호출 → 히트를 모아 두지 않고 바로 카빙으로 넘김
+    # resume_after: 이 이미지 절대 오프셋 앞의 빈 클러스터는 이전 실행에서 이미 스캔함 → 그 뒤부터 이어서 스캔
+    if layout is None:
+        layout, reason = _fat32_read_fat(img_info, part_start_sector)
+        if layout is None:
+            return {"ok": False, "reason": reason}
+    fat, cluster_bytes, data_abs = layout["fat"], layout["cluster_bytes"], layout["data_abs"]
 
-    total_entries = len(fat) // 4
     out_path = os.path.join(out_dir, label)
     os.makedirs(out_path, exist_ok=True)
 
-    idx, total_bytes, items = 1, 0, []
-    cl = 2
-    while cl < total_entries:
-        val = _b_u32(fat, cl * 4) & 0x0FFFFFFF
-        if val == 0:
-            start = cl
-            while cl < total_entries and (_b_u32(fat, cl * 4) & 0x0FFFFFFF) == 0:
-                cl += 1
-            length = cl - start
-
-            run_off_abs = part_off + data_off_rel + (start - 2) * cluster_bytes
-            run_size    = length * cluster_bytes
+    starts, lengths = _fat32_free_runs(fat)
+    starts, lengths = starts.tolist(), lengths.tolist()
+    if exclude:
+        starts, lengths = _subtract_cluster_runs(starts, lengths, exclude)
+
+    idx, total_bytes, skipped_total, items, hits = 1, 0, 0, [], []
+    truncated = False
+    read_fn, depth = _image_reader(img_info, _env_int("VIREX_READAHEAD", READ_AHEAD_DEPTH))
+    hash_on = hashing_enabled()
+    budget = get_disk_budget() if dump else None
+
+    def _clusters(off, size):
+        first = 2 + (off - data_abs) // cluster_bytes
+        return [int(first), int(first + (size + cluster_bytes - 1) // cluster_bytes - 1)]
+
+    for start, length in zip(starts, lengths):
+        if resume_after is not None:
+            done = max(0, (resume_after - data_abs) // cluster_bytes + 2 - start)
+            if done >= length:
+                continue
+            start, length = start + done, length - done
+        run_off_abs = data_abs + (start - 2) * cluster_bytes
+        run_size    = length * cluster_bytes
+
+        hashers = {}
+        def _hash(seg_no, buf):
+            h = hashers.get(seg_no)
+            if h is None:
+                h = hashers[seg_no] = StreamHasher()
+            h.update(buf)
+
+        if not dump:
+            scanners = {}
+            def _scan(seg_no, buf):
+                sc = scanners.get(seg_no)
+                if sc is None:
+                    sc = scanners[seg_no] = SignatureScanner()
+                sc.feed(buf)
+                if hash_on:
+                    _hash(seg_no, buf)
+
+            def _segment(seg_no, seg_off, seg_size):
+                nonlocal idx, total_bytes
+                total_bytes += seg_size
+                item = {
+                    "index": idx,
+                    "offset": seg_off,
+                    "clusters": _clusters(seg_off, seg_size),
+                    "byte_len": seg_size
+                }
+                items.append(item)
+                # 스캔하지 않은 구간(None)은 카빙 워커가 직접 스캔
+                sc = scanners.pop(seg_no, None)
+                seg_hits = sc.finish() if sc else None
+                h = hashers.pop(seg_no, None)
+                if h is not None:
+                    item["hashes"] = h.hexdigests()
+                print(json.dumps({
+                    "event": "fat32_run",
+                    "offset": seg_off,
+                    "clusters": _clusters(seg_off, seg_size),
+                    "bytes": seg_size
+                }), flush=True)
+                idx += 1
+                if sink:
+                    sink(item, seg_hits)
+                else:
+                    hits.append(seg_hits)
+
+            if SKIP_UNIFORM:
+                # 빈 클러스터를 한 번 훑어 0x00/0xFF 로만 된 구간은 카빙 대상에서 제외
+                # 읽는 김에 해시와 카빙용 시그니처 스캔까지 끝내 carve_extents 가 같은 구간을 다시 읽지 않게 함
+                _, skipped = nonuniform_segments(
+                    read_fn, run_off_abs, run_size, cluster_bytes, on_data=_scan, depth=depth,
+                    on_segment=_segment
+                )
+            else:
+                _segment(0, run_off_abs, run_size)
+                skipped = 0
+            skipped_total += _report_uniform_skip(start, length, skipped)
+            continue
 
+        if budget:
+            try:
+                budget.wait_for(run_size, "dump", wait=budget_has_peers())
+            except DiskBudgetExceeded as e:
+                # 남은 빈 구간은 덤프하지 않고 지금까지 기록한 bin 만 카빙
+                logger.warning(f"비할당 덤프 중단: {e}")
+                truncated = True
+                break
+        if SKIP_UNIFORM:
+            # 읽으면서 균일 구간을 걸러 데이터 구간마다 별도 .bin 으로 기록
+            files = {}
+            def _write(seg_no, buf):
+                wf = files.get(seg_no)
+                if wf is None:
+                    for old in files.values():
+                        old.close()
+                    files.clear()
+                    wf = files[seg_no] = open_output(os.path.join(out_path, f"{idx + seg_no:03d}.bin"))
+                wf.write(buf)
+                if hash_on:
+                    _hash(seg_no, buf)
+            try:
+                segs, skipped = nonuniform_segments(
+                    read_fn, run_off_abs, run_size, cluster_bytes, on_data=_write, depth=depth
+                )
+            finally:
+                for wf in files.values():
+                    wf.close()
+        else:
             fn = os.path.join(out_path, f"{idx:03d}.bin")
-            with open(fn, "wb") as wf:
+            with open_output(fn) as f, ReadAhead(read_fn, depth=depth, limit=run_off_abs + run_size) as ra:
+                wf = HashingWriter(f) if hash_on else f
                 remain, cur = run_size, run_off_abs
                 CHUNK = 8 * 1024 * 1024
                 while remain > 0:
                     to_read = min(remain, CHUNK)
-                    buf = img_info.read(cur, to_read)
+                    buf = ra.read(cur, to_read)
                     if not buf:
                         break
                     wf.write(buf)
                     cur += len(buf)
                     remain -= len(buf)
+                if hash_on:
+                    hashers[0] = wf
+            segs, skipped = [(run_off_abs, run_size - remain)], 0
 
-            wrote = run_size - remain
+        for seg_no, (seg_off, wrote) in enumerate(segs):
+            fn = os.path.join(out_path, f"{idx:03d}.bin")
             total_bytes += wrote
             items.append({
                 "index": idx,
                 "file": fn,
-                "clusters": [int(start), int(start + length - 1)],
+                "clusters": _clusters(seg_off, wrote),
                 "byte_len": wrote
             })
+            if seg_no in hashers:
+                items[-1]["hashes"] = hashers[seg_no].hexdigests()
             print(json.dumps({
                 "event": "fat32_run",
                 "file": fn,
-                "clusters": [int(start), int(start + length - 1)],
+                "clusters": _clusters(seg_off, wrote),
                 "bytes": wrote
             }), flush=True)
             idx += 1
-        else:
-            cl += 1
+        skipped_total += _report_uniform_skip(start, length, skipped)
+
+    if idx == 1 and skipped_total:
+        return {"ok": False, "reason": "all_uniform", "skipped": skipped_total}
+    res = {"ok": idx > 1, "chunks": len(items), "bytes": total_bytes,
+           "skipped": skipped_total, "items": items}
+    if truncated:
+        res["truncated"] = "disk_budget"
+    if not dump and not sink:
+        # items 와 같은 순서의 시그니처 스캔 결과 (JSON 으로 저장하지 않음)
+        res["hits"] = hits
+    return res
+
+
+# ---------- FAT32 삭제 엔트리 복구 ----------
+# 삭제된 파일은 디렉토리 엔트리 첫 바이트만 0xE5 로 바뀌고 시작 클러스터/크기는 남는 경우가 많음.
+# 클러스터가 아직 비어 있으면 연속 저장으로 보고 그대로 복구 → 카빙은 나머지 빈 공간만 대상
+FAT_DIR_ENTRY = 32
+FAT_ATTR_LFN = 0x0F
+FAT_ATTR_DIR = 0x10
+FAT_ATTR_VOLUME = 0x08
+FAT_DELETED = 0xE5
+FAT_EOC = 0x0FFFFFF8
+# 영상 형식별 첫 클러스터 확인 (덮어써졌는지 판단)
+_DELETED_HEADER_CHECKS = {
+    '.mp4': lambda b: b[4:8] == b'ftyp',
+    '.avi': lambda b: b[:4] in (b'RIFF', b'RF64'),
+    '.jdr': lambda b: b.strip(b'\x00') != b'' and b.strip(b'\xff') != b'',
+}
+
+def _fat_entry(fat, cl):
+    return _b_u32(fat, cl * 4) & 0x0FFFFFFF
+
+def _fat_chain(fat, first):
+    # 디렉토리 클러스터 체인 (순환/범위 오류 방지)
+    total = len(fat) // 4
+    chain, seen, cl = [], set(), first
+    while 2 <= cl < total and cl not in seen:
+        seen.add(cl)
+        chain.append(cl)
+        cl = _fat_entry(fat, cl)
+        if cl >= FAT_EOC:
+            break
+    return chain
+
+def _fat_datetime(date, tm=0):
+    # FAT 날짜/시간(로컬 시각) → epoch (TSK 와 같은 해석)
+    if not date:
+        return 0
+    try:
+        return int(time.mktime((
+            1980 + (date >> 9), (date >> 5) & 0x0F, date & 0x1F,
+            tm >> 11, (tm >> 5) & 0x3F, (tm & 0x1F) * 2, 0, 0, -1
+        )))
+    except (OverflowError, ValueError):
+        return 0
+
+def _fat_short_name(raw):
+    base = raw[:8].rstrip(b' ')
+    ext = raw[8:11].rstrip(b' ')
+    name = base.decode('ascii', 'replace') + ('.' + ext.decode('ascii', 'replace') if ext else '')
+    return name
+
+def _fat_lfn_part(ent):
+    chars = ent[1:11] + ent[14:26] + ent[28:32]
+    return chars.decode('utf-16-le', 'ignore').split('\x00', 1)[0]
+
+def _clusters_free(fat, first, count):
+    seg = fat[first * 4:(first + count) * 4]
+    if len(seg) < count * 4:
+        return False
+    if seg == bytes(len(seg)):
+        return True
+    return all(_b_u32(seg, i * 4) & 0x0FFFFFFF == 0 for i in range(count))
+
+def _scan_fat32_dir(read_cluster, fat, first_cluster, path, out, depth=0):
+    if depth > 32:
+        return
+    lfn = []
+    for cl in _fat_chain(fat, first_cluster):
+        data = read_cluster(cl)
+        for off in range(0, len(data) - FAT_DIR_ENTRY + 1, FAT_DIR_ENTRY):
+            ent = data[off:off + FAT_DIR_ENTRY]
+            if ent[0] == 0x00:
+                return
+            attr = ent[11]
+            if attr == FAT_ATTR_LFN:
+                # 삭제 시 순번 바이트도 0xE5 가 되므로 연속된 LFN 조각을 그대로 모음
+                lfn.append((ent[13], _fat_lfn_part(ent)))
+                continue
+            parts, lfn = lfn, []
+            if attr & FAT_ATTR_VOLUME or ent[:2] in (b'. ', b'..'):
+                continue
+
+            deleted = ent[0] == FAT_DELETED
+            name = None
+            if parts and len({c for c, _ in parts}) == 1:
+                name = "".join(p for _, p in reversed(parts)) or None
+            if name is None:
+                short = b'_' + ent[1:11] if deleted else ent[:11]
+                name = _fat_short_name(short)
+            first = (_b_u16(ent, 20) << 16) | _b_u16(ent, 26)
+
+            if attr & FAT_ATTR_DIR:
+                # 할당된 하위 디렉토리만 따라감 (삭제 디렉토리 클러스터는 재사용됐을 수 있음)
+                if not deleted and first >= 2:
+                    _scan_fat32_dir(read_cluster, fat, first, path.rstrip('/') + '/' + name, out, depth + 1)
+                continue
+            if not deleted or not name.lower().endswith(VIDEO_EXTENSIONS):
+                continue
+            out.append({
+                "name": name,
+                "path": path.rstrip('/') + '/' + name,
+                "first_cluster": first,
+                "size": _b_u32(ent, 28),
+                "crtime": _fat_datetime(_b_u16(ent, 16), _b_u16(ent, 14)),
+                "mtime": _fat_datetime(_b_u16(ent, 24), _b_u16(ent, 22)),
+                "atime": _fat_datetime(_b_u16(ent, 18)),
+                "category": path.lstrip('/').split('/', 1)[0] or "root",
+            })
 
-    return {"ok": idx > 1, "chunks": len(items), "bytes": total_bytes, "items": items}
+def scan_deleted_fat32(img_info, part_start_sector, layout=None):
+    """
+    FAT32 디렉토리 트리를 순회해 0xE5 로 삭제 표시된 영상 엔트리를 찾고,
+    시작 클러스터부터 크기만큼의 클러스터가 모두 비어 있고 첫 클러스터가 형식 헤더와 맞으면
+    연속 저장된 파일로 보고 복구 후보로 반환. 같은 클러스터를 가리키는 후보는 최신 것만 사용.
+    layout 에 _fat32_read_fat 결과를 넘기면 FAT 를 다시 읽지 않음.
+    반환: (후보 목록, 실패 사유 또는 None)
+    """
+    if layout is None:
+        layout, reason = _fat32_read_fat(img_info, part_start_sector)
+        if layout is None:
+            return [], reason
+    fat, cb, data_abs = layout["fat"], layout["cluster_bytes"], layout["data_abs"]
+    total_clusters = len(fat) // 4
+
+    def _read_cluster(cl):
+        return img_info.read(data_abs + (cl - 2) * cb, cb)
+
+    found = []
+    _scan_fat32_dir(_read_cluster, fat, layout["root_cluster"], "/", found)
+
+    candidates, claimed = [], []
+    for ent in sorted(found, key=lambda e: e["mtime"], reverse=True):
+        first, size = ent["first_cluster"], ent["size"]
+        count = (size + cb - 1) // cb
+        ent["status"] = "recoverable"
+        if size <= 0 or first < 2 or first + count > total_clusters:
+            ent["status"] = "invalid_entry"
+        elif not _clusters_free(fat, first, count):
+            ent["status"] = "clusters_in_use"
+        elif any(first < b and a < first + count for a, b in claimed):
+            ent["status"] = "overlaps_newer"
+        else:
+            check = _DELETED_HEADER_CHECKS.get(os.path.splitext(ent["name"])[1].lower())
+            offset = data_abs + (first - 2) * cb
+            if check and not check(img_info.read(offset, 16)):
+                ent["status"] = "overwritten"
+            else:
+                ent["offset"] = offset
+                ent["clusters"] = [first, first + count - 1]
+                claimed.append((first, first + count))
+        print(json.dumps({
+            "event": "fat32_deleted_entry",
+            "name": ent["name"],
+            "path": ent["path"],
+            "size": size,
+            "status": ent["status"]
+        }, ensure_ascii=False), flush=True)
+        if ent["status"] == "recoverable":
+            candidates.append(ent)
+    return candidates, None
+
+def _deleted_file_obj(ent):
+    # handle_*_file 이 쓰는 pytsk3 File 속성(info.meta)만 흉내 냄
+    meta = SimpleNamespace(addr=0, size=ent["size"], crtime=ent["crtime"],
+                           mtime=ent["mtime"], atime=ent["atime"])
+    return SimpleNamespace(info=SimpleNamespace(meta=meta))
+
+def recover_deleted_fat32(img_info, part_start_sector, output_dir, partition=None, journal=None, layout=None):
+    """
+    scan_deleted_fat32 후보를 이미지에서 연속 구간으로 바로 읽어 일반 원본과 같은 처리(슬랙/분석)를 거침.
+    결과는 'deleted' 카테고리 폴더에 원래 이름으로 저장.
+    반환: (결과 목록, 복구한 클러스터 구간 [(첫 클러스터, 개수), ...])
+    """
+    candidates, reason = scan_deleted_fat32(img_info, part_start_sector, layout=layout)
+    if reason:
+        return [], []
+
+    results, claimed, used_names = [], [], set()
+    for ent in candidates:
+        first, last = ent["clusters"]
+        claimed.append((first, last - first + 1))
+        name = ent["name"]
+        if name.lower() in used_names:
+            stem, ext = os.path.splitext(name)
+            name = f"{stem}_{first}{ext}"
+        used_names.add(name.lower())
+
+        item = {"inode": f"fat32_deleted:{first}", "path": ent["path"]}
+        if journal and journal.has_file(item):
+            result = journal.file_result(item)
+        else:
+            file_obj = DataRunFile(_deleted_file_obj(ent), img_info, [(ent["offset"], ent["size"])])
+            try:
+                result = _handle_video_file(name, ent["path"], file_obj, output_dir, "deleted")
+            except Exception as e:
+                logger.warning(f"삭제 파일 복구 실패: {ent['path']} ({e})")
+                continue
+            if result:
+                result["deleted"] = {
+                    "original_category": ent["category"],
+                    "clusters": ent["clusters"],
+                    "image_offset": ent["offset"],
+                }
+            if journal:
+                journal.record_file(item, result)
+        if result:
+            results.append(result)
 
+    print(json.dumps({
+        "event": "fat32_deleted_done",
+        "partition": partition,
+        "recovered": len(results),
+        "bytes": sum(e["size"] for e in candidates)
+    }), flush=True)
+    return results, claimed
 
 def _detect_bps_for_partition(img_info, part_start_sector):
     try:
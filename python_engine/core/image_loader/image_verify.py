@@ -0,0 +1,136 @@
+import os
+import sys
+import json
+import time
+import ctypes
+import hashlib
+import logging
+import platform
+import threading
+import pyewf
+
+logger = logging.getLogger(__name__)
+
+# E01 무결성 검증: EWF 메타데이터에 저장된 MD5/SHA1 과 미디어 전체 해시 비교
+# 추출과 동시에 별도 핸들/스레드에서 낮은 I/O 우선순위로 읽음 (VIREX_VERIFY_IMAGE=1)
+VERIFY_CHUNK = 8 * 1024 * 1024
+REPORT_INTERVAL = 2.0
+# 저장 해시 식별자 → hashlib 이름
+_STORED_HASHES = (("MD5", "md5"), ("SHA1", "sha1"))
+
+def verify_enabled():
+    return os.environ.get("VIREX_VERIFY_IMAGE", "").lower() in ("1", "true", "yes")
+
+def _lower_io_priority():
+    # 현재 스레드만 백그라운드 I/O 우선순위로 (실패해도 무시)
+    try:
+        if sys.platform == "win32":
+            THREAD_MODE_BACKGROUND_BEGIN = 0x00010000
+            k32 = ctypes.windll.kernel32
+            k32.SetThreadPriority(k32.GetCurrentThread(), THREAD_MODE_BACKGROUND_BEGIN)
+        elif sys.platform.startswith("linux"):
+            nr = {"x86_64": 251, "aarch64": 30, "i686": 289, "i386": 289}.get(platform.machine())
+            if nr is None:
+                return
+            IOPRIO_WHO_PROCESS, IOPRIO_CLASS_IDLE = 1, 3
+            ctypes.CDLL(None, use_errno=True).syscall(
+                nr, IOPRIO_WHO_PROCESS, threading.get_native_id(), IOPRIO_CLASS_IDLE << 13
+            )
+    except Exception as e:
+        logger.debug(f"I/O 우선순위 변경 실패: {e}")
+
+def _stored_hashes(handle):
+    stored = {}
+    for ewf_name, algo in _STORED_HASHES:
+        try:
+            value = handle.get_hash_value(ewf_name)
+        except Exception:
+            value = None
+        if isinstance(value, bytes):
+            value = value.decode("ascii", "ignore")
+        if value and value.strip("0"):
+            stored[algo] = value.strip().lower()
+    return stored
+
+def _emit(state, **extra):
+    print(json.dumps({"event": "image_verify", "state": state, **extra}), flush=True)
+
+class ImageVerifier(threading.Thread):
+    """
+    EWF 이미지 전체를 자체 pyewf 핸들로 순차 읽어 저장 해시와 비교.
+    image_verify 이벤트: start → progress … → done(match) / skipped / error / cancelled
+    """
+
+    def __init__(self, img_path, chunk=VERIFY_CHUNK):
+        super().__init__(name="virex-image-verify", daemon=True)
+        self.img_path = img_path
+        self.chunk = chunk
+        self.result = None
+        self._stop_event = threading.Event()
+
+    def cancel(self):
+        self._stop_event.set()
+
+    def run(self):
+        _lower_io_priority()
+        handle = pyewf.handle()
+        try:
+            handle.open(pyewf.glob(self.img_path))
+        except Exception as e:
+            self.result = {"state": "error", "error": str(e)}
+            _emit(**self.result)
+            return
+        try:
+            self.result = self._verify(handle)
+        except Exception as e:
+            logger.warning(f"이미지 해시 검증 실패: {e}")
+            self.result = {"state": "error", "error": str(e)}
+        finally:
+            handle.close()
+        _emit(**self.result)
+
+    def _verify(self, handle):
+        stored = _stored_hashes(handle)
+        if not stored:
+            return {"state": "skipped", "reason": "no_stored_hash"}
+
+        total = handle.get_media_size()
+        hashers = {algo: hashlib.new(algo) for algo in stored}
+        _emit("start", total=total, stored=stored)
+        start = last = time.time()
+        offset = 0
+        while offset < total:
+            if self._stop_event.is_set():
+                return {"state": "cancelled", "bytes": offset, "total": total}
+            buf = handle.read_buffer_at_offset(min(self.chunk, total - offset), offset)
+            if not buf:
+                break
+            for h in hashers.values():
+                h.update(buf)
+            offset += len(buf)
+            now = time.time()
+            if now - last >= REPORT_INTERVAL:
+                last = now
+                _emit("progress", bytes=offset, total=total,
+                      percent=round(offset / total * 100, 1) if total else 100.0)
+
+        computed = {algo: h.hexdigest() for algo, h in hashers.items()}
+        mismatched = [algo for algo in stored if computed[algo] != stored[algo]]
+        return {
+            "state": "done",
+            "match": offset == total and not mismatched,
+            "mismatched": mismatched,
+            "bytes": offset,
+            "total": total,
+            "computed": computed,
+            "stored": stored,
+            "elapsed": round(time.time() - start, 1),
+        }
+
+def start_image_verify(img_path):
+    # E01/Ex01 이고 VIREX_VERIFY_IMAGE=1 일 때만 시작, 아니면 None
+    if not verify_enabled() or os.path.splitext(img_path)[1].lower() not in (".e01", ".ex01"):
+        return None
+    verifier = ImageVerifier(img_path)
+    verifier.start()
+    return verifier
@@ -0,0 +1,121 @@
+import os
+import json
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+class ExtractionJournal:
+    """
+    출력 폴더에 남기는 추가 기록 전용(jsonl) 작업 일지.
+    완료된 파일별 결과, 카빙이 끝난 bin, 끝난 단계(비할당 스캔/카빙), 스캔 중 확정된 구간을 한 줄씩 기록해 두고,
+    같은 이미지/출력 폴더로 재시작하면 기록된 작업은 건너뛰고 결과만 다시 씁니다.
+    첫 줄 header 의 이미지 정보가 다르면 기존 일지는 버리고 새로 시작합니다.
+    """
+
+    def __init__(self, path, identity):
+        self.path = path
+        self._files = {}
+        self._bins = {}
+        self._stages = {}
+        self._segments = {}
+        # 여러 디렉토리를 동시에 카빙하는 스레드가 같은 일지에 기록할 수 있음
+        self._lock = threading.Lock()
+        header = {"type": "header", "image": identity}
+
+        valid = False
+        if os.path.isfile(path):
+            with open(path, "r", encoding="utf-8") as f:
+                for n, line in enumerate(f):
+                    try:
+                        rec = json.loads(line)
+                    except ValueError:
+                        # 기록 도중 중단된 마지막 줄
+                        continue
+                    if n == 0:
+                        valid = rec == header
+                        if not valid:
+                            break
+                    elif rec.get("type") == "file":
+                        self._files[rec["key"]] = rec.get("result")
+                    elif rec.get("type") == "bin":
+                        self._bins[rec["bin"]] = rec.get("item")
+                    elif rec.get("type") == "stage":
+                        self._stages[rec["stage"]] = rec.get("result")
+                    elif rec.get("type") == "segment":
+                        self._segments.setdefault(rec["stage"], []).append(rec.get("item"))
+
+        if valid:
+            if self._files or self._bins or self._stages or self._segments:
+                logger.info(f"일지 재개: 파일 {len(self._files)}개, bin {len(self._bins)}개, "
+                            f"단계 {sorted(self._stages)} 완료됨 ({path})")
+            self._fh = open(path, "a", encoding="utf-8")
+            # 중단된 줄 뒤에 이어 쓰지 않도록 줄바꿈으로 시작
+            self._fh.write("\n")
+        else:
+            self._files.clear()
+            self._bins.clear()
+            self._stages.clear()
+            self._segments.clear()
+            self._fh = open(path, "w", encoding="utf-8")
+            self._append(header)
+
+    @staticmethod
+    def file_key(item):
+        return f"{item['inode']}:{item['path']}"
+
+    def _append(self, rec):
+        line = json.dumps(rec, ensure_ascii=False) + "\n"
+        with self._lock:
+            self._fh.write(line)
+            self._fh.flush()
+
+    # ---------- 파일 ----------
+    def has_file(self, item):
+        return self.file_key(item) in self._files
+
+    def file_result(self, item):
+        return self._files.get(self.file_key(item))
+
+    def record_file(self, item, result):
+        key = self.file_key(item)
+        self._files[key] = result
+        self._append({"type": "file", "key": key, "result": result})
+
+    # ---------- 카빙 bin ----------
+    def carved_bin(self, bin_name):
+        return self._bins.get(bin_name)
+
+    def record_bin(self, bin_name, item):
+        self._bins[bin_name] = item
+        self._append({"type": "bin", "bin": bin_name, "item": item})
+
+    # ---------- 단계 ----------
+    def stage(self, name):
+        # 끝난 단계의 기록 결과 (없으면 None)
+        return self._stages.get(name)
+
+    def record_stage(self, name, result):
+        self._stages[name] = result
+        self._append({"type": "stage", "stage": name, "result": result})
+
+    # ---------- 진행 중인 단계의 구간 ----------
+    def segments(self, stage):
+        # 단계가 끝나기 전에 확정돼 기록된 구간 목록 (기록 순서)
+        return list(self._segments.get(stage, ()))
+
+    def record_segment(self, stage, item):
+        self._segments.setdefault(stage, []).append(item)
+        self._append({"type": "segment", "stage": stage, "item": item})
+
+    def close(self):
+        if self._fh:
+            self._fh.close()
+            self._fh = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
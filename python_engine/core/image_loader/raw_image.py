@@ -0,0 +1,143 @@
+import os
+import re
+import mmap
+import bisect
+import pytsk3
+
+from python_engine.core.recovery.vol_recover.extent_stream import ExtentStream
+
+RAW_EXTENSIONS = ('.dd', '.raw', '.img')
+_SEGMENT_RE = re.compile(r'\.(\d{3})$')
+
+def raw_segments(img_path):
+    # image.001 → image.001, image.002, ... (연속으로 존재하는 데까지)
+    m = _SEGMENT_RE.search(img_path)
+    if not m:
+        return [img_path]
+    base, n = img_path[:m.start(1)], int(m.group(1))
+    paths = []
+    while os.path.isfile(f"{base}{n:03d}"):
+        paths.append(f"{base}{n:03d}")
+        n += 1
+    return paths or [img_path]
+
+def is_raw_image(img_path):
+    ext = os.path.splitext(img_path)[1].lower()
+    return ext in RAW_EXTENSIONS or bool(_SEGMENT_RE.search(ext))
+
+class RawImgInfo(pytsk3.Img_Info):
+    """
+    dd 이미지(단일 또는 .001/.002… 분할)를 세그먼트별 mmap 으로 열어 하나의 주소 공간으로 이어 붙인 Img_Info.
+    read(offset, size) 는 mmap 슬라이스로 처리하고, len()/[i]/[a:b]/find() 를 제공해
+    vol_carver 카버에 .bin 대신 그대로 넘길 수 있음 (세그먼트가 하나면 mmap 자체를 사용).
+    """
+
+    def __init__(self, paths):
+        if isinstance(paths, str):
+            paths = raw_segments(paths)
+        self.paths = list(paths)
+        self.name = self.paths[0]
+        self._files, self._maps, self._starts = [], [], []
+        total = 0
+        for p in self.paths:
+            f = open(p, 'rb')
+            size = os.fstat(f.fileno()).st_size
+            if size == 0:
+                f.close()
+                continue
+            self._files.append(f)
+            self._maps.append(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+            self._starts.append(total)
+            total += size
+        self._size = total
+        if len(self._maps) == 1:
+            self._scan = self._maps[0]
+        else:
+            self._scan = ExtentStream(self, [(0, total)], name=self.name)
+        super().__init__("", pytsk3.TSK_IMG_TYPE_EXTERNAL)
+
+    def get_size(self):
+        return self._size
+
+    def _segments(self, offset, size):
+        # [offset, offset+size) 를 (세그먼트 mmap, 세그먼트 내 시작, 끝) 조각으로 분할
+        end = min(self._size, offset + size)
+        i = bisect.bisect_right(self._starts, offset) - 1
+        while offset < end and 0 <= i < len(self._maps):
+            rel = offset - self._starts[i]
+            n = min(len(self._maps[i]) - rel, end - offset)
+            yield self._maps[i], rel, rel + n
+            offset += n
+            i += 1
+
+    def segment(self, offset, size):
+        # [offset, offset+size) 가 한 세그먼트 안이면 (세그먼트 mmap, 세그먼트 내 시작) → ExtentStream 이 복사 없이 직접 스캔
+        if offset < 0 or size <= 0 or offset + size > self._size:
+            return None
+        pieces = list(self._segments(offset, size))
+        if len(pieces) != 1:
+            return None
+        mm, a, _ = pieces[0]
+        return mm, a
+
+    def view(self, offset, size):
+        # 한 세그먼트 안이면 복사 없는 memoryview, 경계에 걸치면 이어 붙인 사본
+        if offset < 0 or size <= 0 or offset >= self._size:
+            return memoryview(b"")
+        pieces = list(self._segments(offset, size))
+        if len(pieces) == 1:
+            mm, a, b = pieces[0]
+            return memoryview(mm)[a:b]
+        return memoryview(b"".join(mm[a:b] for mm, a, b in pieces))
+
+    def read(self, offset, size):
+        if offset < 0 or size <= 0 or offset >= self._size:
+            return b""
+        pieces = list(self._segments(offset, size))
+        if len(pieces) == 1:
+            mm, a, b = pieces[0]
+            return mm[a:b]
+        return b"".join(mm[a:b] for mm, a, b in pieces)
+
+    # ---------- vol_carver 스캐너용 (mmap 과 같은 의미) ----------
+    def __len__(self):
+        return self._size
+
+    @property
+    def direct(self):
+        # 세그먼트가 하나면 sig_scan 이 mmap 을 직접 검색
+        return (self._maps[0], 0) if len(self._maps) == 1 else None
+
+    def __getitem__(self, key):
+        return self._scan[key]
+
+    def find(self, sub, start=0, end=None):
+        if end is None:
+            return self._scan.find(sub, start)
+        return self._scan.find(sub, start, end)
+
+    def iter_range(self, start, end, chunk=8 * 1024 * 1024):
+        pos = max(0, start)
+        end = min(end, self._size)
+        while pos < end:
+            buf = self.view(pos, min(chunk, end - pos))
+            if not len(buf):
+                break
+            yield buf
+            pos += len(buf)
+
+    def physical_offset(self, pos):
+        if pos < 0 or pos >= self._size:
+            raise IndexError(pos)
+        return pos
+
+    def close(self):
+        for mm in self._maps:
+            try:
+                mm.close()
+            except BufferError:
+                # 아직 살아있는 memoryview 가 있으면 GC 시 해제
+                pass
+        for f in self._files:
+            f.close()
+        self._maps, self._files = [], []
@@ -0,0 +1,128 @@
+import logging
+import queue
+import threading
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+class ReadAhead:
+    """
+    read(offset, size) 호출 패턴을 감시하다가 같은 크기의 연속 읽기가 이어지면
+    워커 스레드에서 다음 depth 개 블록을 미리 읽어(EWF 압축 해제 포함) 버퍼로 넘겨줍니다.
+    순차 패턴이 깨지면 선읽기를 중단하고 직접 읽기로 돌아갑니다.
+    """
+
+    def __init__(self, read_fn, depth=4, limit=None, min_streak=2):
+        self._read_fn = read_fn
+        self._depth = max(0, depth)
+        self._limit = limit
+        self._min_streak = min_streak
+        self._streak = 0
+        self._last_end = None
+        self._last_size = None
+        self._queue = None
+        self._thread = None
+        self._stop = None
+        self._expect = None
+        self.prefetched = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+    def read(self, offset, size):
+        if self._queue is not None:
+            if offset == self._expect:
+                item = self._queue.get()
+                if isinstance(item, BaseException):
+                    self._halt()
+                    raise item
+                # 마지막 블록은 limit 에 맞춰 잘려 있을 수 있음
+                if item is not _STOP and len(item[1]) <= size:
+                    buf_off, buf = item
+                    self._expect = buf_off + len(buf)
+                    self._last_end = self._expect
+                    self.prefetched += 1
+                    return buf
+            self._halt()
+
+        buf = self._read_fn(offset, size)
+        if self._last_end == offset and self._last_size == size:
+            self._streak += 1
+        else:
+            self._streak = 0
+        self._last_end = offset + len(buf) if buf else None
+        self._last_size = size
+
+        if (self._depth and buf and len(buf) == size and self._streak + 1 >= self._min_streak):
+            self._start(offset + size, size)
+        return buf
+
+    def _start(self, offset, size):
+        if self._limit is not None and offset >= self._limit:
+            return
+        self._queue = queue.Queue(maxsize=self._depth)
+        self._stop = threading.Event()
+        self._expect = offset
+        self._thread = threading.Thread(
+            target=self._worker, args=(offset, size, self._queue, self._stop),
+            name="virex-readahead", daemon=True
+        )
+        self._thread.start()
+
+    def _worker(self, offset, size, q, stop):
+        try:
+            while not stop.is_set():
+                to_read = size
+                if self._limit is not None:
+                    to_read = min(size, self._limit - offset)
+                    if to_read <= 0:
+                        break
+                buf = self._read_fn(offset, to_read)
+                if not buf:
+                    break
+                while not stop.is_set():
+                    try:
+                        q.put((offset, buf), timeout=0.2)
+                        break
+                    except queue.Full:
+                        continue
+                offset += len(buf)
+                if len(buf) < to_read:
+                    break
+        except BaseException as e:
+            self._put_final(q, stop, e)
+            return
+        self._put_final(q, stop, _STOP)
+
+    @staticmethod
+    def _put_final(q, stop, item):
+        while not stop.is_set():
+            try:
+                q.put(item, timeout=0.2)
+                return
+            except queue.Full:
+                continue
+
+    def _halt(self):
+        if self._thread is None:
+            return
+        self._stop.set()
+        try:
+            while True:
+                self._queue.get_nowait()
+        except queue.Empty:
+            pass
+        self._thread.join()
+        self._thread = None
+        self._queue = None
+        self._stop = None
+        self._expect = None
+        self._streak = 0
+
+    def close(self):
+        self._halt()
@@ -0,0 +1,197 @@
+import os
+import sys
+import json
+import time
+import shutil
+import hashlib
+import logging
+import tempfile
+
+from python_engine.core.recovery.utils.hashing import StreamHasher
+
+logger = logging.getLogger(__name__)
+
+# 엔진 출력 형식이 바뀌면 올려서 이전 캐시를 무효화
+ENGINE_VERSION = "2.0.1"
+
+CACHE_MAX_MB = 10 * 1024
+CACHE_MAX_DAYS = 30
+DIGEST_CHUNK = 8 * 1024 * 1024
+_OUT_TOKEN = "{{VIREX_OUT}}"
+
+def _env_int(name, default):
+    try:
+        return int(os.environ.get(name, default))
+    except (TypeError, ValueError):
+        return default
+
+def default_cache_root():
+    env = os.environ.get("VIREX_CACHE_DIR")
+    if env:
+        return env
+    if sys.platform == "win32":
+        base = os.environ.get("LOCALAPPDATA") or os.path.expanduser("~")
+        return os.path.join(base, "Virex", "cache")
+    return os.path.join(os.path.expanduser("~"), ".cache", "virex")
+
+def content_digests(file_obj, size, chunk=DIGEST_CHUNK):
+    # 파일 전체를 스트리밍으로 읽어 MD5/SHA-256 (샘플이 아닌 전체 내용 → 중간만 바뀐 파일도 구분)
+    hasher = StreamHasher()
+    pos = 0
+    while pos < size:
+        buf = file_obj.read_random(pos, min(chunk, size - pos))
+        if not buf:
+            break
+        hasher.update(buf)
+        pos += len(buf)
+    return hasher.hexdigests()
+
+def _dir_size(path):
+    total = 0
+    for root, _, files in os.walk(path):
+        for f in files:
+            try:
+                total += os.path.getsize(os.path.join(root, f))
+            except OSError:
+                pass
+    return total
+
+def _iter_strings(obj):
+    if isinstance(obj, str):
+        yield obj
+    elif isinstance(obj, dict):
+        for v in obj.values():
+            yield from _iter_strings(v)
+    elif isinstance(obj, (list, tuple)):
+        for v in obj:
+            yield from _iter_strings(v)
+
+class ResultCache:
+    """
+    세션 간 재사용되는 영구 결과 캐시 (VIREX_CACHE=1 일 때만 사용).
+      files/<key>/ : 파일별 analysis 결과(result.json) + 복구 산출물(files/, 출력 폴더와 별도 사본)
+    파일 키는 이미지가 아닌 파일 자체(이름/크기/시각 + 전체 내용 SHA-256)로 만들어
+    일부만 바뀐 이미지에서도 바뀌지 않은 파일은 그대로 재사용됩니다.
+    파일시스템 인벤토리는 캐시하지 않음 (매번 순회해 새 파일/바뀐 inode 를 놓치지 않음)
+    """
+
+    def __init__(self, root, max_bytes, max_age):
+        self.root = os.path.join(root, ENGINE_VERSION)
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        os.makedirs(os.path.join(self.root, "files"), exist_ok=True)
+
+    # ---------- 파일별 결과 ----------
+    def file_key(self, item, digests):
+        # digests: content_digests 로 구한 파일 전체 해시
+        h = hashlib.sha1()
+        h.update(json.dumps([
+            item.get("name"), int(item.get("size") or 0), item.get("crtime"), item.get("mtime"),
+            digests["sha256"]
+        ]).encode())
+        return h.hexdigest()
+
+    def restore(self, key, output_dir):
+        entry = os.path.join(self.root, "files", key)
+        result_path = os.path.join(entry, "result.json")
+        if not os.path.isfile(result_path):
+            return None
+        try:
+            with open(result_path, "r", encoding="utf-8") as f:
+                raw = f.read()
+            files_dir = os.path.join(entry, "files")
+            for root, _, files in os.walk(files_dir):
+                for fn in files:
+                    src = os.path.join(root, fn)
+                    dst = os.path.join(output_dir, os.path.relpath(src, files_dir))
+                    os.makedirs(os.path.dirname(dst), exist_ok=True)
+                    shutil.copy2(src, dst)
+            result = json.loads(raw.replace(_OUT_TOKEN, json.dumps(output_dir)[1:-1]))
+            os.utime(result_path, None)
+            return result
+        except (OSError, ValueError) as e:
+            logger.warning(f"캐시 복원 실패 ({key}): {e}")
+            return None
+
+    def store(self, key, result, output_dir):
+        entry = os.path.join(self.root, "files", key)
+        if os.path.isdir(entry):
+            return
+        out_prefix = os.path.abspath(output_dir) + os.sep
+        tmp = tempfile.mkdtemp(prefix=f".{key}.", dir=os.path.join(self.root, "files"))
+        try:
+            # 결과가 가리키는 출력 폴더 안의 파일만 함께 보관
+            for s in set(_iter_strings(result)):
+                p = os.path.abspath(s) if s else ""
+                if p.startswith(out_prefix) and os.path.isfile(p):
+                    dst = os.path.join(tmp, "files", p[len(out_prefix):])
+                    os.makedirs(os.path.dirname(dst), exist_ok=True)
+                    shutil.copy2(p, dst)
+            raw = json.dumps(result, ensure_ascii=False)
+            raw = raw.replace(json.dumps(os.path.abspath(output_dir))[1:-1], _OUT_TOKEN)
+            with open(os.path.join(tmp, "result.json"), "w", encoding="utf-8") as f:
+                f.write(raw)
+            with open(os.path.join(tmp, "meta.json"), "w", encoding="utf-8") as f:
+                json.dump({"bytes": _dir_size(tmp), "stored": int(time.time())}, f)
+            os.replace(tmp, entry)
+        except OSError as e:
+            # 다른 워커가 같은 키를 먼저 저장했거나 디스크 부족 → 캐시만 포기
+            logger.debug(f"캐시 저장 생략 ({key}): {e}")
+            shutil.rmtree(tmp, ignore_errors=True)
+
+    # ---------- 정리 ----------
+    def evict(self):
+        # 오래된 항목 삭제 후, 총 용량 초과분은 가장 오래 안 쓴 항목부터 삭제
+        now = time.time()
+        entries = []
+        files_dir = os.path.join(self.root, "files")
+        for key in os.listdir(files_dir):
+            entry = os.path.join(files_dir, key)
+            if key.startswith("."):
+                # 중단된 저장의 잔여물
+                if now - os.path.getmtime(entry) > 3600:
+                    shutil.rmtree(entry, ignore_errors=True)
+                continue
+            try:
+                used = os.path.getmtime(os.path.join(entry, "result.json"))
+                with open(os.path.join(entry, "meta.json"), "r", encoding="utf-8") as f:
+                    size = int(json.load(f).get("bytes", 0))
+            except (OSError, ValueError):
+                used, size = 0, 0
+            entries.append((used, size, entry))
+
+        # 이전 버전이 남긴 이미지 인벤토리 캐시 (더 이상 사용하지 않음)
+        shutil.rmtree(os.path.join(self.root, "images"), ignore_errors=True)
+
+        entries.sort()
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for used, size, entry in entries:
+            if now - used <= self.max_age and total <= self.max_bytes:
+                continue
+            shutil.rmtree(entry, ignore_errors=True)
+            total -= size
+            removed += 1
+        return {"entries": len(entries) - removed, "bytes": total, "evicted": removed}
+
+_cache = None
+
+def get_result_cache():
+    # VIREX_CACHE=1 일 때만 사용 (증거 사본을 사건 간 공용 폴더에 남기므로 기본 비활성화)
+    # 워커 프로세스에서도 같은 환경 변수로 동일 캐시를 엶
+    global _cache
+    if _cache is not None:
+        return _cache or None
+    if os.environ.get("VIREX_CACHE", "0").lower() not in ("1", "true", "yes"):
+        _cache = False
+        return None
+    try:
+        _cache = ResultCache(
+            default_cache_root(),
+            max_bytes=_env_int("VIREX_CACHE_MAX_MB", CACHE_MAX_MB) * 1024 * 1024,
+            max_age=_env_int("VIREX_CACHE_MAX_DAYS", CACHE_MAX_DAYS) * 86400,
+        )
+    except OSError as e:
+        logger.warning(f"결과 캐시 사용 불가: {e}")
+        _cache = False
+    return _cache or None
@@ -98,20 +98,11 @@ def collect_stco_co64_offsets(moov_bytes: bytes):
     offsets = sorted(set(offsets))
     return offsets
 
-def get_slack(data: bytes):
+def normal_data_end(total: int, moov_offset, moov_size, moov_bytes, mdats):
     """
-    MP4 파일에서 moov가 참조(stco/co64)하는 오프셋이 들어있는 mdat들의 끝을 계산하여
-    정상 데이터의 끝을 결정하고, 슬랙 데이터를 반환합니다.
-    슬랙 시작 = max(moov_end, 마지막으로 참조된 mdat의 끝)
-    반환: (slack_bytes, slack_start_offset, moov_box_bytes_or_none)
+    정상 데이터의 끝 = max(moov 끝, stco/co64 가 참조하는 마지막 mdat 의 끝).
+    경계가 비정상이면 None. (파일 전체 없이 박스 헤더/moov 만으로 계산 가능)
     """
-    total = len(data)
-    moov_offset, moov_size, moov_bytes, mdats = find_moov_and_mdats(data)
-
-    if moov_offset is None and not mdats:
-        logger.info("moov/mdat 박스를 찾지 못했습니다.")
-        return b"", None, None
-
     moov_end = (moov_offset + moov_size) if moov_offset is not None else 0
     ref_offsets = collect_stco_co64_offsets(moov_bytes) if moov_bytes else []
 
@@ -134,8 +125,27 @@ def get_slack(data: bytes):
     if normal_end <= 0 or normal_end > total:
         normal_end = moov_end if 0 < moov_end <= total else last_ref_mdat_end
         if normal_end <= 0 or normal_end > total:
-            logger.warning("슬랙 추출 실패: 정상 데이터 경계가 비정상적입니다.")
-            return b"", None, moov_bytes
+            return None
+    return normal_end
+
+def get_slack(data: bytes):
+    """
+    MP4 파일에서 moov가 참조(stco/co64)하는 오프셋이 들어있는 mdat들의 끝을 계산하여
+    정상 데이터의 끝을 결정하고, 슬랙 데이터를 반환합니다.
+    슬랙 시작 = max(moov_end, 마지막으로 참조된 mdat의 끝)
+    반환: (slack_bytes, slack_start_offset, moov_box_bytes_or_none)
+    """
+    total = len(data)
+    moov_offset, moov_size, moov_bytes, mdats = find_moov_and_mdats(data)
+
+    if moov_offset is None and not mdats:
+        logger.info("moov/mdat 박스를 찾지 못했습니다.")
+        return b"", None, None
+
+    normal_end = normal_data_end(total, moov_offset, moov_size, moov_bytes, mdats)
+    if normal_end is None:
+        logger.warning("슬랙 추출 실패: 정상 데이터 경계가 비정상적입니다.")
+        return b"", None, moov_bytes
 
     slack = data[normal_end:]
     return slack, normal_end, moov_bytes
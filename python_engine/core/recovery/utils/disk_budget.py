@@ -0,0 +1,148 @@
+import os
+import json
+import time
+import shutil
+import logging
+
+logger = logging.getLogger(__name__)
+
+# 임시 공간 예산 관리
+#  - 사용량 = 시작 시 여유 공간 - 현재 여유 공간 (워커 프로세스 간 별도 공유 없이 같은 디스크 기준)
+#    판단은 이 실측값으로만 함. written 은 wait_for 로 허용한 바이트의 단계별 합계(보고용)
+#  - 예산이 거의 찼으면 생산자(추출/덤프/카빙 쓰기)를 멈추고 공간이 확보될 때까지 대기
+#  - 대기 시간을 넘기면 해당 단계는 DiskBudgetExceeded 로 실패 (계속 써서 디스크를 넘기지 않음)
+#    이후 호출은 공간이 생기기 전까지 기다리지 않고 바로 실패
+#  - 중간 산출물을 동시에 정리할 다른 작업이 없으면(순차 처리) 기다리지 않고 바로 실패 (wait=False)
+#  - 소비가 끝난 중간 산출물(.bin, raw ES, remux 전 카빙 원본 등)은 즉시 삭제
+RESERVE_MB = 1024
+WAIT_SECONDS = 300
+POLL_SECONDS = 1.0
+REPORT_INTERVAL = 2.0
+
+def _env_int(name, default):
+    try:
+        return int(os.environ.get(name, default))
+    except (TypeError, ValueError):
+        return default
+
+def set_budget_peers(enabled):
+    # 파티션을 여러 프로세스로 동시에 처리하는 동안 설정 → 워커 프로세스에 환경 변수로 전달
+    if enabled:
+        os.environ["VIREX_BUDGET_PEERS"] = "1"
+    else:
+        os.environ.pop("VIREX_BUDGET_PEERS", None)
+
+def budget_has_peers():
+    # 다른 파티션 처리가 동시에 진행 중 → 그쪽 카빙이 중간 산출물을 정리해 공간이 생길 수 있음
+    return os.environ.get("VIREX_BUDGET_PEERS") == "1"
+
+def keep_intermediates():
+    return os.environ.get("VIREX_KEEP_INTERMEDIATE", "").lower() in ("1", "true", "yes")
+
+class DiskBudgetExceeded(OSError):
+    """임시 공간 예산 대기 시간 초과 → 해당 단계 쓰기 중단"""
+
+class DiskBudget:
+    def __init__(self, path, base_free, budget_bytes=None, reserve_bytes=None):
+        self.path = path
+        self.base_free = base_free
+        self.reserve = RESERVE_MB * 1024 * 1024 if reserve_bytes is None else reserve_bytes
+        self.budget = budget_bytes if budget_bytes else max(0, base_free - self.reserve)
+        self.written = {}
+        self.freed = {}
+        self.exhausted = False
+        self._last_report = 0.0
+
+    def _free(self):
+        try:
+            return shutil.disk_usage(self.path).free
+        except OSError:
+            return self.base_free
+
+    def usage(self):
+        free = self._free()
+        return {"free": free, "used": max(0, self.base_free - free), "budget": self.budget}
+
+    def _emit(self, state, **extra):
+        print(json.dumps({"event": "disk_budget", "state": state, **self.usage(), **extra}), flush=True)
+
+    def _fits(self, nbytes):
+        u = self.usage()
+        return u["free"] - nbytes >= self.reserve and u["used"] + nbytes <= self.budget
+
+    def wait_for(self, nbytes, stage, wait=True):
+        # 쓰기 전에 호출: 공간이 있으면 허용한 바이트를 written 에 더하고 반환
+        # 부족하면 대기 (다른 워커의 정리로 공간이 생기면 재개), 시간 초과 시 DiskBudgetExceeded
+        # wait=False: 공간을 정리할 동시 작업이 없는 호출 측 → 기다리지 않고 바로 실패
+        if self._fits(nbytes):
+            self.exhausted = False
+            self._admit(stage, nbytes)
+            return
+        if self.exhausted or not wait:
+            # 이미 한 번 대기 시간을 넘겼거나 기다려도 공간이 생기지 않음
+            self._emit("rejected", stage=stage, needed=nbytes)
+            raise DiskBudgetExceeded(f"임시 공간 부족: {stage} {nbytes} B")
+        self._emit("paused", stage=stage, needed=nbytes)
+        deadline = time.time() + _env_int("VIREX_BUDGET_WAIT_S", WAIT_SECONDS)
+        while time.time() < deadline:
+            time.sleep(POLL_SECONDS)
+            if self._fits(nbytes):
+                self._emit("resumed", stage=stage, needed=nbytes)
+                self._admit(stage, nbytes)
+                return
+        self.exhausted = True
+        logger.warning(f"임시 공간 대기 시간 초과 ({stage}, {nbytes} B) → 단계 중단")
+        self._emit("timeout", stage=stage, needed=nbytes)
+        raise DiskBudgetExceeded(f"임시 공간 대기 시간 초과: {stage} {nbytes} B")
+
+    def _admit(self, stage, nbytes):
+        self.written[stage] = self.written.get(stage, 0) + nbytes
+        self._maybe_report()
+
+    def release(self, path, stage):
+        # 소비가 끝난 중간 산출물 삭제 (VIREX_KEEP_INTERMEDIATE=1 이면 보존)
+        if not path or keep_intermediates():
+            return 0
+        try:
+            size = os.path.getsize(path)
+            os.remove(path)
+        except OSError:
+            return 0
+        self.freed[stage] = self.freed.get(stage, 0) + size
+        self._maybe_report()
+        return size
+
+    def _maybe_report(self):
+        now = time.time()
+        if now - self._last_report >= REPORT_INTERVAL:
+            self._last_report = now
+            self._emit("usage", written=self.written, freed=self.freed)
+
+    def summary(self):
+        self._emit("summary", written=self.written, freed=self.freed)
+
+_budget = None
+
+def init_disk_budget(path):
+    # 부모 프로세스에서 한 번 호출 → 환경 변수로 워커 프로세스에 같은 기준을 전달
+    global _budget
+    base_free = shutil.disk_usage(path).free
+    os.environ["VIREX_BUDGET_DIR"] = path
+    os.environ["VIREX_BUDGET_BASE_FREE"] = str(base_free)
+    _budget = None
+    return get_disk_budget()
+
+def get_disk_budget():
+    global _budget
+    if _budget is not None:
+        return _budget
+    path = os.environ.get("VIREX_BUDGET_DIR")
+    if not path:
+        return None
+    base_free = _env_int("VIREX_BUDGET_BASE_FREE", 0) or shutil.disk_usage(path).free
+    _budget = DiskBudget(
+        path, base_free,
+        budget_bytes=_env_int("VIREX_TEMP_BUDGET_MB", 0) * 1024 * 1024,
+        reserve_bytes=_env_int("VIREX_TEMP_RESERVE_MB", RESERVE_MB) * 1024 * 1024,
+    )
+    return _budget
@@ -0,0 +1,36 @@
+import os
+import hashlib
+
+# 증거 보존용 해시: 데이터를 쓰는 중에 함께 계산 (추가 읽기 없음)
+HASH_ALGORITHMS = ("md5", "sha256")
+
+def hashing_enabled():
+    return os.environ.get("VIREX_HASH", "1").lower() not in ("0", "false", "no")
+
+class StreamHasher:
+    def __init__(self, algorithms=HASH_ALGORITHMS):
+        self._hashes = {name: hashlib.new(name) for name in algorithms}
+
+    def update(self, buf):
+        for h in self._hashes.values():
+            h.update(buf)
+
+    def hexdigests(self):
+        return {name: h.hexdigest() for name, h in self._hashes.items()}
+
+class HashingWriter:
+    """파일 객체를 감싸 write() 되는 데이터를 그대로 해시에 반영"""
+
+    def __init__(self, fileobj, algorithms=HASH_ALGORITHMS):
+        self._f = fileobj
+        self._hasher = StreamHasher(algorithms)
+
+    def write(self, buf):
+        self._hasher.update(buf)
+        return self._f.write(buf)
+
+    def hexdigests(self):
+        return self._hasher.hexdigests()
+
+    def __getattr__(self, name):
+        return getattr(self._f, name)
@@ -0,0 +1,152 @@
+import os
+import threading
+from collections import deque
+
+# 쓰기 지연(write-behind): 출력 버퍼를 프로세스 공용 백그라운드 스레드로 넘겨
+# 읽기/파싱과 느린 대상 디스크(USB/NAS) 쓰기를 겹침
+#  - 파일별 쓰기 순서 보장 (단일 스레드 FIFO)
+#  - 대기 중인 버퍼 총량 제한 (VIREX_WRITE_BEHIND_MB), 넘으면 생산자 대기
+#  - fsync 정책 (VIREX_FSYNC = none | close | always)
+#  - 쓰기 오류는 다음 write()/close() 에서 생산자에게 다시 발생
+WRITE_BEHIND_MB = 64
+
+def _env_int(name, default):
+    try:
+        return int(os.environ.get(name, default))
+    except (TypeError, ValueError):
+        return default
+
+def write_behind_enabled():
+    return os.environ.get("VIREX_WRITE_BEHIND", "1").lower() not in ("0", "false", "no")
+
+def _fsync_policy():
+    policy = os.environ.get("VIREX_FSYNC", "none").lower()
+    return policy if policy in ("none", "close", "always") else "none"
+
+class _Writer:
+    def __init__(self, max_bytes, fsync):
+        self._queue = deque()
+        self._cv = threading.Condition()
+        self._pending = 0
+        self._max = max(1, max_bytes)
+        self._fsync = fsync
+        self._thread = None
+
+    def submit(self, afile, op, buf=None):
+        n = len(buf) if buf is not None else 0
+        with self._cv:
+            # 대기 버퍼가 한도를 넘으면 생산자를 멈춤 (한도보다 큰 단일 버퍼는 비어 있을 때 허용)
+            while self._pending and self._pending + n > self._max:
+                self._cv.wait()
+            self._queue.append((afile, op, buf))
+            self._pending += n
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="virex-writer", daemon=True)
+                self._thread.start()
+            self._cv.notify_all()
+
+    def _run(self):
+        while True:
+            with self._cv:
+                while not self._queue:
+                    self._cv.wait()
+                afile, op, buf = self._queue.popleft()
+            try:
+                if op == "write":
+                    if afile.error is None:
+                        afile.raw.write(buf)
+                        if self._fsync == "always":
+                            afile.raw.flush()
+                            os.fsync(afile.raw.fileno())
+                elif op == "close":
+                    try:
+                        if afile.error is None and self._fsync != "none":
+                            afile.raw.flush()
+                            os.fsync(afile.raw.fileno())
+                    finally:
+                        afile.raw.close()
+            except BaseException as e:
+                if afile.error is None:
+                    afile.error = e
+            finally:
+                if op == "close":
+                    afile.done.set()
+                with self._cv:
+                    self._pending -= len(buf) if buf is not None else 0
+                    self._cv.notify_all()
+
+_writer = None
+_writer_lock = threading.Lock()
+
+def _get_writer():
+    global _writer
+    with _writer_lock:
+        if _writer is None:
+            _writer = _Writer(_env_int("VIREX_WRITE_BEHIND_MB", WRITE_BEHIND_MB) * 1024 * 1024, _fsync_policy())
+        return _writer
+
+def _reset_after_fork():
+    global _writer, _writer_lock
+    _writer = None
+    _writer_lock = threading.Lock()
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+class AsyncFile:
+    """open(path, 'wb') 대신 쓰는 파일 객체. write() 는 큐에 넣고 바로 반환, close() 는 기록 완료까지 대기."""
+
+    def __init__(self, path):
+        self.name = path
+        self.raw = open(path, "wb")
+        self.error = None
+        self.done = threading.Event()
+        self.closed = False
+        self._failed = False
+        self._writer = _get_writer()
+
+    def _raise_pending(self):
+        # 백그라운드 기록 오류는 한 번만 원래 예외로 올리고, 이후 쓰기는 OSError 로 거부
+        if self.error is not None:
+            err, self.error = self.error, None
+            self._failed = True
+            raise err
+
+    def write(self, buf):
+        self._raise_pending()
+        if self._failed:
+            raise OSError(f"write-behind: earlier write to {self.name} failed")
+        # mmap 등 외부 버퍼는 생산자가 곧 해제할 수 있으므로 복사본을 넘김
+        if not isinstance(buf, bytes):
+            buf = bytes(buf)
+        if buf:
+            self._writer.submit(self, "write", buf)
+        return len(buf)
+
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        self._writer.submit(self, "close")
+        self.done.wait()
+        self._raise_pending()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            # 본문 예외가 우선, 기록 오류는 묻힘
+            try:
+                self.close()
+            except Exception:
+                pass
+        return False
+
+def open_output(path):
+    # 출력 파일 열기: write-behind 사용 시 AsyncFile, 아니면 일반 파일
+    if write_behind_enabled():
+        return AsyncFile(path)
+    return open(path, "wb")
@@ -0,0 +1,185 @@
+import bisect
+from collections import OrderedDict
+from typing import Iterable, List, Optional, Tuple
+
+WINDOW_SIZE = 4 * 1024 * 1024
+CACHED_WINDOWS = 8
+
+class ExtentStream:
+    """
+    이미지 위의 (offset, length) 구간들을 하나의 연속된 가상 주소 공간으로 보여주는 읽기 전용 스트림.
+    vol_carver 카버들이 .bin 덤프의 mmap 대신 그대로 스캔할 수 있도록
+    len(), [i], [a:b], find() 를 mmap 과 같은 의미로 제공합니다.
+    구간이 하나이고 reader 가 그 구간을 담은 mmap 을 알려주면(RawImgInfo.segment) 창 캐시 없이 mmap 을 직접 사용합니다.
+    """
+
+    def __init__(self, reader, extents: Iterable[Tuple[int, int]], name: Optional[str] = None,
+                window: int = WINDOW_SIZE, cached_windows: int = CACHED_WINDOWS):
+        # 복사 없는 view(RawImgInfo) 가 있으면 사용 → 구간 조각을 이어 붙일 때 한 번만 복사
+        self._read = getattr(reader, "view", None) or reader.read
+        self._extents: List[Tuple[int, int]] = [(int(o), int(n)) for o, n in extents if n > 0]
+        self._starts: List[int] = []
+        total = 0
+        for _, n in self._extents:
+            self._starts.append(total)
+            total += n
+        self._size = total
+        self._window = window
+        self._max_windows = max(2, cached_windows)
+        self._windows: "OrderedDict[int, bytes]" = OrderedDict()
+        if name is None:
+            name = f"extents@0x{self._extents[0][0]:X}" if self._extents else "extents"
+        self.name = name
+        self.bytes_read = 0
+        # (mmap, mmap 내 시작) — 가상 오프셋 pos 는 mmap 의 rel + pos
+        self._direct = None
+        segment = getattr(reader, "segment", None)
+        if segment is not None and len(self._extents) == 1:
+            self._direct = segment(*self._extents[0])
+
+    def __len__(self):
+        return self._size
+
+    @property
+    def extents(self) -> List[Tuple[int, int]]:
+        return list(self._extents)
+
+    @property
+    def window(self) -> int:
+        return self._window
+
+    @property
+    def direct(self):
+        # 직접 스캔 가능한 (mmap, 시작) 또는 None (sig_scan 이 창 읽기 없이 mmap 을 그대로 검색)
+        return self._direct
+
+    def physical_offset(self, pos: int) -> int:
+        # 가상 오프셋 → 이미지 절대 오프셋
+        i = bisect.bisect_right(self._starts, pos) - 1
+        if i < 0 or pos >= self._size:
+            raise IndexError(pos)
+        return self._extents[i][0] + (pos - self._starts[i])
+
+    def read(self, pos: int, size: int) -> bytes:
+        # 캐시를 거치지 않는 직접 읽기 (구간 경계를 넘어도 이어 붙임)
+        end = min(self._size, pos + size)
+        if pos < 0 or pos >= end:
+            return b""
+        if self._direct:
+            mm, rel = self._direct
+            self.bytes_read += end - pos
+            return mm[rel + pos:rel + end]
+        parts = []
+        i = bisect.bisect_right(self._starts, pos) - 1
+        while pos < end and i < len(self._extents):
+            ext_off, ext_len = self._extents[i]
+            rel = pos - self._starts[i]
+            n = min(ext_len - rel, end - pos)
+            buf = self._read(ext_off + rel, n)
+            if not buf:
+                break
+            parts.append(buf)
+            self.bytes_read += len(buf)
+            pos += len(buf)
+            if len(buf) < n:
+                break
+            i += 1
+        return b"".join(parts)
+
+    def _window_at(self, w: int) -> bytes:
+        buf = self._windows.get(w)
+        if buf is not None:
+            self._windows.move_to_end(w)
+            return buf
+        buf = self.read(w * self._window, self._window)
+        self._windows[w] = buf
+        while len(self._windows) > self._max_windows:
+            self._windows.popitem(last=False)
+        return buf
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            start, stop, step = key.indices(self._size)
+            if step != 1:
+                raise ValueError("ExtentStream supports only contiguous slices")
+            if stop <= start:
+                return b""
+            if self._direct:
+                mm, rel = self._direct
+                return mm[rel + start:rel + stop]
+            w = start // self._window
+            if (stop - 1) // self._window == w:
+                base = w * self._window
+                return self._window_at(w)[start - base:stop - base]
+            return self.read(start, stop - start)
+
+        pos = int(key)
+        if pos < 0:
+            pos += self._size
+        if pos < 0 or pos >= self._size:
+            raise IndexError("ExtentStream index out of range")
+        if self._direct:
+            mm, rel = self._direct
+            return mm[rel + pos]
+        w = pos // self._window
+        return self._window_at(w)[pos - w * self._window]
+
+    def find(self, sub: bytes, start: int = 0, end: Optional[int] = None) -> int:
+        if end is None or end > self._size:
+            end = self._size
+        if start < 0:
+            start = 0
+        if self._direct:
+            if start >= end:
+                return -1
+            mm, rel = self._direct
+            idx = mm.find(sub, rel + start, rel + end)
+            return -1 if idx == -1 else idx - rel
+        k = len(sub)
+        pos = start
+        while pos < end:
+            w = pos // self._window
+            base = w * self._window
+            buf = self._window_at(w)
+            if not buf:
+                return -1
+            idx = buf.find(sub, pos - base, min(len(buf), end - base))
+            if idx != -1:
+                return base + idx
+            win_end = base + len(buf)
+            if win_end >= end or len(buf) < self._window:
+                return -1
+            # 윈도우 경계에 걸친 매치
+            if k > 1:
+                seam_lo = max(pos, win_end - (k - 1))
+                seam = buf[seam_lo - base:] + self._window_at(w + 1)[:k - 1]
+                j = seam.find(sub)
+                if j != -1 and seam_lo + j + k <= end:
+                    return seam_lo + j
+            pos = win_end
+        return -1
+
+    def iter_range(self, start: int, end: int, chunk: int = WINDOW_SIZE):
+        # [start, end) 구간을 chunk 단위로 순서대로 돌려줌 (대용량 카빙 결과 쓰기용)
+        pos = max(0, start)
+        end = min(end, self._size)
+        if self._direct:
+            # 복사 없는 memoryview 조각 (쓰기 지연 파일은 큐에 넣을 때 복사)
+            mm, rel = self._direct
+            view = memoryview(mm)
+            try:
+                for a in range(pos, end, chunk):
+                    yield view[rel + a:rel + min(a + chunk, end)]
+            finally:
+                view.release()
+            return
+        while pos < end:
+            buf = self.read(pos, min(chunk, end - pos))
+            if not buf:
+                break
+            yield buf
+            pos += len(buf)
+
+    def close(self):
+        self._windows.clear()
+        self._direct = None
@@ -0,0 +1,142 @@
+import os
+import mmap
+from array import array
+from typing import Dict
+
+# vol_carver 공용 시그니처 스캐너
+# bin/이미지 구간을 고정 크기 창 단위로 한 번만 읽으면서 AVI(RIFF..AVI ), MP4(ftyp), Annex-B 시작 코드(00 00 01)를
+# 모두 찾아 형식별 히트 목록으로 돌려줌 → 카버들은 히트 위치 주변만 읽음 (형식마다 전체를 다시 스캔하지 않음)
+# 창 내에서는 시그니처별 bytes.find(C 구현)를 쓰는 쪽이 정규식 하나로 묶는 것보다 빠름
+SCAN_WINDOW_MB = 16
+# 창 끝에 걸친 시그니처와 'RIFF' + 크기 + 'AVI ' 12바이트 확인이 한 창 안에서 끝나도록 겹쳐 읽음
+_OVERLAP = 11
+
+SIG_RIFF = b"RIFF"
+SIG_FTYP = b"ftyp"
+SIG_START3 = b"\x00\x00\x01"
+
+# NAL 종류 인덱스(uint8) 비트: 코덱별 SPS/PPS/IDR 여부 + 자동 판별 결과 (carve_jdr_from_bin 분할용)
+NAL_H264_SPS = 0x01
+NAL_H264_PPS = 0x02
+NAL_H264_IDR = 0x04
+NAL_HEVC_SPS = 0x08
+NAL_HEVC_PPS = 0x10
+NAL_HEVC_IDR = 0x20
+NAL_AUTO_HEVC = 0x40  # 첫 두 바이트가 HEVC NAL 헤더로 보임
+NAL_SHORT = 0x80      # 페이로드가 2바이트 미만 (HEVC 헤더 판별 불가)
+
+_H264_FLAGS = bytes(
+    {7: NAL_H264_SPS, 8: NAL_H264_PPS, 5: NAL_H264_IDR}.get(t, 0) for t in range(32)
+)
+_HEVC_FLAGS = bytes(
+    {33: NAL_HEVC_SPS, 34: NAL_HEVC_PPS, 19: NAL_HEVC_IDR, 20: NAL_HEVC_IDR}.get(t, 0) for t in range(64)
+)
+
+def _scan_window() -> int:
+    val = os.environ.get("VIREX_SCAN_WINDOW_MB", "").strip()
+    return (int(val) if val.isdigit() and int(val) > 0 else SCAN_WINDOW_MB) * 1024 * 1024
+
+def _window(src, start: int, end: int, N: int):
+    # (검색 대상, 기준 오프셋, 검색 시작, 검색 끝) → mmap/bytes 는 복사 없이 범위 검색, 그 외(ExtentStream)는 창 읽기
+    hi = min(N, end + _OVERLAP)
+    if isinstance(src, (mmap.mmap, bytes, bytearray)):
+        return src, 0, start, hi
+    direct = getattr(src, "direct", None)
+    if direct:
+        # mmap 위의 단일 구간: 가상 오프셋 = mmap 위치 - rel
+        mm, rel = direct
+        return mm, -rel, start + rel, hi + rel
+    buf = src.read(start, hi - start)
+    return buf, start, 0, len(buf)
+
+def _scan_buf(buf, base: int, lo: int, hi: int, lim: int, out: Dict):
+    # buf[lo:hi] 에서 시작 위치가 lim 미만인 시그니처를 찾아 out 에 추가 (가상 오프셋 = base + 위치)
+    # lim 뒤로 _OVERLAP 바이트 이상 남아 있으면 각 히트의 판정(AVI 형식, NAL 헤더)은 이 창 안에서 끝남
+    avi, mp4, nal, nal_types = out["avi"], out["mp4"], out["nal"], out["nal_types"]
+
+    p = buf.find(SIG_RIFF, lo, hi)
+    while p != -1 and p < lim:
+        if buf[p + 8:p + 12] == b"AVI ":
+            avi.append(base + p)
+        p = buf.find(SIG_RIFF, p + 1, hi)
+
+    p = buf.find(SIG_FTYP, lo, hi)
+    while p != -1 and p < lim:
+        box_start = base + p - 4
+        if box_start >= 0:
+            mp4.append(box_start)
+        p = buf.find(SIG_FTYP, p + 1, hi)
+
+    # 00 00 00 01(4바이트 시작 코드)이어도 페이로드는 항상 00 00 01 위치 + 3
+    # NAL 헤더 바이트는 겹쳐 읽은 부분 안에 있으므로 여기서 종류까지 판정
+    p = buf.find(SIG_START3, lo, hi)
+    while p != -1 and p < lim:
+        q = p + 3
+        nal.append(base + q)
+        if q + 1 < hi:
+            b0, b1 = buf[q], buf[q + 1]
+            flags = _H264_FLAGS[b0 & 0x1F] | _HEVC_FLAGS[(b0 & 0x7E) >> 1]
+            if not b0 & 0x80 and b1 & 0x07:
+                flags |= NAL_AUTO_HEVC
+        elif q < hi:
+            flags = _H264_FLAGS[buf[q] & 0x1F] | NAL_SHORT
+        else:
+            flags = NAL_SHORT
+        nal_types.append(flags)
+        p = buf.find(SIG_START3, p + 1, hi)
+
+def _empty_hits() -> Dict:
+    return {"avi": [], "mp4": [], "nal": array("Q"), "nal_types": array("B")}
+
+def scan_signatures(src, window: int = None, start: int = 0, end: int = None) -> Dict:
+    """
+    반환: {"avi": [RIFF 오프셋], "mp4": [ftyp 박스 시작], "nal": array('Q') NAL 페이로드 오프셋,
+           "nal_types": array('B') NAL 종류 비트(NAL_*), "bytes": 스캔 길이}
+    nal 은 모든 00 00 01 위치 + 3 (4바이트 시작 코드 포함)이며 오름차순. NAL 하나당 9바이트.
+    start/end 를 주면 시작 위치가 [start, end) 인 시그니처만 찾음 (샤드 단위 병렬 카빙용, 경계에 걸친 것도 포함)
+    """
+    N = len(src)
+    end = N if end is None else min(end, N)
+    window = window or _scan_window()
+    out = _empty_hits()
+
+    for w_start in range(max(0, start), end, window):
+        w_end = min(end, w_start + window)
+        buf, base, lo, hi = _window(src, w_start, w_end, N)
+        # 이 창에서 인정하는 히트 시작 위치 상한 (겹친 부분은 다음 창 몫)
+        _scan_buf(buf, base, lo, hi, w_end - base, out)
+
+    out["bytes"] = max(0, end - start)
+    return out
+
+class SignatureScanner:
+    """
+    순서대로 들어오는 버퍼 조각(feed)에서 scan_signatures 와 같은 결과를 구함.
+    다른 목적(균일 구간 판별/해시)으로 이미 읽는 데이터를 그대로 넘겨 카빙용 스캔을 위해 다시 읽지 않게 함.
+    """
+
+    def __init__(self, window: int = None):
+        self._window = window or _scan_window()
+        self._buf = bytearray()
+        self._base = 0
+        self._size = 0
+        self._out = _empty_hits()
+
+    def feed(self, data):
+        self._buf += data
+        self._size += len(data)
+        if len(self._buf) >= self._window + _OVERLAP:
+            self._scan(final=False)
+
+    def _scan(self, final: bool):
+        hi = len(self._buf)
+        # 마지막이 아니면 끝의 _OVERLAP 바이트는 다음 조각과 이어서 판정
+        lim = hi if final else hi - _OVERLAP
+        _scan_buf(self._buf, self._base, 0, hi, lim, self._out)
+        del self._buf[:lim]
+        self._base += lim
+
+    def finish(self) -> Dict:
+        self._scan(final=True)
+        self._buf = bytearray()
+        return dict(self._out, bytes=self._size)
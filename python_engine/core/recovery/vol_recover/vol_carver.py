@@ -5,8 +5,24 @@ import subprocess
 import logging
 import mmap
 import sys
-import shutil
-from typing import Dict, List, Optional, Tuple
+import time
+import bisect
+import itertools
+import multiprocessing
+from array import array
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor, wait, FIRST_COMPLETED
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Iterable, List, Optional, Tuple
+from python_engine.core.recovery.vol_recover.extent_stream import ExtentStream, WINDOW_SIZE
+from python_engine.core.recovery.vol_recover.sig_scan import (
+    scan_signatures, NAL_H264_SPS, NAL_H264_PPS, NAL_H264_IDR,
+    NAL_HEVC_SPS, NAL_HEVC_PPS, NAL_HEVC_IDR, NAL_AUTO_HEVC, NAL_SHORT,
+)
+from python_engine.core.recovery.utils.hashing import HashingWriter, hashing_enabled
+from python_engine.core.recovery.utils.disk_budget import (
+    DiskBudgetExceeded, budget_has_peers, get_disk_budget, keep_intermediates
+)
+from python_engine.core.recovery.utils.write_behind import open_output
 
 logger = logging.getLogger(__name__)
 
@@ -22,10 +38,12 @@ def _nonempty_file(p: Optional[str]) -> Optional[str]:
         pass
     return None
 
-def _ensure_outdir(bin_path: str, out_dir: Optional[str]) -> str:
+def _ensure_outdir(bin_path, out_dir: Optional[str]) -> str:
     if out_dir:
         os.makedirs(out_dir, exist_ok=True)
         return out_dir
+    if not isinstance(bin_path, str):
+        raise ValueError("out_dir is required when carving from an extent stream")
     base = os.path.dirname(bin_path)
     root = os.path.dirname(base)
     carved_dir = os.path.join(root, "carved")
@@ -37,6 +55,86 @@ def _open_mmap(path: str):
     mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
     return f, mm
 
+def _open_source(src):
+    # .bin 경로면 mmap, 그 외(ExtentStream 등)는 그대로 사용
+    if isinstance(src, str):
+        f, mm = _open_mmap(src)
+        def _close():
+            mm.close(); f.close()
+        return mm, _close
+    return src, (lambda: None)
+
+def _source_name(src) -> str:
+    return src if isinstance(src, str) else getattr(src, "name", repr(src))
+
+def _abs_offset(mm, off: int) -> Optional[int]:
+    # 이미지에서 직접 스캔한 경우 절대 오프셋 반환
+    fn = getattr(mm, "physical_offset", None)
+    if fn is None:
+        return None
+    try:
+        return fn(off)
+    except IndexError:
+        return None
+
+def _write_range(wf, mm, start: int, end: int, chunk: int = 8 * 1024 * 1024, charge: bool = True) -> Optional[Dict]:
+    # 쓰면서 MD5/SHA-256 계산 → {"md5", "sha256"} (VIREX_HASH=0 이면 None)
+    # charge=False: 디스크에 남지 않는 대상(ffmpeg 파이프)이므로 임시 공간 예산에서 제외
+    budget = get_disk_budget() if charge else None
+    if budget:
+        # 풀 워커면 부모/다른 워커가 중간 산출물을 정리할 수 있으므로 대기, 혼자 처리 중이면 바로 실패
+        wait = budget_has_peers() or multiprocessing.parent_process() is not None
+        budget.wait_for(end - start, "carve", wait=wait)
+    if hashing_enabled():
+        wf = HashingWriter(wf)
+    if hasattr(mm, "iter_range"):
+        for buf in mm.iter_range(start, end, chunk):
+            wf.write(buf)
+    else:
+        view = memoryview(mm)
+        try:
+            for pos in range(start, end, chunk):
+                wf.write(view[pos:min(pos + chunk, end)])
+        finally:
+            view.release()
+    return wf.hexdigests() if isinstance(wf, HashingWriter) else None
+
+def _write_file(out_name: str, mm, start: int, end: int) -> Optional[Dict]:
+    # 카빙 결과 파일 1개 기록. 임시 공간 부족(DiskBudgetExceeded)이면 만든 파일을 지우고 다시 올림
+    try:
+        with open_output(out_name) as wf:
+            return _write_range(wf, mm, start, end)
+    except DiskBudgetExceeded:
+        _remove_quiet(out_name)
+        raise
+
+def _remove_quiet(*paths):
+    for p in paths:
+        if p:
+            try: os.remove(p)
+            except OSError: pass
+
+def _carve_failed(kind: str, mm, offset: int, length: int, err) -> Dict:
+    # 임시 공간 부족으로 기록하지 못한 카빙 대상 → 결과/일지에 실패로 남김 (같은 샤드의 다른 결과는 유지)
+    logger.warning(f"카빙 파일 기록 실패 ({kind} @ {offset}): {err}")
+    print(json.dumps({
+        "event": "carve_failed",
+        "kind": kind,
+        "offset": int(offset),
+        "bytes": int(length),
+        "reason": "disk_budget"
+    }), flush=True)
+    rec = {"kind": kind, "offset": offset, "length": length, "failed": "disk_budget"}
+    abs_off = _abs_offset(mm, offset)
+    if abs_off is not None:
+        rec["image_offset"] = abs_off
+    return rec
+
+def _release(path: Optional[str], stage: str) -> bool:
+    # 소비가 끝난 중간 산출물 즉시 삭제 (예산 관리자가 없거나 보존 설정이면 유지)
+    budget = get_disk_budget()
+    return bool(budget and budget.release(path, stage))
+
 # ffmpeg / ffprobe
 def _search_bin_upwards(start_dir: str) -> Optional[str]:
     cur = os.path.abspath(start_dir)
@@ -111,7 +209,7 @@ def ffprobe_json(path: str) -> Optional[Dict]:
 def _read_u32_le(mm, off: int, N: int | None = None):
     if N is None: N = len(mm)
     if off < 0 or off + 4 > N: return None
-    return struct.unpack_from("<I", mm, off)[0]
+    return struct.unpack("<I", mm[off:off+4])[0]
 
 def _read_fourcc(mm, off: int, N: int | None = None):
     if N is None: N = len(mm)
@@ -149,13 +247,16 @@ def carve_avi_from_bin(bin_path: str, out_dir: Optional[str] = None,
                         max_files: int = 1000,
                         max_total_len: int = 2_000_000_000,
                         require_movi: bool = True,
-                        require_hdrl: bool = True) -> List[Dict]:
+                        require_hdrl: bool = True,
+                        hits: Optional[List[int]] = None,
+                        name_prefix: str = "") -> List[Dict]:
+    # hits: scan_signatures 로 미리 찾은 RIFF 오프셋 (없으면 직접 스캔)
     out = []
     out_dir = _ensure_outdir(bin_path, out_dir)
-    f, mm = _open_mmap(bin_path)
+    mm, close = _open_source(bin_path)
     try:
         N = len(mm); count = 0
-        for riff_off in _iter_riff_avi_hits(mm):
+        for riff_off in (hits if hits is not None else _iter_riff_avi_hits(mm)):
             if count >= max_files: break
             if riff_off + 12 > N: continue
             riff_size = _read_u32_le(mm, riff_off+4, N)
@@ -179,10 +280,18 @@ def carve_avi_from_bin(bin_path: str, out_dir: Optional[str] = None,
             if not ok: continue
 
             count += 1
-            out_name = os.path.join(out_dir, f"carved_fixed_{count:04d}.avi")
-            with open(out_name, "wb") as wf:
-                wf.write(mm[riff_off: riff_off + total_len])
+            out_name = os.path.join(out_dir, f"{name_prefix}carved_fixed_{count:04d}.avi")
+            try:
+                hashes = _write_file(out_name, mm, riff_off, riff_off + total_len)
+            except DiskBudgetExceeded as e:
+                out.append(_carve_failed("avi", mm, riff_off, total_len, e))
+                continue
             out.append({"offset": riff_off, "length": total_len, "path": out_name})
+            abs_off = _abs_offset(mm, riff_off)
+            if abs_off is not None:
+                out[-1]["image_offset"] = abs_off
+            if hashes:
+                out[-1]["hashes"] = hashes
 
             print(json.dumps({
                 "event": "carved_file",
@@ -191,7 +300,7 @@ def carve_avi_from_bin(bin_path: str, out_dir: Optional[str] = None,
                 "bytes": int(total_len)
             }), flush=True)
     finally:
-        mm.close(); f.close()
+        close()
     return out
 
 # MP4 utils & carver (정확성 우선)
@@ -248,13 +357,16 @@ def carve_mp4_from_bin(bin_path: str, out_dir: Optional[str] = None,
                         max_files: int = 1000,
                         max_total_len: int = 1_500_000_000,
                         require_moov: bool = True,
-                        allow_fragmented: bool = True) -> List[Dict]:
+                        allow_fragmented: bool = True,
+                        hits: Optional[List[int]] = None,
+                        name_prefix: str = "") -> List[Dict]:
+    # hits: scan_signatures 로 미리 찾은 ftyp 박스 시작 오프셋 (없으면 직접 스캔)
     out: List[Dict] = []
     out_dir = _ensure_outdir(bin_path, out_dir)
-    f, mm = _open_mmap(bin_path)
+    mm, close = _open_source(bin_path)
     try:
         N = len(mm); count = 0
-        for box_start in _iter_ftyp_hits(mm):
+        for box_start in (hits if hits is not None else _iter_ftyp_hits(mm)):
             if count >= max_files: break
             typ, size, end = _read_box_be(mm, box_start, N)
             if typ != b"ftyp" or size is None or size < 16: continue
@@ -283,9 +395,12 @@ def carve_mp4_from_bin(bin_path: str, out_dir: Optional[str] = None,
             if dump_end <= box_start: continue
 
             count += 1
-            out_name = os.path.join(out_dir, f"carved_fixed_{count:04d}.mp4")
-            with open(out_name, "wb") as wf:
-                wf.write(mm[box_start:dump_end])
+            out_name = os.path.join(out_dir, f"{name_prefix}carved_fixed_{count:04d}.mp4")
+            try:
+                hashes = _write_file(out_name, mm, box_start, dump_end)
+            except DiskBudgetExceeded as e:
+                out.append(_carve_failed("mp4", mm, box_start, dump_end - box_start, e))
+                continue
 
             out.append({
                 "offset": box_start,
@@ -295,6 +410,11 @@ def carve_mp4_from_bin(bin_path: str, out_dir: Optional[str] = None,
                 "saw_mdat": saw_mdat,
                 "saw_moof": saw_moof
             })
+            abs_off = _abs_offset(mm, box_start)
+            if abs_off is not None:
+                out[-1]["image_offset"] = abs_off
+            if hashes:
+                out[-1]["hashes"] = hashes
 
             print(json.dumps({
                 "event": "carved_file",
@@ -303,49 +423,84 @@ def carve_mp4_from_bin(bin_path: str, out_dir: Optional[str] = None,
                 "bytes": int(dump_end - box_start)
             }), flush=True)
     finally:
-        mm.close(); f.close()
+        close()
     return out
 
 # JDR(Annex-B H.264/H.265) ES 카버 + remux
-START3, START4 = b"\x00\x00\x01", b"\x00\x00\x00\x01"
-
-def _iter_startcodes_mm(mm):
-    N = len(mm); pos = 0
-    while True:
-        hit = mm.find(START3, pos)
-        if hit == -1: return
-        sc_off = hit - 1 if hit > 0 and mm[hit-1] == 0x00 else hit
-        yield (sc_off + 4) if (sc_off + 4 <= N and mm[sc_off:sc_off+4] == START4) else (sc_off + 3)
-        pos = hit + 1
-
-def _next_start_off_mm(mm, from_payload: int) -> int:
-    N = len(mm); pos = from_payload
-    while True:
-        hit = mm.find(START3, pos)
-        if hit == -1: return N
-        sc_off = hit - 1 if hit > 0 and mm[hit-1] == 0x00 else hit
-        return (sc_off + 4) if (sc_off + 4 <= N and mm[sc_off:sc_off+4] == START4) else (sc_off + 3)
-
 def _nal_type_h264(nal_first_byte: int) -> int:
     return nal_first_byte & 0x1F
 
 def _nal_type_hevc(b0: int, b1: int) -> int:
     return (b0 & 0x7E) >> 1
 
-def _classify_codec(mm, nal_off: int) -> str:
-    if nal_off + 2 > len(mm): return "h264"
-    b0 = mm[nal_off]; b1 = mm[nal_off+1]
-    nal_h265 = ((b0 & 0x80) == 0) and ((b1 & 0x07) >= 1)
-    return "hevc" if nal_h265 else "h264"
+def _keep_raw_es() -> bool:
+    # 원본 ES(.h264/.h265) 보존은 선택 (VIREX_KEEP_ES=1 또는 VIREX_KEEP_INTERMEDIATE=1)
+    return (os.environ.get("VIREX_KEEP_ES", "").lower() in ("1", "true", "yes")
+            or keep_intermediates())
 
-def _remux_es_to_mp4(es_path: str, codec: str, out_dir: str) -> Optional[str]:
-    stem = os.path.splitext(os.path.basename(es_path))[0]
-    out_path = os.path.join(out_dir, f"{stem}.mp4")
+class _FfmpegStdin:
+    """ffmpeg stdin 으로 넘기면서 필요하면 원본 ES 파일에도 같이 씀. ffmpeg 가 먼저 종료해도 나머지 쓰기는 계속"""
+
+    def __init__(self, proc, es_file=None):
+        self._proc = proc
+        self._es = es_file
+        self.broken = False
+
+    def write(self, buf):
+        if self._es is not None:
+            self._es.write(buf)
+        if not self.broken:
+            try:
+                self._proc.stdin.write(buf)
+            except (BrokenPipeError, OSError):
+                self.broken = True
+        return len(buf)
+
+def _pipe_es_to_mp4(mm, start: int, end: int, codec: str, out_dir: str, stem: str) -> Tuple[Optional[str], Optional[str], Optional[Dict]]:
+    # mmap/ExtentStream 구간을 ffmpeg stdin(pipe:0)으로 바로 넘겨 -c copy remux → 중간 ES 파일 없음
+    # 반환: (보존한 ES 경로 또는 None, mp4 경로 또는 None, ES 해시)
+    # remux 실패 시에는 증거 보존을 위해 원본 ES 를 파일로 남김
     fmt = "h264" if codec == "h264" else "hevc"
-    cmd = [_ffmpeg_path(), "-y", "-loglevel", "warning", "-f", fmt, "-i", es_path,
+    es_path = os.path.join(out_dir, f"{stem}{'.h264' if fmt == 'h264' else '.h265'}")
+    out_path = os.path.join(out_dir, f"{stem}.mp4")
+    cmd = [_ffmpeg_path(), "-y", "-loglevel", "warning", "-f", fmt, "-i", "pipe:0",
             "-c", "copy", "-movflags", "+faststart", out_path]
-    code, _, _ = _run(cmd)
-    return _nonempty_file(out_path) if code == 0 else None
+    keep = _keep_raw_es()
+    try:
+        proc = subprocess.Popen(
+            cmd,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            creationflags=subprocess.CREATE_NO_WINDOW if os.name == "nt" else 0
+        )
+    except OSError as e:
+        logger.warning(f"ffmpeg 실행 실패 → 원본 ES 저장: {e}")
+        return es_path, None, _write_file(es_path, mm, start, end)
+
+    es_file = open_output(es_path) if keep else None
+    try:
+        sink = _FfmpegStdin(proc, es_file)
+        try:
+            # 파이프로만 가는 바이트는 예산에 넣지 않고, 원본 ES 를 보존할 때만 그만큼 차감
+            hashes = _write_range(sink, mm, start, end, charge=keep)
+        finally:
+            try: proc.stdin.close()
+            except OSError: pass
+            code = proc.wait()
+    finally:
+        if es_file is not None:
+            es_file.close()
+
+    mp4_path = _nonempty_file(out_path) if code == 0 and not sink.broken else None
+    if mp4_path is None:
+        # 중간에 끊긴 ffmpeg 가 남긴 불완전한 mp4 는 결과 폴더에 두지 않음
+        _remove_quiet(out_path)
+    if mp4_path is None and not keep:
+        logger.warning(f"ES remux 실패 (ffmpeg 종료 코드 {code}) → 원본 ES 저장: {es_path}")
+        _write_file(es_path, mm, start, end)
+        keep = True
+    return (es_path if keep else None), mp4_path, hashes
 
 def carve_jdr_from_bin(
     bin_path: str,
@@ -354,11 +509,15 @@ def carve_jdr_from_bin(
     max_total_len: int = 800_000_000,
     require_pps: bool = False,
     codec: str = "auto",
+    nal_offsets=None,
+    nal_types=None,
+    name_prefix: str = "",
 ) -> List[Dict]:
+    # NAL 인덱스(array('Q') 페이로드 오프셋 + array('B') 종류 비트) 위에서 SPS/PPS/IDR 경계로 ES 분할
+    # 인덱스가 없으면 한 번 스캔해서 만듦 (시작 코드마다 다음 시작 코드를 다시 찾지 않음)
     out: List[Dict] = []
     carved_dir = _ensure_outdir(bin_path, out_dir)
-    f, mm_raw = _open_mmap(bin_path)
-    mm = memoryview(mm_raw)
+    mm_raw, close = _open_source(bin_path)
     try:
         N = len(mm_raw)
         count = 0
@@ -371,26 +530,58 @@ def carve_jdr_from_bin(
         cur_codec = "h264"
         idr_count = 0
 
-        for nal_off in _iter_startcodes_mm(mm_raw):
+        def _carve_es(start, end, stem):
+            # ES 구간 1개 → mp4 (임시 공간 부족이면 남은 조각을 지우고 실패로 기록)
+            try:
+                es_path, mp4_path, hashes = _pipe_es_to_mp4(mm_raw, start, end, cur_codec, carved_dir, stem)
+            except DiskBudgetExceeded as e:
+                _remove_quiet(*(os.path.join(carved_dir, stem + ext) for ext in (".h264", ".h265", ".mp4")))
+                return dict(_carve_failed("jdr", mm_raw, start, end - start, e), codec=cur_codec)
+            item = {
+                "offset": start,
+                "length": end - start,
+                "es": es_path,
+                "rebuilt": mp4_path,
+                "ok": mp4_path is not None,
+                "codec": cur_codec
+            }
+            abs_off = _abs_offset(mm_raw, start)
+            if abs_off is not None:
+                item["image_offset"] = abs_off
+            if hashes:
+                item["es_hashes"] = hashes
+            return item
+
+        if nal_offsets is None or nal_types is None:
+            hits = scan_signatures(mm_raw)
+            nal_offsets, nal_types = hits["nal"], hits["nal_types"]
+        total = len(nal_offsets)
+
+        for i in range(total):
+            nal_off = nal_offsets[i]
             if count >= max_files or nal_off >= N:
                 break
-            next_off = _next_start_off_mm(mm_raw, nal_off + 1)
+            # 다음 시작 코드: 00 00 01 위치 >= nal_off + 1 ⇔ 페이로드 >= nal_off + 4 (겹친 시작 코드만 이진 탐색)
+            j = i + 1
+            if j < total and nal_offsets[j] < nal_off + 4:
+                j = bisect.bisect_left(nal_offsets, nal_off + 4, j)
+            next_off = nal_offsets[j] if j < total else N
             if next_off <= nal_off or (next_off - nal_off) < 2:
                 continue
 
-            detected = codec if codec in ("h264", "hevc") else _classify_codec(mm_raw, nal_off)
-            if detected == "h264":
-                ntype = mm_raw[nal_off] & 0x1F
-                is_sps = (ntype == 7)
-                is_pps = (ntype == 8)
-                is_idr = (ntype == 5)
+            flags = nal_types[i]
+            if codec == "h264" or (codec != "hevc" and not flags & NAL_AUTO_HEVC):
+                detected = "h264"
+                is_sps = bool(flags & NAL_H264_SPS)
+                is_pps = bool(flags & NAL_H264_PPS)
+                is_idr = bool(flags & NAL_H264_IDR)
             else:
-                if nal_off + 2 > N:
+                if flags & NAL_SHORT:
                     continue
-                ntype = ((mm_raw[nal_off] & 0x7E) >> 1)
-                is_sps = (ntype == 33)
-                is_pps = (ntype == 34)
-                is_idr = (ntype in (19, 20))
+                detected = "hevc"
+                is_sps = bool(flags & NAL_HEVC_SPS)
+                is_pps = bool(flags & NAL_HEVC_PPS)
+                is_idr = bool(flags & NAL_HEVC_IDR)
 
             if is_sps:
                 have_sps = True
@@ -414,44 +605,16 @@ def carve_jdr_from_bin(
 
             if is_idr and cur_start is not None:
                 if (next_off - cur_start) >= max_total_len:
-                    es_ext = ".h264" if cur_codec == "h264" else ".h265"
-                    es_path = os.path.join(carved_dir, f"carved_es_{count+1:04d}{es_ext}")
-                    with open(es_path, "wb") as wf:
-                        wf.write(mm[cur_start:next_off])
-                    mp4_path = _remux_es_to_mp4(es_path, "h264" if cur_codec == "h264" else "hevc", carved_dir)
-                    out.append({
-                        "offset": cur_start,
-                        "length": next_off - cur_start,
-                        "es": es_path,
-                        "rebuilt": mp4_path,
-                        "ok": mp4_path is not None,
-                        "codec": cur_codec
-                    })
+                    out.append(_carve_es(cur_start, next_off, f"{name_prefix}carved_es_{count+1:04d}"))
                     count += 1
                     cur_start = None
                     idr_count = 0
 
         if cur_start is not None:
             end = min(cur_start + max_total_len, N)
-            es_ext = ".h264" if cur_codec == "h264" else ".h265"
-            es_path = os.path.join(carved_dir, f"carved_es_{count+1:04d}{es_ext}")
-            with open(es_path, "wb") as wf:
-                wf.write(mm[cur_start:end])
-            mp4_path = _remux_es_to_mp4(es_path, "h264" if cur_codec == "h264" else "hevc", carved_dir)
-            out.append({
-                "offset": cur_start,
-                "length": end - cur_start,
-                "es": es_path,
-                "rebuilt": mp4_path,
-                "ok": mp4_path is not None,
-                "codec": cur_codec
-            })
+            out.append(_carve_es(cur_start, end, f"{name_prefix}carved_es_{count+1:04d}"))
     finally:
-        try: mm.release()
-        except: pass
-        try: mm_raw.close()
-        except: pass
-        try: f.close()
+        try: close()
         except: pass
 
     return out
@@ -518,6 +681,14 @@ def rebuild_carved_videos(bin_path, carved_list, force_fix: bool = False, fixed_
             "ok": (probe is not None),
             "probe": probe,
         })
+        # 카빙 시 계산한 원본 해시 (리빌드 결과가 원본 그대로면 동일)
+        if item.get("hashes"):
+            results[-1]["raw_hashes"] = item["hashes"]
+            if rebuilt == raw:
+                results[-1]["rebuilt_hashes"] = item["hashes"]
+        # 재구성에 성공했으면 remux 전 카빙 원본은 중간 산출물
+        if rebuilt != raw and probe is not None and _release(raw, "carve_raw"):
+            results[-1]["raw"] = None
     return results
 
 # Auto pipelines
@@ -531,30 +702,9 @@ def _dir_is_carvable(d: str) -> bool:
             return True
     return False
 
-def auto_carve_from_dir(bin_dir: str, max_files_per_bin=1000) -> Dict:
+def auto_carve_from_dir(bin_dir: str, max_files_per_bin=1000, journal=None, executor=None,
+                        workers: Optional[int] = None) -> Dict:
     print(f"[VOL_CARVER] auto_carve_from_dir bin_dir={bin_dir}", file=sys.stderr, flush=True)
-    items, carved_total, rebuilt_total = [], 0, 0
-
-    # 강제 리빌드 여부
-    force_fix = ("--fix" in sys.argv) or (str(os.environ.get("VIREX_FORCE_FIX", "")).lower() in ("1","true","yes"))
-
-    root = os.path.dirname(bin_dir)
-    carved_dir = os.path.join(root, "carved")
-    fixed_dir  = os.path.join(root, "carved_fixed")
-
-    if os.path.abspath(carved_dir) == os.path.abspath(fixed_dir):
-        raise RuntimeError("carved_dir and fixed_dir are identical; check your assignments.")
-
-    print(f"[VOL_CARVER] output dirs => carved_dir={carved_dir} , fixed_dir={fixed_dir}", file=sys.stderr, flush=True)
-    os.makedirs(carved_dir, exist_ok=True)
-    if force_fix and fixed_dir != carved_dir:
-        os.makedirs(fixed_dir, exist_ok=True)
-
-    print(json.dumps({
-        "event": "carve_dirs",
-        "carved_dir": carved_dir,
-        "fixed_dir": (fixed_dir if force_fix and fixed_dir != carved_dir else carved_dir)
-    }), flush=True)
 
     # bin 목록 구성
     bin_list: List[str] = []
@@ -579,79 +729,381 @@ def auto_carve_from_dir(bin_dir: str, max_files_per_bin=1000) -> Dict:
             if n.lower().endswith(".bin"):
                 bin_list.append(os.path.join(bin_dir, n))
 
-    # 각 bin 처리
-    for i, bin_path in enumerate(bin_list):
-        print(json.dumps({"event": "carve_start", "bin": bin_path}), flush=True)
+    # 카빙 결과는 bin 폴더 아래(<bin_dir>/carved)에 둠 → 동시에 도는 다른 파티션/디렉토리와 폴더를 공유하지 않음
+    return _carve_sources(bin_list, bin_dir, max_files_per_bin, journal=journal, executor=executor,
+                          workers=workers)
+
+# 병렬 카빙 스케줄러
+# bin(또는 이미지 구간)마다, 큰 것은 샤드 단위로 나눠 프로세스 풀에서 스캔 + AVI/MP4 카빙
+# → bin 의 샤드가 모두 끝나면 히트를 합치고(절대 오프셋 기준 중복 제거) JDR 카빙 + 리빌드 작업을 이어서 제출
+# 샤드는 시그니처 "시작 위치"로만 나누고 카빙은 소스 전체를 읽으므로 경계에 걸친 파일도 잘리지 않음
+CARVE_SHARD_MB = 1024
+
+def _carve_workers(cap: Optional[int] = None) -> int:
+    # cap: 호출 측이 배정한 프로세스 수 (파티션 병렬 처리 시 파티션별 몫) → 설정값과 관계없이 넘지 않음
+    val = os.environ.get("VIREX_CARVE_WORKERS", "").strip()
+    if val.isdigit() and int(val) > 0:
+        workers = int(val)
+    else:
+        workers = max(1, min(4, (os.cpu_count() or 1) // 2))
+    return max(1, min(workers, cap)) if cap else workers
+
+def _shard_ranges(size: int) -> List[Tuple[int, int]]:
+    val = os.environ.get("VIREX_CARVE_SHARD_MB", "").strip()
+    shard = (int(val) if val.isdigit() and int(val) > 0 else CARVE_SHARD_MB) * 1024 * 1024
+    return [(a, min(size, a + shard)) for a in range(0, size, shard)] or [(0, 0)]
+
+def _source_size(src) -> int:
+    return os.path.getsize(src) if isinstance(src, str) else len(src)
+
+def _source_spec(src, image_path: Optional[str]):
+    # 워커 프로세스로 넘길 수 있는 소스 표현 (.bin 경로 또는 이미지 경로 + 구간), 불가능하면 None
+    if isinstance(src, str):
+        return src
+    if image_path and isinstance(src, ExtentStream):
+        return ("extents", image_path, src.extents, src.name, src.window)
+    return None
+
+# 워커 프로세스별 이미지 핸들 (pyewf/pytsk3 핸들은 프로세스 간 공유 불가)
+_worker_images: Dict[str, object] = {}
+
+def _open_spec(spec):
+    if not isinstance(spec, tuple):
+        return _open_source(spec)
+    _, image_path, extents, name, window = spec
+    reader = _worker_images.get(image_path)
+    if reader is None:
+        # image_loader 가 vol_carver 를 import 하므로 워커에서 처음 쓸 때 가져옴
+        from python_engine.core.image_loader.e01_parser import open_image_file
+        reader = _worker_images[image_path] = open_image_file(image_path)
+    st = ExtentStream(reader, extents, name=name, window=window)
+    return st, st.close
+
+def _carve_shard(spec, name: str, start: int, end: int, carved_dir: str, max_files: int, prefix: str,
+                 hits: Optional[Dict] = None) -> Dict:
+    # hits: 소스를 이미 읽으면서 구한 이 샤드의 시그니처 (있으면 스캔 생략, 카빙할 파일 구간만 읽음)
+    # 제출 시점이 아니라 워커가 실제로 이 샤드를 시작할 때 알림
+    print(json.dumps({"event": "carve_start", "bin": name, "shard": [start, end]}), flush=True)
+    mm, close = _open_spec(spec)
+    try:
+        t0 = time.time()
+        prescanned = hits is not None
+        if not prescanned:
+            hits = scan_signatures(mm, start=start, end=end)
+        print(json.dumps({
+            "event": "carve_scan",
+            "bin": name,
+            "shard": [start, end],
+            "bytes": end - start,
+            "avi": len(hits["avi"]),
+            "mp4": len(hits["mp4"]),
+            "nal": len(hits["nal"]),
+            "prescanned": prescanned,
+            "elapsed_ms": int((time.time() - t0) * 1000)
+        }), flush=True)
+        avi = carve_avi_from_bin(mm, carved_dir, max_files, hits=hits["avi"], name_prefix=prefix)
+        mp4 = carve_mp4_from_bin(mm, carved_dir, max_files, hits=hits["mp4"], name_prefix=prefix)
+    finally:
+        close()
+    return {"avi": avi, "mp4": mp4, "nal": hits["nal"], "nal_types": hits["nal_types"]}
+
+def _carve_finish(spec, carved_dir: str, rebuild_dir: str, max_files: int, prefix: str,
+                  nal_offsets, nal_types, carved_all: List[Dict], force_fix: bool):
+    # ES 상태 머신은 소스 전체의 NAL 순서를 따라가야 하므로 샤드로 나누지 않음
+    mm, close = _open_spec(spec)
+    try:
+        jdr = carve_jdr_from_bin(mm, carved_dir, max_files=max_files, require_pps=False,
+                                 nal_offsets=nal_offsets, nal_types=nal_types, name_prefix=prefix)
+    finally:
+        close()
+    # force_fix 가 아니면 빠른 채택: 원본이 playable이면 그대로
+    rebuilt = rebuild_carved_videos(carved_dir, carved_all, force_fix=force_fix, fixed_dir=rebuild_dir)
+    return jdr, rebuilt
+
+def _shard_hits(hits: Optional[Dict], start: int, end: int) -> Optional[Dict]:
+    # 미리 구한 히트 중 샤드 [start, end) 에 속하는 AVI/MP4 만 (NAL 은 JDR 단계에서 소스 전체로 사용)
+    if hits is None:
+        return None
+    def _part(offsets):
+        return offsets[bisect.bisect_left(offsets, start):bisect.bisect_left(offsets, end)]
+    return {"avi": _part(hits["avi"]), "mp4": _part(hits["mp4"]), "nal": array("Q"), "nal_types": array("B")}
+
+class _InlineExecutor:
+    # 풀 없이 같은 스케줄링 코드로 즉시 실행
+    def submit(self, fn, *args):
+        fut = Future()
+        try:
+            fut.set_result(fn(*args))
+        except Exception as e:
+            fut.set_exception(e)
+        return fut
+
+def _carve_sources(bin_list: List, root: str, max_files_per_bin=1000, journal=None,
+                   image_path: Optional[str] = None, executor=None, workers: Optional[int] = None,
+                   hits: Optional[List[Optional[Dict]]] = None, stream: Optional[Iterable] = None) -> Dict:
+    # bin_list: .bin 경로 또는 ExtentStream (이미지에서 직접 스캔)
+    # journal: carved_bin(name)/record_bin(name, item) 제공 시 이미 끝난 bin 은 건너뜀
+    # image_path: ExtentStream 소스를 워커 프로세스에서 다시 열 때 사용 (없으면 현재 프로세스에서 처리)
+    # executor: 여러 디렉토리가 함께 쓰는 프로세스 풀 (없으면 필요할 때 직접 만듦)
+    # workers: 직접 만드는 풀의 최대 프로세스 수 (_carve_workers 상한)
+    # hits: bin_list 와 같은 순서의 미리 구한 scan_signatures 결과 (None 인 소스는 워커가 직접 스캔)
+    # stream: bin_list 뒤에 이어 붙일 (소스, 히트) 를 차례로 내주는 iterable
+    #   앞 소스를 카빙하는 동안 다음 소스를 준비(스캔)할 수 있고, None 은 아직 준비된 소스가 없다는 뜻
+    bin_list = list(bin_list)
+    hits = list(hits) if hits else [None] * len(bin_list)
+    items: List[Optional[Dict]] = [None] * len(bin_list)
+    totals = {"carved": 0, "rebuilt": 0}
+
+    # 강제 리빌드 여부
+    force_fix = ("--fix" in sys.argv) or (str(os.environ.get("VIREX_FORCE_FIX", "")).lower() in ("1","true","yes"))
 
-        avi = carve_avi_from_bin(bin_path, carved_dir, max_files_per_bin)
-        mp4 = carve_mp4_from_bin(bin_path, carved_dir, max_files_per_bin)
-        jdr = carve_jdr_from_bin(bin_path, carved_dir, max_files=max_files_per_bin, require_pps=False)
+    carved_dir = os.path.join(root, "carved")
+    fixed_dir  = os.path.join(root, "carved_fixed")
 
+    if os.path.abspath(carved_dir) == os.path.abspath(fixed_dir):
+        raise RuntimeError("carved_dir and fixed_dir are identical; check your assignments.")
+
+    print(f"[VOL_CARVER] output dirs => carved_dir={carved_dir} , fixed_dir={fixed_dir}", file=sys.stderr, flush=True)
+    os.makedirs(carved_dir, exist_ok=True)
+    if force_fix and fixed_dir != carved_dir:
+        os.makedirs(fixed_dir, exist_ok=True)
+    rebuild_dir = fixed_dir if force_fix else carved_dir
+
+    print(json.dumps({
+        "event": "carve_dirs",
+        "carved_dir": carved_dir,
+        "fixed_dir": (fixed_dir if force_fix and fixed_dir != carved_dir else carved_dir)
+    }), flush=True)
+
+    def _resumed(i):
+        # 일지에 끝난 bin 은 결과만 복원
+        bin_name = _source_name(bin_list[i])
+        done = journal.carved_bin(bin_name) if journal else None
+        if done is None:
+            return False
+        print(f"[VOL_CARVER] resume: skip {bin_name}", file=sys.stderr, flush=True)
+        items[i] = done
+        totals["carved"] += done.get("carved_count", 0)
+        totals["rebuilt"] += done.get("rebuilt_ok", 0)
+        return True
+
+    todo = [i for i in range(len(bin_list)) if not _resumed(i)]
+
+    def _arrivals():
+        yield from list(todo)
+        for entry in (stream or ()):
+            if entry is None:
+                yield None
+                continue
+            src, src_hits = entry
+            bin_list.append(src)
+            hits.append(src_hits)
+            items.append(None)
+            i = len(bin_list) - 1
+            if not _resumed(i):
+                todo.append(i)
+                yield i
+
+    # 스트림은 소스 수를 미리 알 수 없으므로 항상 bin 별 접두사를 붙임
+    multi = len(bin_list) > 1 or stream is not None
+    seen: Dict = {}
+
+    def _dedupe(i, carved):
+        # 샤드/소스 간 같은 위치에서 나온 결과는 하나만 유지 (이미지 절대 오프셋, 없으면 bin 내 오프셋)
+        # 먼저 차지한 bin 이 소유 (같은 bin 을 다시 처리하는 경우는 중복 아님)
+        kept = []
+        for it in carved:
+            key = ("image", it["image_offset"]) if it.get("image_offset") is not None else (i, it["offset"])
+            if seen.setdefault(key, i) != i:
+                try:
+                    os.remove(it["path"])
+                except OSError:
+                    pass
+                continue
+            kept.append(it)
+        return kept
+
+    def _cap(carved):
+        # max_files_per_bin 은 샤드별이 아니라 bin 전체 기준 → 합친 뒤 앞쪽(오프셋 순)만 남기고 나머지 삭제
+        # (샤드는 오프셋 순으로 합치므로 순차 카빙과 같은 파일이 남음)
+        for it in carved[max_files_per_bin:]:
+            try:
+                os.remove(it["path"])
+            except OSError:
+                pass
+        return carved[:max_files_per_bin]
+
+    def _split_failed(st, carved):
+        # 임시 공간 부족으로 기록하지 못한 대상은 중복 제거/리빌드에서 빼고 bin 결과에 실패로 남김
+        st["failed"].extend(x for x in carved if x.get("failed"))
+        return [x for x in carved if not x.get("failed")]
+
+    def _finish_bin(i, st, avi, mp4, jdr, rebuilt):
+        bin_path, bin_name = bin_list[i], st["name"]
+        jdr = _split_failed(st, jdr)
         print(json.dumps({
             "event": "carve_counts",
-            "bin": bin_path,
+            "bin": bin_name,
             "avi": len(avi),
             "mp4": len(mp4),
-            "jdr": len(jdr)
+            "jdr": len(jdr),
+            "failed": len(st["failed"])
         }), flush=True)
 
-        carved_all = avi + mp4
-        carved_total += len(carved_all) + len(jdr)
-
-        if force_fix:
-            rebuilt = rebuild_carved_videos(bin_path, carved_all, force_fix=True, fixed_dir=fixed_dir)
-        else:
-            # 빠른 채택: 원본이 playable이면 그대로
-            rebuilt = rebuild_carved_videos(bin_path, carved_all, force_fix=False, fixed_dir=carved_dir)
+        carved_count = len(avi) + len(mp4) + len(jdr)
+        totals["carved"] += carved_count
 
         created_cnt = len([x for x in rebuilt if x.get("rebuilt") or x.get("raw")])
         if created_cnt > 0:
             print(json.dumps({
                 "event": "carved_nonempty",
-                "bin": bin_path,
+                "bin": bin_name,
                 "count": created_cnt
             }), flush=True)
 
         rebuilt_ok = sum(1 for x in rebuilt if x.get("ok"))
-        rebuilt_total += rebuilt_ok
+        totals["rebuilt"] += rebuilt_ok
 
         print(json.dumps({
             "event": "rebuild_result",
-            "bin": bin_path,
+            "bin": bin_name,
             "rebuilt_ok": rebuilt_ok,
             "rebuilt_total": len(rebuilt)
         }), flush=True)
 
-        items.append({
+        # 이 bin 을 쓰는 카빙/리빌드가 모두 끝났으므로 덤프 파일 정리
+        if isinstance(bin_path, str):
+            _release(bin_path, "dump")
+
+        item = {
             "bin_index": i,
-            "bin": bin_path,
-            "carved_count": len(carved_all) + len(jdr),
+            "bin": bin_name,
+            "carved_count": carved_count,
             "rebuilt_ok": rebuilt_ok,
             "rebuilt": rebuilt,
             "jdr": jdr
-        })
-
-        if carved_total == 0 and os.path.isdir(carved_dir):
-            try:
-                shutil.rmtree(carved_dir)
-            except Exception as e:
-                logger.warning(f"carved 폴더 삭제 실패: {e}")
+        }
+        if st["failed"]:
+            item["failed"] = st["failed"]
+        items[i] = item
+        if journal:
+            journal.record_bin(bin_name, item)
+
+    def _run(ex, indices, pooled, ahead=None):
+        # indices: 처리할 소스 번호를 차례로 내주는 iterable (None 이면 새 소스 없이 끝난 작업만 처리)
+        # ahead: 동시에 진행 중인 소스 수 상한 → 넘으면 다음 소스를 받기 전에 끝나기를 기다림 (스트림 히트가 쌓이지 않게)
+        state, pending = {}, {}
+
+        def _submit(i):
+            src = bin_list[i]
+            st = state[i] = {
+                "name": _source_name(src),
+                "spec": _source_spec(src, image_path) if pooled else src,
+                "prefix": f"b{i + 1:03d}_" if multi else "",
+                "hits": hits[i],
+                "failed": [],
+            }
+            shards = _shard_ranges(_source_size(src))
+            st["shards"], st["left"] = [None] * len(shards), len(shards)
+            for k, (a, b) in enumerate(shards):
+                prefix = st["prefix"] + (f"s{k + 1:02d}_" if len(shards) > 1 else "")
+                fut = ex.submit(_carve_shard, st["spec"], st["name"], a, b, carved_dir, max_files_per_bin, prefix,
+                                _shard_hits(st["hits"], a, b))
+                pending[fut] = ("shard", i, k)
+
+        def _collect(done):
+            for fut in done:
+                kind, i, k = pending.pop(fut)
+                st = state[i]
+                try:
+                    res = fut.result()
+                except BrokenProcessPool:
+                    raise
+                except Exception as e:
+                    logger.warning(f"카빙 작업 실패: {st['name']} ({e})")
+                    res = None
+
+                if kind == "shard":
+                    st["shards"][k] = res or {"avi": [], "mp4": [], "nal": array("Q"), "nal_types": array("B")}
+                    st["left"] -= 1
+                    if st["left"]:
+                        continue
+                    st["avi"] = _cap(_dedupe(i, _split_failed(st, [x for r in st["shards"] for x in r["avi"]])))
+                    st["mp4"] = _cap(_dedupe(i, _split_failed(st, [x for r in st["shards"] for x in r["mp4"]])))
+                    if st["hits"] is not None:
+                        nal, nal_types = st["hits"]["nal"], st["hits"]["nal_types"]
+                    else:
+                        nal, nal_types = array("Q"), array("B")
+                        for r in st["shards"]:
+                            nal.extend(r["nal"])
+                            nal_types.extend(r["nal_types"])
+                    st["shards"] = st["hits"] = hits[i] = None
+                    fut = ex.submit(_carve_finish, st["spec"], carved_dir, rebuild_dir, max_files_per_bin,
+                                    st["prefix"], nal, nal_types, st["avi"] + st["mp4"], force_fix)
+                    pending[fut] = ("finish", i, 0)
+                else:
+                    jdr, rebuilt = res if res else ([], [])
+                    _finish_bin(i, state.pop(i), st["avi"], st["mp4"], jdr, rebuilt)
+
+        for i in indices:
+            if i is not None:
+                while ahead and len(state) >= ahead and pending:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    _collect(done)
+                _submit(i)
+            # 다음 소스를 기다리는 동안 끝난 샤드는 바로 마무리 단계로 넘김
+            _collect([fut for fut in pending if fut.done()])
+
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            _collect(done)
+
+    workers = _carve_workers(workers)
+    streamed = stream is not None
+    shippable = all(_source_spec(bin_list[i], image_path) is not None for i in todo) and \
+        (not streamed or image_path is not None)
+    jobs = sum(len(_shard_ranges(_source_size(bin_list[i]))) for i in todo)
+    ahead = max(2, workers * 2) if streamed else None
+    feed = _arrivals()
+    try:
+        if executor is not None and shippable:
+            _run(executor, feed, True, ahead)
+        elif shippable and workers > 1 and (jobs > 1 or streamed):
+            with ProcessPoolExecutor(max_workers=workers if streamed else min(workers, jobs)) as pool:
+                _run(pool, feed, True, ahead)
+        else:
+            _run(_InlineExecutor(), feed, False, ahead)
+    except BrokenProcessPool as e:
+        # 풀이 깨지면 끝나지 않은 bin 만 현재 프로세스에서 처음부터 다시 처리 (스트림은 남은 소스까지 이어서)
+        logger.warning(f"카빙 워커 풀 중단, 순차 처리로 전환: {e}")
+        retry = [i for i in todo if items[i] is None]
+        seen_idx = set(retry)
+        _run(_InlineExecutor(), itertools.chain(retry, (i for i in feed if i not in seen_idx)), False, ahead)
+
+    if totals["carved"] == 0 and os.path.isdir(carved_dir):
+        # 비어 있을 때만 삭제 (남은 파일이 있으면 지우지 않음)
+        try:
+            os.rmdir(carved_dir)
+        except OSError as e:
+            logger.debug(f"carved 폴더 유지: {e}")
 
     return {
         "ok": True,
         "inputs": len(bin_list),
-        "carved_total": carved_total,
-        "rebuilt_total": rebuilt_total,
+        "carved_total": totals["carved"],
+        "rebuilt_total": totals["rebuilt"],
         "outputs": {
             "carved_dir": carved_dir,
             "fixed_dir": (fixed_dir if force_fix and fixed_dir != carved_dir else carved_dir)
         },
-        "items": items
+        "items": [it for it in items if it is not None]
     }
 
 def carve_everything(base_dir: str,
                     max_files_per_bin: int = 1000,
-                    ffmpeg_dir_override: Optional[str] = None) -> Dict:
+                    ffmpeg_dir_override: Optional[str] = None,
+                    journal=None,
+                    workers: Optional[int] = None) -> Dict:
     if ffmpeg_dir_override:
         os.environ["VIREX_FFMPEG_DIR"] = ffmpeg_dir_override
 
@@ -660,16 +1112,107 @@ def carve_everything(base_dir: str,
                 "visited_dirs": 0, "targets": [],
                 "summary": {"inputs": 0,"carved_total": 0,"rebuilt_total": 0}}
 
+    carvable = []
     for cur, dirs, files in os.walk(base_dir):
         results["visited_dirs"] += 1
         if _dir_is_carvable(cur):
-            try:
-                r = auto_carve_from_dir(cur, max_files_per_bin=max_files_per_bin)
-                results["targets"].append(r)
-                results["summary"]["inputs"] += r.get("inputs", 0)
-                results["summary"]["carved_total"] += r.get("carved_total", 0)
-                results["summary"]["rebuilt_total"] += r.get("rebuilt_total", 0)
-            except Exception as e:
-                logger.exception("auto_carve_from_dir failed on %s", cur)
-                results["targets"].append({"ok": False,"dir": cur,"error": str(e)})
-    return results
\ No newline at end of file
+            carvable.append(cur)
+
+    def _carve_dir(cur, executor=None):
+        try:
+            return auto_carve_from_dir(cur, max_files_per_bin=max_files_per_bin, journal=journal,
+                                       executor=executor, workers=workers)
+        except Exception as e:
+            logger.exception("auto_carve_from_dir failed on %s", cur)
+            return {"ok": False,"dir": cur,"error": str(e)}
+
+    workers = _carve_workers(workers)
+    if len(carvable) > 1 and workers > 1:
+        # 디렉토리들이 하나의 프로세스 풀을 나눠 씀 (디렉토리별 스케줄링은 스레드에서)
+        with ProcessPoolExecutor(max_workers=workers) as pool, \
+                ThreadPoolExecutor(max_workers=len(carvable)) as threads:
+            targets = list(threads.map(lambda d: _carve_dir(d, pool), carvable))
+    else:
+        targets = [_carve_dir(d) for d in carvable]
+
+    for r in targets:
+        results["targets"].append(r)
+        results["summary"]["inputs"] += r.get("inputs", 0)
+        results["summary"]["carved_total"] += r.get("carved_total", 0)
+        results["summary"]["rebuilt_total"] += r.get("rebuilt_total", 0)
+    return results
+
+def carve_extents(reader, extents: List[Tuple[int, int]], base_dir: str,
+                max_files_per_bin: int = 1000,
+                ffmpeg_dir_override: Optional[str] = None,
+                journal=None,
+                window: Optional[int] = None,
+                image_path: Optional[str] = None,
+                workers: Optional[int] = None,
+                hits: Optional[List[Optional[Dict]]] = None,
+                stream: Optional[Iterable] = None) -> Dict:
+    """
+    비할당 구간을 .bin 으로 덤프하지 않고 이미지 리더(read(offset, size))에서 직접 카빙합니다.
+    extents 의 각 (이미지 오프셋, 길이) 구간이 기존 .bin 하나에 해당하며, 카빙된 결과만 base_dir/carved 에 기록됩니다.
+    window 로 한 번에 읽는 크기를 키울 수 있음 (큰 볼륨 공백 영역 순차 스캔용)
+    image_path 를 주면 워커 프로세스가 이미지를 따로 열어 구간/샤드를 병렬로 카빙
+    workers 는 이 호출이 쓸 수 있는 최대 프로세스 수 (파티션별 몫)
+    hits 는 extents 와 같은 순서의 미리 구한 시그니처 (구간을 이미 읽은 경우 다시 스캔하지 않음)
+    stream 은 extents 뒤에 이어지는 ((오프셋, 길이), 히트) 를 스캔이 끝나는 대로 내주는 iterable
+    (None 은 아직 없음) → 전체 스캔을 기다리지 않고 끝난 구간부터 샤드 카빙
+    """
+    if ffmpeg_dir_override:
+        os.environ["VIREX_FFMPEG_DIR"] = ffmpeg_dir_override
+
+    base_dir = os.path.abspath(base_dir)
+    results = {"ok": True, "base_dir": base_dir,
+                "visited_dirs": 0, "targets": [],
+                "summary": {"inputs": 0,"carved_total": 0,"rebuilt_total": 0}}
+
+    streams, stream_hits = [], []
+    count = 0
+
+    def _open(off, length):
+        # 이름 번호는 길이 0 구간도 세어 extents/stream 순서와 맞춤 (재시작 시 일지의 bin 이름과 일치)
+        nonlocal count
+        count += 1
+        if length <= 0:
+            return None
+        st = ExtentStream(reader, [(off, length)], name=os.path.join(base_dir, f"{count:03d}@0x{off:X}"),
+                          window=window or WINDOW_SIZE)
+        streams.append(st)
+        return st
+
+    for i, (off, length) in enumerate(extents):
+        if _open(off, length) is not None:
+            stream_hits.append(hits[i] if hits else None)
+
+    def _arrivals():
+        for entry in stream:
+            if entry is None:
+                yield None
+                continue
+            (off, length), seg_hits = entry
+            st = _open(off, length)
+            if st is not None:
+                yield st, seg_hits
+
+    if not streams and stream is None:
+        return results
+
+    try:
+        r = _carve_sources(list(streams), base_dir, max_files_per_bin=max_files_per_bin,
+                           journal=journal, image_path=image_path, workers=workers,
+                           hits=stream_hits if hits else None,
+                           stream=_arrivals() if stream is not None else None)
+        results["targets"].append(r)
+        results["summary"]["inputs"] += r.get("inputs", 0)
+        results["summary"]["carved_total"] += r.get("carved_total", 0)
+        results["summary"]["rebuilt_total"] += r.get("rebuilt_total", 0)
+    except Exception as e:
+        logger.exception("carve_extents failed on %s", base_dir)
+        results["targets"].append({"ok": False,"dir": base_dir,"error": str(e)})
+    finally:
+        for st in streams:
+            st.close()
+    return results
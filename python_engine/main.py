@@ -3,10 +3,13 @@ import os
 import sys
 import json
 import shutil
+import tempfile
+import multiprocessing
 from typing import Optional, List, Iterable, Set
 from python_engine.core.image_loader.e01_parser import extract_videos_from_e01
 from python_engine.core.output.download_frame import download_frames
 from python_engine.core.image_loader.single_video_parser import extract_from_single_video
+from python_engine.core.analyzer.triage import triage_local_file
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
@@ -46,6 +49,10 @@ def main(e01_path: str,
 
     tmp_json_path: Optional[str] = None
     output_dir: Optional[str] = None
+    # 지정 시 해당 폴더를 출력 폴더로 재사용 (inventory.json 등 이전 실행 결과 활용)
+    reuse_dir = os.environ.get("VIREX_OUTPUT_DIR") or None
+    # 'inventory': 복구 없이 목록/손상/슬랙 추정만 빠르게 (analysis.json 형식)
+    inventory_only = choice == 'inventory'
 
     ext = os.path.splitext(e01_path)[1].lower()
     is_cached_analysis = (
@@ -59,6 +66,14 @@ def main(e01_path: str,
         with open(tmp_json_path, "r", encoding="utf-8") as rf:
             results = json.load(rf)
         total_files = len(results)
+    elif ext in ('.mp4', '.avi', '.jdr') and inventory_only:
+        results = [triage_local_file(e01_path)]
+        output_dir = reuse_dir or tempfile.mkdtemp(prefix="Virex_")
+        total_files = len(results)
+        os.makedirs(output_dir, exist_ok=True)
+        tmp_json_path = os.path.join(output_dir, "analysis.json")
+        with open(tmp_json_path, "w", encoding="utf-8") as wf:
+            json.dump(results, wf, ensure_ascii=False, indent=2)
     elif ext in ('.mp4', '.avi', '.jdr'):
         results, output_dir, total_files = extract_from_single_video(e01_path)
         if total_files == 0 or not results:
@@ -69,7 +84,9 @@ def main(e01_path: str,
         with open(tmp_json_path, "w", encoding="utf-8") as wf:
             json.dump(results, wf, ensure_ascii=False, indent=2)
     else:
-        results, output_dir, total_files = extract_videos_from_e01(e01_path)
+        results, output_dir, total_files = extract_videos_from_e01(
+            e01_path, output_dir=reuse_dir, mode="inventory" if inventory_only else "full"
+        )
         if total_files == 0 or not results:
             print(json.dumps([]), flush=True)
             return
@@ -82,7 +99,7 @@ def main(e01_path: str,
         os.makedirs(download_dir, exist_ok=True)
 
     print(json.dumps({"analysisPath": tmp_json_path}), flush=True)
-    if not choice or not download_dir:
+    if inventory_only or not choice or not download_dir:
         return
 
     if choice in ("video", "both"):
@@ -217,13 +234,18 @@ def main(e01_path: str,
         download_frames(items, download_dir=download_dir)
         print("프레임 저장 완료.", file=sys.stderr)
 
-    if (choice and download_dir) and (not is_cached_analysis):
+    if (choice and download_dir) and (not is_cached_analysis) and (not reuse_dir):
         shutil.rmtree(output_dir, ignore_errors=True)
         print(f"모든 파일이 '{download_dir}'에 저장되었고, 임시 폴더를 정리했습니다.", file=sys.stderr)
 
 if __name__ == "__main__":
+    # PyInstaller 빌드에서 추출 워커 프로세스 실행 지원
+    multiprocessing.freeze_support()
     if len(sys.argv) == 2:
         main(sys.argv[1])
+    elif len(sys.argv) == 3:
+        _, e01_path, choice = sys.argv
+        main(e01_path, choice)
     elif len(sys.argv) == 4:
         _, e01_path, choice, download_dir = sys.argv
         main(e01_path, choice, download_dir, None)
@@ -0,0 +1,47 @@
+import itertools
+import os
+import sys
+import types
+
+# 엔진 코드는 python_engine.* 절대 경로로 import 하므로 저장소 루트를 경로에 추가
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+
+def _stub_module(name, **attrs):
+    # 네이티브 확장(pytsk3/pyewf)이 없는 CI 에서도 import 가 되도록 하는 최소 대체 모듈
+    # 테스트는 이미지 핸들을 직접 만들지 않고, 필요한 곳은 monkeypatch 로 바꿔 씀
+    # TSK_* 같은 상수는 서로 다른 비트 값으로 채움 (import 시점의 | 연산/비교용)
+    mod = types.ModuleType(name)
+    mod.__dict__.update(attrs)
+    bits = (1 << n for n in itertools.count())
+    consts = {}
+
+    def __getattr__(attr):
+        if attr.startswith("__"):
+            raise AttributeError(attr)
+        if attr not in consts:
+            consts[attr] = next(bits)
+        return consts[attr]
+    mod.__getattr__ = __getattr__
+    return mod
+
+
+class _ImgInfo:
+    def __init__(self, *args, **kwargs):
+        pass
+
+
+def _unavailable(*args, **kwargs):
+    raise OSError("image library not installed")
+
+
+for _name, _attrs in (
+    ("pytsk3", {"Img_Info": _ImgInfo, "Volume_Info": _unavailable, "FS_Info": _unavailable}),
+    ("pyewf", {"handle": _unavailable, "glob": lambda path: [path]}),
+):
+    try:
+        __import__(_name)
+    except ImportError:
+        sys.modules[_name] = _stub_module(_name, **_attrs)
@@ -0,0 +1,101 @@
+import json
+
+import pytest
+
+from python_engine.core.recovery.utils import disk_budget
+from python_engine.core.recovery.utils.disk_budget import DiskBudget, DiskBudgetExceeded
+
+MB = 1024 * 1024
+
+
+def _budget(monkeypatch, free, base_free=100 * MB, budget_bytes=50 * MB, reserve=10 * MB):
+    b = DiskBudget("/", base_free, budget_bytes=budget_bytes, reserve_bytes=reserve)
+    state = {"free": free}
+    monkeypatch.setattr(b, "_free", lambda: state["free"])
+    monkeypatch.setattr(disk_budget, "POLL_SECONDS", 0.01)
+    return b, state
+
+
+def _events(capsys):
+    return [json.loads(l) for l in capsys.readouterr().out.splitlines() if l.startswith("{")]
+
+
+def test_admit_counts_written(monkeypatch):
+    b, _ = _budget(monkeypatch, free=100 * MB)
+    b.wait_for(5 * MB, "carve")
+    b.wait_for(1 * MB, "carve")
+    b.wait_for(2 * MB, "original")
+    assert b.written == {"carve": 6 * MB, "original": 2 * MB}
+
+
+def test_limits_use_measured_usage(monkeypatch):
+    # 사용량 = 시작 여유 공간 - 현재 여유 공간 (written 합계는 판단에 쓰지 않음)
+    b, state = _budget(monkeypatch, free=60 * MB)
+    with pytest.raises(DiskBudgetExceeded):
+        b.wait_for(11 * MB, "carve", wait=False)
+    b.wait_for(10 * MB, "carve", wait=False)
+    state["free"] = 15 * MB
+    with pytest.raises(DiskBudgetExceeded):
+        # reserve 10MB 를 침범
+        b.wait_for(6 * MB, "carve", wait=False)
+
+
+def test_no_wait_fails_immediately(monkeypatch, capsys):
+    monkeypatch.setenv("VIREX_BUDGET_WAIT_S", "60")
+    b, _ = _budget(monkeypatch, free=20 * MB)
+    with pytest.raises(DiskBudgetExceeded):
+        b.wait_for(20 * MB, "original", wait=False)
+    assert [e["state"] for e in _events(capsys)] == ["rejected"]
+    assert not b.exhausted
+
+
+def test_timeout_then_fail_fast_until_space_returns(monkeypatch, capsys):
+    monkeypatch.setenv("VIREX_BUDGET_WAIT_S", "0")
+    b, state = _budget(monkeypatch, free=20 * MB)
+    with pytest.raises(DiskBudgetExceeded):
+        b.wait_for(20 * MB, "dump")
+    assert b.exhausted
+    with pytest.raises(DiskBudgetExceeded):
+        b.wait_for(20 * MB, "dump")
+    assert [e["state"] for e in _events(capsys)] == ["paused", "timeout", "rejected"]
+
+    # 공간이 생기면 다시 허용하고 소진 상태 해제
+    state["free"] = 90 * MB
+    b.wait_for(20 * MB, "dump")
+    assert not b.exhausted
+
+
+def test_wait_resumes_when_space_frees(monkeypatch, capsys):
+    monkeypatch.setenv("VIREX_BUDGET_WAIT_S", "5")
+    b, state = _budget(monkeypatch, free=20 * MB)
+    sleeps = []
+
+    def _sleep(s):
+        sleeps.append(s)
+        state["free"] = 90 * MB
+    monkeypatch.setattr(disk_budget.time, "sleep", _sleep)
+    b.wait_for(20 * MB, "carve")
+    assert sleeps
+    # 허용 후 주기적 usage 보고가 이어질 수 있음
+    assert [e["state"] for e in _events(capsys)][:2] == ["paused", "resumed"]
+
+
+def test_release_removes_intermediate(tmp_path, monkeypatch):
+    b, _ = _budget(monkeypatch, free=100 * MB)
+    p = tmp_path / "001.bin"
+    p.write_bytes(b"x" * 10)
+    assert b.release(str(p), "dump") == 10
+    assert not p.exists() and b.freed == {"dump": 10}
+
+    monkeypatch.setenv("VIREX_KEEP_INTERMEDIATE", "1")
+    p.write_bytes(b"x")
+    assert b.release(str(p), "dump") == 0 and p.exists()
+
+
+def test_peers_flag(monkeypatch):
+    monkeypatch.delenv("VIREX_BUDGET_PEERS", raising=False)
+    assert not disk_budget.budget_has_peers()
+    disk_budget.set_budget_peers(True)
+    assert disk_budget.budget_has_peers()
+    disk_budget.set_budget_peers(False)
+    assert not disk_budget.budget_has_peers()
@@ -0,0 +1,692 @@
+import os
+import hashlib
+import json
+import struct
+from concurrent.futures import Future
+from types import SimpleNamespace
+
+import pytest
+
+from python_engine.core.image_loader import e01_parser
+from python_engine.core.recovery.utils.disk_budget import budget_has_peers
+
+
+def _fat(values):
+    return struct.pack(f"<{len(values)}I", *values)
+
+
+@pytest.fixture(params=["numpy", "array"])
+def free_runs(request, monkeypatch):
+    # numpy 경로와 미설치 시 경로가 같은 결과를 내야 함
+    if request.param == "array":
+        monkeypatch.setattr(e01_parser, "np", None)
+    elif e01_parser.np is None:
+        pytest.skip("numpy 미설치")
+
+    def run(fat):
+        starts, lengths = e01_parser._fat32_free_runs(fat)
+        return [(int(s), int(n)) for s, n in zip(starts, lengths)]
+    return run
+
+
+def test_fat32_free_runs_basic(free_runs):
+    # 클러스터 0/1 은 예약, 2 부터 판정
+    fat = _fat([0x0FFFFFF8, 0xFFFFFFFF, 0, 0, 5, 0x0FFFFFFF, 0, 0, 0, 7])
+    assert free_runs(fat) == [(2, 2), (6, 3)]
+
+
+def test_fat32_free_runs_ignores_reserved_bits(free_runs):
+    # 상위 4비트는 예약 → 하위 28비트가 0 이면 빈 클러스터
+    fat = _fat([0, 0, 0xF0000000, 0x10000000, 3, 0])
+    assert free_runs(fat) == [(2, 2), (5, 1)]
+
+
+def test_fat32_free_runs_edges(free_runs):
+    assert free_runs(_fat([0, 0])) == []
+    assert free_runs(_fat([0, 0, 1, 1])) == []
+    assert free_runs(_fat([0, 0, 0, 0, 0])) == [(2, 3)]
+    # 4바이트가 안 되는 꼬리는 무시
+    assert free_runs(_fat([0, 0, 0]) + b"\x00\x00") == [(2, 1)]
+
+
+def test_resume_output_dir_is_stable(tmp_path):
+    img = tmp_path / "a.E01"
+    img.write_bytes(b"x" * 10)
+    base = str(tmp_path / "tmp")
+    first = e01_parser._resume_output_dir(base, str(img))
+    assert first == e01_parser._resume_output_dir(base, str(img))
+    assert first.startswith(base) and "Virex_" in first
+
+    # 이미지가 바뀌면 다른 폴더 → 이전 일지를 이어 쓰지 않음
+    img.write_bytes(b"y" * 11)
+    assert e01_parser._resume_output_dir(base, str(img)) != first
+
+
+BLOCK = 512
+
+
+def _image(*parts):
+    # parts: (종류, 블록 수) — "z" 0x00, "f" 0xFF, "d" 데이터
+    out = bytearray()
+    for kind, n in parts:
+        if kind == "z":
+            out += bytes(n * BLOCK)
+        elif kind == "f":
+            out += b"\xff" * (n * BLOCK)
+        else:
+            out += bytes((i * 7 + 1) % 251 for i in range(n * BLOCK))
+    return bytes(out)
+
+
+@pytest.fixture(params=[3, 64])
+def segments(request, monkeypatch):
+    # 작은 읽기 단위로 청크 경계에 걸친 균일 구간도 확인
+    monkeypatch.setattr(e01_parser, "UNIFORM_SCAN_CHUNK", request.param * BLOCK)
+
+    def run(data, offset=0, min_skip=4 * BLOCK):
+        img = bytes(offset) + data
+        chunks = {}
+
+        def on_data(seg_no, buf):
+            chunks.setdefault(seg_no, bytearray()).extend(buf)
+
+        segs, skipped = e01_parser.nonuniform_segments(
+            lambda o, n: img[o:o + n], offset, len(data), BLOCK, min_skip=min_skip, on_data=on_data)
+        # on_data 로 넘긴 데이터는 각 구간의 원본과 같아야 함
+        assert sorted(chunks) == list(range(len(segs)))
+        for k, (o, n) in enumerate(segs):
+            assert bytes(chunks[k]) == img[o:o + n]
+        assert skipped == len(data) - sum(n for _, n in segs)
+        return segs, skipped
+    return run
+
+
+def test_nonuniform_trims_edges(segments):
+    data = _image(("z", 5), ("d", 3), ("f", 2))
+    assert segments(data) == ([(5 * BLOCK, 3 * BLOCK)], 7 * BLOCK)
+
+
+def test_nonuniform_keeps_short_gaps(segments):
+    # min_skip 미만의 중간 균일 구간은 구간에 포함 (영상 내부 0 패딩)
+    data = _image(("d", 2), ("z", 3), ("d", 1))
+    assert segments(data) == ([(0, 6 * BLOCK)], 0)
+
+
+def test_nonuniform_splits_long_gaps(segments):
+    data = _image(("d", 2), ("z", 2), ("f", 3), ("d", 4), ("z", 1))
+    assert segments(data) == ([(0, 2 * BLOCK), (7 * BLOCK, 4 * BLOCK)], 6 * BLOCK)
+
+
+def test_nonuniform_absolute_offsets(segments):
+    data = _image(("z", 1), ("d", 1))
+    assert segments(data, offset=3 * BLOCK) == ([(4 * BLOCK, BLOCK)], BLOCK)
+
+
+def test_nonuniform_all_uniform(segments):
+    data = _image(("z", 4), ("f", 4))
+    assert segments(data) == ([], 8 * BLOCK)
+
+
+def test_uniform_runs_numpy_matches_fallback(monkeypatch):
+    if e01_parser.np is None:
+        pytest.skip("numpy 미설치")
+    data = _image(("z", 2), ("d", 1), ("f", 3), ("d", 2), ("z", 1)) + b"\x00" * 100
+    expected = e01_parser._uniform_runs(data, BLOCK)
+    monkeypatch.setattr(e01_parser, "np", None)
+    assert e01_parser._uniform_runs(data, BLOCK) == expected
+    # 블록에 못 미치는 꼬리는 데이터로 취급
+    assert [u for u, _, _ in expected] == [True, False, True, False, True, False]
+    assert expected[-1][1:] == (9 * BLOCK, len(data))
+
+
+def _subtract(runs, exclude):
+    starts, lengths = e01_parser._subtract_cluster_runs(
+        [s for s, _ in runs], [n for _, n in runs], exclude)
+    return list(zip(starts, lengths))
+
+
+def test_subtract_cluster_runs():
+    runs = [(2, 10), (20, 5)]
+    assert _subtract(runs, []) == runs
+    # 가운데 / 앞 / 뒤 / 전체
+    assert _subtract(runs, [(5, 2)]) == [(2, 3), (7, 5), (20, 5)]
+    assert _subtract(runs, [(0, 4)]) == [(4, 8), (20, 5)]
+    assert _subtract(runs, [(10, 12)]) == [(2, 8), (22, 3)]
+    assert _subtract(runs, [(2, 10)]) == [(20, 5)]
+
+
+def test_subtract_cluster_runs_unsorted_and_overlapping():
+    runs = [(100, 50)]
+    exclude = [(130, 5), (105, 10), (110, 10), (149, 3)]
+    assert _subtract(runs, exclude) == [(100, 5), (120, 10), (135, 14)]
+    # 빈 구간 밖의 제외 구간은 영향 없음
+    assert _subtract(runs, [(0, 100), (150, 10)]) == runs
+
+
+def test_skip_fat_recovered(capsys):
+    entries = [
+        {"path": "/a.mp4", "deleted": True, "offset": 4096},
+        {"path": "/b.mp4", "deleted": False, "offset": 8192},
+        {"path": "/c.mp4", "deleted": True, "offset": 12288},
+        {"path": "/d.mp4", "offset": 8192},
+    ]
+    kept = e01_parser._skip_fat_recovered(None, entries, {4096, 8192}, partition=2)
+    # 할당 파일은 오프셋이 같아도 유지, deleted 키가 없는 예전 항목은 확인 대상
+    assert [it["path"] for it in kept] == ["/b.mp4", "/c.mp4"]
+    assert '"skipped": 2' in capsys.readouterr().out
+
+
+def test_fs_unalloc_resume_skips_scan(tmp_path, monkeypatch):
+    from python_engine.core.image_loader.journal import ExtractionJournal
+
+    segs = [{"offset": 4096, "byte_len": 8192, "clusters": [10, 11]},
+            {"offset": 65536, "byte_len": 4096, "clusters": [24, 24]}]
+    calls = {"dump": [], "carve": []}
+
+    def fake_dump(*a, sink=None, resume_after=None, **k):
+        calls["dump"].append(resume_after)
+        todo = [dict(it, index=n) for n, it in enumerate(segs, start=1)
+                if resume_after is None or it["offset"] >= resume_after]
+        for it in todo:
+            sink(it, None)
+        return {"ok": True, "chunks": len(todo), "bytes": sum(it["byte_len"] for it in todo),
+                "skipped": 0, "items": todo}
+
+    def carve(stop_after=None):
+        def fake_carve(reader, extents, base_dir, stream=None, **k):
+            got = []
+            for entry in stream:
+                if entry is None:
+                    continue
+                got.append(entry[0])
+                if len(got) == stop_after:
+                    raise RuntimeError("stop")
+            calls["carve"].append((list(extents), got))
+            os.makedirs(base_dir, exist_ok=True)
+            return {"summary": {"carved_total": 2, "rebuilt_total": 0}, "targets": []}
+        return fake_carve
+
+    monkeypatch.setattr(e01_parser, "dump_unalloc_fat32", fake_dump)
+    path = str(tmp_path / "journal_p2.jsonl")
+
+    def run(fake_carve):
+        monkeypatch.setattr(e01_parser.vol_carver, "carve_extents", fake_carve)
+        with ExtractionJournal(path, {"image": 1}) as j:
+            e01_parser._carve_fs_unalloc(None, "img", 2, 2048, str(tmp_path), False, [], None, 1, j)
+
+    # 첫 구간을 카빙으로 넘긴 뒤 중단 → 다음 실행은 기록된 구간은 바로 카빙하고 그 뒤부터 이어서 스캔
+    run(carve(stop_after=1))
+    run(carve())
+    assert calls["dump"] == [None, 4096 + 8192]
+    assert calls["carve"] == [([(4096, 8192)], [(65536, 4096)])]
+    with ExtractionJournal(path, {"image": 1}) as j:
+        assert [it["index"] for it in j.stage("fs_unalloc_scan")["items"]] == [1, 2]
+
+    # 카빙까지 끝났으면 스캔/카빙 모두 생략
+    run(carve())
+    assert len(calls["dump"]) == 2 and len(calls["carve"]) == 1
+
+
+def test_fs_unalloc_scan_error_keeps_segments(tmp_path, monkeypatch):
+    from python_engine.core.image_loader.journal import ExtractionJournal
+
+    def fake_dump(*a, sink=None, **k):
+        sink({"index": 1, "offset": 4096, "byte_len": 512}, None)
+        raise OSError("read error")
+
+    def fake_carve(reader, extents, base_dir, stream=None, **k):
+        # carve_extents 처럼 스트림 오류는 결과에 남기고 반환
+        try:
+            list(stream)
+        except OSError as e:
+            return {"summary": {"carved_total": 0, "rebuilt_total": 0}, "targets": [{"ok": False, "error": str(e)}]}
+
+    monkeypatch.setattr(e01_parser, "dump_unalloc_fat32", fake_dump)
+    monkeypatch.setattr(e01_parser.vol_carver, "carve_extents", fake_carve)
+    path = str(tmp_path / "journal_p2.jsonl")
+    with ExtractionJournal(path, {"image": 1}) as j:
+        e01_parser._carve_fs_unalloc(None, "img", 2, 2048, str(tmp_path), False, [], None, 1, j)
+        assert j.stage("fs_unalloc") is None and j.stage("fs_unalloc_scan") is None
+        assert j.segments("fs_unalloc_scan") == [{"index": 1, "offset": 4096, "byte_len": 512}]
+
+
+def test_image_file_size_sums_split_segments(tmp_path):
+    for n, size in ((1, 100), (2, 50), (3, 7)):
+        (tmp_path / f"card.{n:03d}").write_bytes(b"\0" * size)
+    assert e01_parser._image_file_size(str(tmp_path / "card.001")) == 157
+
+    single = tmp_path / "card.dd"
+    single.write_bytes(b"\0" * 33)
+    assert e01_parser._image_file_size(str(single)) == 33
+
+
+def test_inventory_mode_skips_verify_and_cache(tmp_path, monkeypatch):
+    calls = []
+
+    class _Img:
+        def get_size(self):
+            return 0
+
+    monkeypatch.setattr(e01_parser, "open_image_file", lambda path: _Img())
+    monkeypatch.setattr(e01_parser.pytsk3, "Volume_Info", lambda img: [])
+    monkeypatch.setattr(e01_parser, "_image_file_size", lambda path: 0)
+    # 예산 초기화는 환경 변수를 남기므로 다른 테스트에 새지 않게 대체
+    monkeypatch.setattr(e01_parser, "init_disk_budget", lambda path: None)
+    monkeypatch.setattr(e01_parser, "start_image_verify", lambda path: calls.append("verify"))
+    monkeypatch.setattr(e01_parser, "get_result_cache", lambda: calls.append("cache"))
+
+    e01_parser.extract_videos_from_e01("card.E01", output_dir=str(tmp_path / "inv"), mode="inventory")
+    assert calls == []
+
+    e01_parser.extract_videos_from_e01("card.E01", output_dir=str(tmp_path / "full"))
+    assert calls == ["verify", "cache"]
+
+
+class _EwfHandle:
+    def __init__(self, data):
+        self.data = data
+        self.pos = 0
+        self.reads = []
+
+    def seek(self, offset):
+        self.pos = offset
+
+    def read(self, size):
+        self.reads.append((self.pos, size))
+        buf = self.data[self.pos:self.pos + size]
+        self.pos += len(buf)
+        return buf
+
+    def get_media_size(self):
+        return len(self.data)
+
+
+def test_ewf_block_cache_reads_and_hits():
+    data = os.urandom(10 * 1024 + 100)
+    handle = _EwfHandle(data)
+    img = e01_parser.EWFImgInfo(handle, cache_bytes=4 * 1024, block_size=1024)
+
+    # 블록 경계를 걸친 읽기, 끝부분 짧은 블록
+    assert img.read(1000, 100) == data[1000:1100]
+    assert img.read(10 * 1024 - 10, 200) == data[10 * 1024 - 10:]
+    assert img.cache_misses == 4 and img.cache_hits == 0
+
+    reads = len(handle.reads)
+    assert img.read(1030, 10) == data[1030:1040]
+    assert len(handle.reads) == reads and img.cache_hits == 1
+
+    # 용량(4 블록) 초과 시 가장 오래 안 쓴 블록부터 버림
+    img.read(3 * 1024, 2 * 1024)
+    assert img.cache_stats()["blocks"] == 4
+    assert 0 not in img._cache and 1 in img._cache
+
+
+def test_ewf_large_reads_bypass_cache():
+    data = os.urandom(e01_parser.EWF_CACHE_BYPASS + 10)
+    handle = _EwfHandle(data)
+    img = e01_parser.EWFImgInfo(handle, cache_bytes=1024 * 1024, block_size=1024)
+    assert img.read(5, e01_parser.EWF_CACHE_BYPASS) == data[5:5 + e01_parser.EWF_CACHE_BYPASS]
+    assert handle.reads == [(5, e01_parser.EWF_CACHE_BYPASS)]
+    assert img.cache_stats()["blocks"] == 0
+
+    off = e01_parser.EWFImgInfo(handle, cache_bytes=0)
+    assert off.read(0, 10) == data[:10] and off.cache_misses == 0
+
+
+class _TskFile:
+    def __init__(self, data, fail_at=None):
+        self.data = data
+        self.fail_at = fail_at
+        self.info = SimpleNamespace(meta=SimpleNamespace(size=len(data)))
+        self.max_read = 0
+
+    def read_random(self, offset, size):
+        if self.fail_at is not None and offset >= self.fail_at:
+            raise OSError("read error")
+        self.max_read = max(self.max_read, size)
+        return self.data[offset:offset + size]
+
+
+def test_extract_file_content_streams_in_chunks(tmp_path, monkeypatch):
+    monkeypatch.setattr(e01_parser, "get_disk_budget", lambda: None)
+    monkeypatch.delenv("VIREX_HASH", raising=False)
+    data = os.urandom(10_000)
+    src = _TskFile(data)
+    out = tmp_path / "a.mp4"
+    digests = {}
+    assert e01_parser.extract_file_content(src, str(out), chunk_size=1024, digests=digests) == len(data)
+    assert out.read_bytes() == data
+    assert src.max_read <= 1024
+    assert digests == {"md5": hashlib.md5(data).hexdigest(), "sha256": hashlib.sha256(data).hexdigest()}
+
+
+def test_extract_file_content_keeps_data_before_read_error(tmp_path, monkeypatch):
+    monkeypatch.setattr(e01_parser, "get_disk_budget", lambda: None)
+    data = os.urandom(8192)
+    out = tmp_path / "b.avi"
+    written = e01_parser.extract_file_content(_TskFile(data, fail_at=4096), str(out), chunk_size=1024)
+    assert written == 4096 and out.read_bytes() == data[:4096]
+
+
+class _Attr(list):
+    def __init__(self, runs, type_=None, name=None, flags=0):
+        super().__init__(runs)
+        self.info = SimpleNamespace(type=e01_parser._DATA_ATTR_TYPES[0] if type_ is None else type_,
+                                    name=name, flags=flags)
+
+
+class _FsFile(list):
+    def __init__(self, size, attrs):
+        super().__init__(attrs)
+        self.info = SimpleNamespace(meta=SimpleNamespace(size=size))
+
+
+def _run(addr, length, flags=0):
+    return SimpleNamespace(addr=addr, len=length, flags=flags)
+
+
+_FS = SimpleNamespace(info=SimpleNamespace(block_size=512, offset=1000))
+
+
+def test_file_data_runs_merges_and_truncates():
+    f = _FsFile(2000, [_Attr([_run(10, 2), _run(12, 1), _run(20, 4), _run(30, 1)])])
+    # 10~12 는 인접 → 하나로 합치고 마지막 run 은 파일 크기에 맞춰 자름, 남는 run 은 무시
+    assert e01_parser.file_data_runs(_FS, f) == [(1000 + 10 * 512, 1536), (1000 + 20 * 512, 464)]
+
+
+def test_file_data_runs_unsupported_layouts():
+    assert e01_parser.file_data_runs(_FS, _FsFile(0, [_Attr([_run(1, 1)])])) is None
+    resident = _Attr([_run(1, 1)], flags=e01_parser._ATTR_UNSUPPORTED)
+    assert e01_parser.file_data_runs(_FS, _FsFile(100, [resident])) is None
+    sparse = _Attr([_run(0, 1, flags=e01_parser._RUN_SKIP_FLAGS)])
+    assert e01_parser.file_data_runs(_FS, _FsFile(100, [sparse])) is None
+    # run 합계가 파일 크기보다 작으면 read_random 사용
+    assert e01_parser.file_data_runs(_FS, _FsFile(2000, [_Attr([_run(1, 1)])])) is None
+    # 이름 있는 속성(ADS)은 건너뜀
+    assert e01_parser.file_data_runs(_FS, _FsFile(100, [_Attr([_run(1, 1)], name=b"ads")])) is None
+
+
+def test_data_run_file_reads_across_runs():
+    image = os.urandom(64 * 1024)
+    img_info = SimpleNamespace(read=lambda off, size: image[off:off + size])
+    runs = [(4096, 1000), (20000, 3000), (9000, 500)]
+    expected = b"".join(image[off:off + n] for off, n in runs)
+    tsk_file = SimpleNamespace(info=SimpleNamespace(meta=SimpleNamespace(size=len(expected))), addr=7)
+    f = e01_parser.DataRunFile(tsk_file, img_info, runs)
+    assert f.read_random(0, len(expected)) == expected
+    assert f.read_random(900, 200) == expected[900:1100]
+    assert f.read_random(3900, 1000) == expected[3900:]
+    assert f.addr == 7
+
+
+class _ScheduleFs:
+    def __init__(self, first_clusters):
+        self.info = _FS.info
+        self.first_clusters = first_clusters
+        self.opened = []
+
+    def open_meta(self, inode):
+        self.opened.append(inode)
+        addr = self.first_clusters[inode]
+        if addr is None:
+            return _FsFile(100, [])
+        return _FsFile(100, [_Attr([_run(0, 1, flags=e01_parser._RUN_SKIP_FLAGS), _run(addr, 1)])])
+
+
+def _inventory(n):
+    return [{"name": f"{i}.mp4", "path": f"/v/{i}.mp4", "inode": i, "size": 100, "category": "v"}
+            for i in range(n)]
+
+
+def test_extraction_schedule_orders_by_first_cluster():
+    fs = _ScheduleFs({0: 50, 1: None, 2: 7, 3: 20})
+    inv = _inventory(4)
+    # sparse/filler run 은 건너뛰고 첫 실제 클러스터 기준, 오프셋 모르는 항목은 맨 뒤
+    assert [seq for seq, _ in e01_parser._extraction_schedule(fs, inv)] == [2, 3, 0, 1]
+    assert inv[2]["offset"] == 1000 + 7 * 512 and inv[1]["offset"] is None
+
+    # 저장된 offset 은 다시 구하지 않음
+    fs.opened.clear()
+    e01_parser._extraction_schedule(fs, inv)
+    assert fs.opened == []
+
+
+def test_scheduled_extraction_keeps_inventory_order(monkeypatch):
+    fs = _ScheduleFs({0: 30, 1: 10, 2: 20})
+    calls = []
+
+    def process(fs_info, item, output_dir, img_info=None):
+        calls.append(item["inode"])
+        return {"name": item["name"]}
+    monkeypatch.setattr(e01_parser, "SCHEDULE_BY_OFFSET", True)
+    monkeypatch.setattr(e01_parser, "_process_video_entry", process)
+    results = e01_parser.extract_video_files(fs, "out", inventory=_inventory(3), workers=1)
+    assert calls == [1, 2, 0]
+    assert [r["name"] for r in results] == ["0.mp4", "1.mp4", "2.mp4"]
+
+
+class _InlinePool:
+    # ProcessPoolExecutor 대신 제출 즉시 현재 프로세스에서 실행 (break_after 번째 제출부터 풀 중단)
+    break_after = None
+
+    def __init__(self, max_workers, initializer=None, initargs=()):
+        self.submitted = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def submit(self, fn, *args):
+        if self.break_after is not None and self.submitted >= self.break_after:
+            raise e01_parser.BrokenProcessPool("worker died")
+        self.submitted += 1
+        fut = Future()
+        try:
+            fut.set_result(fn(*args))
+        except Exception as e:
+            fut.set_exception(e)
+        return fut
+
+
+def _patch_extract(monkeypatch, where):
+    def run(item, output_dir, *rest):
+        if item["inode"] == 3:
+            raise ValueError("corrupt")
+        where.append(item["inode"])
+        return {"name": item["name"]}
+    monkeypatch.setattr(e01_parser, "_extract_entry_in_worker", lambda item, out: run(item, out))
+    monkeypatch.setattr(e01_parser, "_process_video_entry",
+                        lambda fs_info, item, out, img_info=None: run(item, out))
+
+
+def test_parallel_extraction_keeps_order_and_skips_failures(monkeypatch, capsys):
+    ran = []
+    _patch_extract(monkeypatch, ran)
+    monkeypatch.setattr(e01_parser, "ProcessPoolExecutor", _InlinePool)
+    inv = _inventory(6)
+    schedule = list(reversed(list(enumerate(inv))))
+    progress = [0]
+    results = e01_parser._extract_video_files_parallel(
+        None, "out", inv, len(inv), progress, "img.E01", 0, workers=2, partition=1, schedule=schedule)
+    assert ran == [5, 4, 2, 1, 0]
+    assert [r["name"] for r in results] == ["0.mp4", "1.mp4", "2.mp4", "4.mp4", "5.mp4"]
+    events = [json.loads(l) for l in capsys.readouterr().out.splitlines()]
+    assert progress == [6] and events[-1] == {"processed": 6, "total": 6, "partition": 1}
+
+
+def test_parallel_extraction_falls_back_when_pool_breaks(monkeypatch):
+    ran = []
+    _patch_extract(monkeypatch, ran)
+    monkeypatch.setattr(_InlinePool, "break_after", 2)
+    monkeypatch.setattr(e01_parser, "ProcessPoolExecutor", _InlinePool)
+    inv = _inventory(5)
+    results = e01_parser._extract_video_files_parallel(
+        None, "out", inv, len(inv), [0], "img.E01", 0, workers=2)
+    assert sorted(ran) == [0, 1, 2, 4]
+    assert [r["name"] for r in results] == ["0.mp4", "1.mp4", "2.mp4", "4.mp4"]
+
+
+def test_choose_workers(monkeypatch):
+    monkeypatch.setenv("VIREX_WORKERS", "3")
+    assert e01_parser._choose_workers() == 3
+    monkeypatch.delenv("VIREX_WORKERS")
+    monkeypatch.setattr(e01_parser.os, "cpu_count", lambda: 32)
+    assert e01_parser._choose_workers(max_cap=8) == 8
+    monkeypatch.setattr(e01_parser.os, "cpu_count", lambda: 1)
+    assert e01_parser._choose_workers() == 1
+
+
+def _dir_entry(name, inode=0, size=0, is_dir=False, deleted=False, meta=True):
+    tsk = e01_parser.pytsk3
+    info = SimpleNamespace(name=SimpleNamespace(name=name.encode()), meta=None)
+    if meta:
+        info.meta = SimpleNamespace(
+            type=tsk.TSK_FS_META_TYPE_DIR if is_dir else 0, addr=inode, size=size,
+            crtime=1, mtime=2, atime=None, flags=tsk.TSK_FS_META_FLAG_UNALLOC if deleted else 0)
+    return SimpleNamespace(info=info)
+
+
+class _TreeFs:
+    def __init__(self, tree):
+        self.tree = tree
+        self.listed = []
+
+    def open_dir(self, path):
+        self.listed.append(path)
+        return self.tree[path]
+
+
+def test_build_video_inventory_single_walk():
+    fs = _TreeFs({
+        "/": [_dir_entry("."), _dir_entry(".."), _dir_entry("a.MP4", 5, 100),
+              _dir_entry("DCIM", is_dir=True), _dir_entry("note.txt", 6, 1), _dir_entry("orphan.avi", meta=False)],
+        "/DCIM": [_dir_entry("x.jdr", 9, 300, deleted=True), _dir_entry("y.avi", 10, 50)],
+    })
+    inv = e01_parser.build_video_inventory(fs)
+    assert fs.listed == ["/", "/DCIM"]
+    assert [(i["path"], i["inode"], i["category"], i["deleted"]) for i in inv] == [
+        ("/a.MP4", 5, "root", False), ("/DCIM/x.jdr", 9, "DCIM", True), ("/DCIM/y.avi", 10, "DCIM", False)]
+    assert inv[0]["size"] == 100 and inv[0]["mtime"] == 2 and inv[0]["atime"] == 0
+
+
+def test_inventory_round_trip_is_tied_to_image(tmp_path):
+    img = tmp_path / "card.E01"
+    img.write_bytes(b"x" * 10)
+    parts = {"p1": [{"name": "a.mp4", "inode": 5}]}
+    e01_parser.save_inventory(str(tmp_path), str(img), parts)
+    assert e01_parser.load_inventory(str(tmp_path), str(img)) == parts
+
+    # 같은 출력 폴더라도 이미지가 바뀌면 다시 순회
+    img.write_bytes(b"x" * 11)
+    assert e01_parser.load_inventory(str(tmp_path), str(img)) == {}
+    assert e01_parser.load_inventory(str(tmp_path / "none"), str(img)) == {}
+
+
+class _Volume(list):
+    def __init__(self, parts, block_size=512):
+        super().__init__(SimpleNamespace(start=s, len=n, flags=f) for s, n, f in parts)
+        self.info = SimpleNamespace(block_size=block_size)
+
+
+def test_volume_gap_extents():
+    unalloc = e01_parser.pytsk3.TSK_VS_PART_FLAG_UNALLOC
+    vol = _Volume([(0, 1, 0), (1, 2047, unalloc), (2048, 4096, 0), (6144, 100, unalloc)])
+    image_size = 8192 * 512
+    # 마지막 미할당 항목과 파티션 테이블 뒤 남은 영역은 하나로 합침
+    assert e01_parser.volume_gap_extents(vol, image_size, min_size=0) == [
+        (512, 2047 * 512), (6144 * 512, 2048 * 512)]
+    assert e01_parser.volume_gap_extents(vol, image_size, min_size=1024 * 1024) == [(6144 * 512, 2048 * 512)]
+    # 테이블이 이미지보다 크게 잡혀 있으면 이미지 크기로 자름
+    assert e01_parser.volume_gap_extents(vol, 6200 * 512, min_size=0) == [(512, 2047 * 512), (6144 * 512, 56 * 512)]
+
+
+def test_carve_volume_gaps_writes_index(tmp_path, monkeypatch, capsys):
+    img = tmp_path / "card.dd"
+    img.write_bytes(b"\0" * 4096)
+    seen = {}
+
+    def carve(img_info, extents, root, **kw):
+        seen.update(extents=extents, root=root, image_path=kw["image_path"])
+        return {"summary": {"carved_total": 1, "rebuilt_total": 0}, "targets": ["a.mp4"]}
+    monkeypatch.setattr(e01_parser.vol_carver, "carve_extents", carve)
+    out = tmp_path / "out"
+    out.mkdir()
+    e01_parser._carve_volume_gaps(None, str(img), [(1024, 2048)], str(out))
+
+    assert seen == {"extents": [(1024, 2048)], "root": str(out / "volume_gaps"), "image_path": str(img)}
+    index = json.loads((out / "volume_gaps" / "carved_index.json").read_text())
+    assert index["gaps"] == [{"offset": 1024, "byte_len": 2048}]
+    events = [json.loads(l) for l in capsys.readouterr().out.splitlines()]
+    assert [e["event"] for e in events] == ["volume_gaps", "carved_done"]
+    assert events[1]["partition"] == "volume_gaps"
+
+
+def test_partitions_run_concurrently_and_merge_in_order(tmp_path, monkeypatch):
+    img = tmp_path / "card.E01"
+    img.write_bytes(b"\0" * 16)
+    parts = [SimpleNamespace(addr=0, start=0, flags=0)] + [
+        SimpleNamespace(addr=a, start=a * 100, flags=0) for a in (2, 3, 4)]
+    jobs = []
+
+    def job(path, part, output_dir, entries, dump_unalloc, part_workers):
+        jobs.append((part["addr"], part_workers, budget_has_peers()))
+        if part["addr"] == 3:
+            raise OSError("bad partition")
+        return [{"p": part["addr"]}], 10 * part["addr"], [{"inode": part["addr"]}]
+
+    monkeypatch.setattr(e01_parser, "open_image_file", lambda path: SimpleNamespace(get_size=lambda: 0))
+    monkeypatch.setattr(e01_parser.pytsk3, "Volume_Info", lambda img_info: parts, raising=False)
+    monkeypatch.setattr(e01_parser, "_image_file_size", lambda path: 0)
+    monkeypatch.setattr(e01_parser, "init_disk_budget", lambda path: None)
+    monkeypatch.setattr(e01_parser, "start_image_verify", lambda path: None)
+    monkeypatch.setattr(e01_parser, "get_result_cache", lambda: None)
+    monkeypatch.setattr(e01_parser, "CARVE_GAPS", False)
+    monkeypatch.setattr(e01_parser, "ProcessPoolExecutor", _InlinePool)
+    monkeypatch.setattr(e01_parser, "_run_partition_job", job)
+    monkeypatch.setenv("VIREX_WORKERS", "6")
+
+    results, out, total = e01_parser.extract_videos_from_e01(str(img), output_dir=str(tmp_path / "out"))
+    # 시작 섹터 0 항목은 제외, 워커 6 개를 파티션 3 개가 2 개씩 나눠 씀
+    assert sorted(jobs) == [(2, 2, True), (3, 2, True), (4, 2, True)]
+    assert not budget_has_peers()
+    # 실패한 파티션만 빠지고 결과는 파티션 순서대로
+    assert results == [{"p": 2}, {"p": 4}] and total == 60
+    saved = e01_parser.load_inventory(out, str(img))
+    assert sorted(saved) == ["2@200", "4@400"]
+
+
+def test_process_entry_reuses_cached_result(tmp_path, monkeypatch):
+    from python_engine.core.image_loader.result_cache import ResultCache
+
+    data = os.urandom(5000)
+    cache = ResultCache(str(tmp_path / "cache"), 1 << 30, 86400)
+    fs = SimpleNamespace(open_meta=lambda inode: _TskFile(data))
+    item = {"name": "a.mp4", "path": "/v/a.mp4", "inode": 5, "size": len(data), "category": "v",
+            "crtime": 1, "mtime": 2}
+    handled = []
+
+    def handle(name, filepath, file_obj, output_dir, category):
+        handled.append(output_dir)
+        path = os.path.join(output_dir, category, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(data)
+        return {"name": name, "path": path, "hashes": {"md5": "old"}}
+    monkeypatch.setattr(e01_parser, "get_result_cache", lambda: cache)
+    monkeypatch.setattr(e01_parser, "_handle_video_file", handle)
+
+    first = e01_parser._process_video_entry(fs, item, str(tmp_path / "run1"))
+    second = e01_parser._process_video_entry(fs, item, str(tmp_path / "run2"))
+    # 두 번째 실행은 처리 없이 캐시 사본을 새 출력 폴더로 복원, 해시는 이번에 읽은 내용으로
+    assert handled == [str(tmp_path / "run1")]
+    assert second["path"] == str(tmp_path / "run2" / "v" / "a.mp4")
+    assert open(second["path"], "rb").read() == data
+    assert second["hashes"]["sha256"] == hashlib.sha256(data).hexdigest()
+    assert first["hashes"] == {"md5": "old"}
+
+    # 내용이 바뀌면 다른 키 → 다시 처리
+    data = data[:-1] + bytes([data[-1] ^ 1])
+    e01_parser._process_video_entry(fs, item, str(tmp_path / "run3"))
+    assert len(handled) == 2
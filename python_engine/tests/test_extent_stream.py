@@ -0,0 +1,118 @@
+import os
+
+from python_engine.core.recovery.vol_recover.extent_stream import ExtentStream
+
+
+class _Reader:
+    def __init__(self, data):
+        self.data = data
+        self.calls = 0
+
+    def read(self, offset, size):
+        self.calls += 1
+        return self.data[offset:offset + size]
+
+
+def _stream(data, extents, window=16):
+    flat = b"".join(data[o:o + n] for o, n in extents)
+    return ExtentStream(_Reader(data), extents, window=window), flat
+
+
+def test_find_across_extent_boundary():
+    data = bytearray(os.urandom(256))
+    # 첫 구간 끝 2바이트 + 두 번째 구간 앞 2바이트에 걸친 패턴
+    data[30:32] = b"AB"
+    data[100:102] = b"CD"
+    st, flat = _stream(bytes(data), [(0, 32), (100, 50)])
+    assert flat.find(b"ABCD") == 30
+    assert st.find(b"ABCD") == 30
+    assert st.physical_offset(30) == 30
+    assert st.physical_offset(32) == 100
+
+
+def test_find_matches_bytes_find():
+    data = os.urandom(4096)
+    extents = [(7, 40), (300, 3), (1000, 97), (2000, 500)]
+    st, flat = _stream(data, extents, window=32)
+    for sub in (flat[38:44], flat[41:45], flat[140:150], flat[-5:], b"\x00\x00\x01"):
+        for start in (0, 5, 39, 43, 100):
+            assert st.find(sub, start) == flat.find(sub, start)
+            assert st.find(sub, start, start + 60) == flat.find(sub, start, start + 60)
+
+
+def test_find_respects_end_on_seam():
+    data = bytes(range(64))
+    st, flat = _stream(data, [(0, 16), (32, 16)], window=8)
+    # 창/구간 경계에 걸친 매치라도 end 를 넘으면 찾지 않음
+    sub = flat[14:18]
+    assert st.find(sub) == 14
+    assert st.find(sub, 0, 17) == -1
+    assert st.find(sub, 0, 18) == 14
+
+
+def test_slices_and_read_across_extents():
+    data = os.urandom(1024)
+    extents = [(10, 20), (500, 30), (900, 100)]
+    st, flat = _stream(data, extents, window=16)
+    assert len(st) == len(flat)
+    assert st[:] == flat
+    assert st[15:60] == flat[15:60]
+    assert st[45] == flat[45]
+    assert st.read(18, 40) == flat[18:58]
+    assert b"".join(st.iter_range(5, 140, chunk=17)) == flat[5:140]
+
+
+def test_direct_mmap_matches_windowed(tmp_path):
+    import mmap
+
+    data = os.urandom(8192)
+    path = tmp_path / "img.dd"
+    path.write_bytes(data)
+
+    class _Mapped(_Reader):
+        # RawImgInfo.segment 와 같은 의미: 단일 mmap 안이면 (mmap, 시작)
+        def __init__(self, data, mm):
+            super().__init__(data)
+            self.mm = mm
+
+        def segment(self, offset, size):
+            return self.mm, offset
+
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        reader = _Mapped(data, mm)
+        direct = ExtentStream(reader, [(1000, 5000)], window=64)
+        plain, flat = _stream(data, [(1000, 5000)], window=64)
+        assert direct.direct == (mm, 1000)
+        assert plain.direct is None
+        assert direct[10:300] == plain[10:300] == flat[10:300]
+        assert direct[77] == plain[77]
+        sub = flat[4000:4006]
+        assert direct.find(sub) == plain.find(sub) == flat.find(sub)
+        assert direct.find(sub, 0, 4005) == -1
+        assert b"".join(bytes(b) for b in direct.iter_range(3, 4999, chunk=700)) == flat[3:4999]
+        assert reader.calls == 0
+        direct.close()
+
+
+class _ViewReader(_Reader):
+    # RawImgInfo 처럼 복사 없는 view 를 함께 제공하는 reader
+    def __init__(self, data):
+        super().__init__(data)
+        self.views = 0
+
+    def view(self, offset, size):
+        self.views += 1
+        return memoryview(self.data)[offset:offset + size]
+
+
+def test_view_reader_is_preferred():
+    data = os.urandom(1024)
+    extents = [(10, 100), (500, 200)]
+    reader = _ViewReader(data)
+    st = ExtentStream(reader, extents, window=64)
+    flat = data[10:110] + data[500:700]
+    got = st.read(90, 40)
+    assert isinstance(got, bytes) and got == flat[90:130]
+    assert st[95:180] == flat[95:180]
+    assert st.find(flat[98:106]) == flat.find(flat[98:106])
+    assert reader.views and not reader.calls
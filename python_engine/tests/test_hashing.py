@@ -0,0 +1,33 @@
+import hashlib
+import io
+
+from python_engine.core.recovery.utils.hashing import HashingWriter, StreamHasher, hashing_enabled
+
+
+def test_stream_hasher_matches_hashlib():
+    data = bytes(range(256)) * 1000
+    h = StreamHasher()
+    for a in range(0, len(data), 7777):
+        h.update(memoryview(data)[a:a + 7777])
+    assert h.hexdigests() == {
+        "md5": hashlib.md5(data).hexdigest(),
+        "sha256": hashlib.sha256(data).hexdigest(),
+    }
+
+
+def test_hashing_writer_hashes_what_is_written():
+    out = io.BytesIO()
+    w = HashingWriter(out)
+    w.write(b"abc")
+    w.write(b"def")
+    assert out.getvalue() == b"abcdef"
+    assert w.hexdigests()["sha256"] == hashlib.sha256(b"abcdef").hexdigest()
+    # 그 밖의 속성은 감싼 파일로 위임
+    assert w.getvalue() == b"abcdef"
+
+
+def test_hashing_can_be_disabled(monkeypatch):
+    monkeypatch.delenv("VIREX_HASH", raising=False)
+    assert hashing_enabled()
+    monkeypatch.setenv("VIREX_HASH", "0")
+    assert not hashing_enabled()
@@ -0,0 +1,85 @@
+import hashlib
+import json
+
+from python_engine.core.image_loader import image_verify
+from python_engine.core.image_loader.image_verify import ImageVerifier, start_image_verify
+
+MEDIA = bytes(range(256)) * 4096
+
+
+class _Handle:
+    def __init__(self, stored, media=MEDIA):
+        self.stored = stored
+        self.media = media
+        self.closed = False
+
+    def open(self, paths):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def get_hash_value(self, name):
+        return self.stored.get(name)
+
+    def get_media_size(self):
+        return len(self.media)
+
+    def read_buffer_at_offset(self, size, offset):
+        return self.media[offset:offset + size]
+
+
+def _verify(monkeypatch, capsys, handle, chunk=100_000):
+    monkeypatch.setattr(image_verify.pyewf, "handle", lambda: handle, raising=False)
+    monkeypatch.setattr(image_verify.pyewf, "glob", lambda path: [path], raising=False)
+    v = ImageVerifier("card.E01", chunk=chunk)
+    # 스레드 없이 바로 실행
+    v.run()
+    events = [json.loads(l) for l in capsys.readouterr().out.splitlines() if l.startswith("{")]
+    assert handle.closed
+    return v.result, events
+
+
+def test_matching_hashes(monkeypatch, capsys):
+    handle = _Handle({"MD5": hashlib.md5(MEDIA).hexdigest().upper(),
+                      "SHA1": hashlib.sha1(MEDIA).hexdigest().encode()})
+    result, events = _verify(monkeypatch, capsys, handle)
+    assert result["state"] == "done" and result["match"] and result["mismatched"] == []
+    assert result["bytes"] == result["total"] == len(MEDIA)
+    assert [e["state"] for e in events][0] == "start" and events[-1]["state"] == "done"
+
+
+def test_mismatch_is_reported(monkeypatch, capsys):
+    handle = _Handle({"MD5": hashlib.md5(MEDIA).hexdigest(), "SHA1": "ab" * 20})
+    result, _ = _verify(monkeypatch, capsys, handle)
+    assert not result["match"] and result["mismatched"] == ["sha1"]
+
+
+def test_short_read_is_not_a_match(monkeypatch, capsys):
+    handle = _Handle({"MD5": hashlib.md5(MEDIA).hexdigest()})
+    handle.read_buffer_at_offset = lambda size, offset: MEDIA[offset:offset + size] if offset < 200_000 else b""
+    result, _ = _verify(monkeypatch, capsys, handle)
+    assert not result["match"] and result["bytes"] < result["total"]
+
+
+def test_no_stored_hash_is_skipped(monkeypatch, capsys):
+    # 0 으로만 채워진 값은 저장 해시가 없는 것으로 봄
+    result, _ = _verify(monkeypatch, capsys, _Handle({"MD5": "0" * 32}))
+    assert result == {"state": "skipped", "reason": "no_stored_hash"}
+
+
+def test_cancel(monkeypatch, capsys):
+    handle = _Handle({"MD5": hashlib.md5(MEDIA).hexdigest()})
+    monkeypatch.setattr(image_verify.pyewf, "handle", lambda: handle, raising=False)
+    monkeypatch.setattr(image_verify.pyewf, "glob", lambda path: [path], raising=False)
+    v = ImageVerifier("card.E01")
+    v.cancel()
+    v.run()
+    assert v.result["state"] == "cancelled" and v.result["bytes"] == 0
+
+
+def test_start_is_opt_in_and_e01_only(monkeypatch):
+    monkeypatch.delenv("VIREX_VERIFY_IMAGE", raising=False)
+    assert start_image_verify("card.E01") is None
+    monkeypatch.setenv("VIREX_VERIFY_IMAGE", "1")
+    assert start_image_verify("card.001") is None
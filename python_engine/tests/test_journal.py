@@ -0,0 +1,81 @@
+from python_engine.core.image_loader.journal import ExtractionJournal
+
+IDENTITY = {"path": "/img/a.E01", "size": 123, "mtime": 1, "partition": "2:2048"}
+ITEM = {"inode": 42, "path": "/DCIM/a.mp4", "name": "a.mp4"}
+
+
+def test_round_trip(tmp_path):
+    path = str(tmp_path / "journal_p2.jsonl")
+    with ExtractionJournal(path, IDENTITY) as j:
+        assert not j.has_file(ITEM)
+        j.record_file(ITEM, {"name": "a.mp4", "ok": True})
+        j.record_bin("001.bin", {"carved_count": 3})
+
+    with ExtractionJournal(path, IDENTITY) as j:
+        assert j.has_file(ITEM)
+        assert j.file_result(ITEM) == {"name": "a.mp4", "ok": True}
+        assert j.carved_bin("001.bin") == {"carved_count": 3}
+        assert j.carved_bin("002.bin") is None
+        j.record_file(dict(ITEM, inode=43), None)
+
+    # 추가 기록 후 다시 열어도 이전 기록 유지
+    with ExtractionJournal(path, IDENTITY) as j:
+        assert j.has_file(ITEM)
+        assert j.has_file(dict(ITEM, inode=43))
+
+
+def test_truncated_last_line_is_ignored(tmp_path):
+    path = str(tmp_path / "journal.jsonl")
+    with ExtractionJournal(path, IDENTITY) as j:
+        j.record_file(ITEM, {"ok": True})
+    # 기록 도중 중단된 줄
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('{"type": "file", "key": "43:/DCIM/b.m')
+
+    with ExtractionJournal(path, IDENTITY) as j:
+        assert j.has_file(ITEM)
+        j.record_bin("001.bin", {"carved_count": 1})
+
+    with ExtractionJournal(path, IDENTITY) as j:
+        assert j.has_file(ITEM)
+        assert j.carved_bin("001.bin") == {"carved_count": 1}
+
+
+def test_other_image_discards_journal(tmp_path):
+    path = str(tmp_path / "journal.jsonl")
+    with ExtractionJournal(path, IDENTITY) as j:
+        j.record_file(ITEM, {"ok": True})
+        j.record_bin("001.bin", {})
+
+    with ExtractionJournal(path, dict(IDENTITY, mtime=2)) as j:
+        assert not j.has_file(ITEM)
+        assert j.carved_bin("001.bin") is None
+
+    # 새 헤더로 다시 시작했으므로 원래 이미지로 열어도 비어 있음
+    with ExtractionJournal(path, IDENTITY) as j:
+        assert not j.has_file(ITEM)
+
+
+def test_stage_round_trip(tmp_path):
+    path = str(tmp_path / "journal.jsonl")
+    with ExtractionJournal(path, IDENTITY) as j:
+        assert j.stage("fs_unalloc_scan") is None
+        j.record_stage("fs_unalloc_scan", {"ok": True, "items": [{"offset": 4096, "byte_len": 512}]})
+
+    with ExtractionJournal(path, IDENTITY) as j:
+        assert j.stage("fs_unalloc_scan")["items"] == [{"offset": 4096, "byte_len": 512}]
+        assert j.stage("fs_unalloc") is None
+
+
+def test_segment_round_trip(tmp_path):
+    path = str(tmp_path / "journal.jsonl")
+    with ExtractionJournal(path, IDENTITY) as j:
+        assert j.segments("fs_unalloc_scan") == []
+        j.record_segment("fs_unalloc_scan", {"offset": 4096, "byte_len": 512})
+        j.record_segment("fs_unalloc_scan", {"offset": 8192, "byte_len": 1024})
+
+    with ExtractionJournal(path, IDENTITY) as j:
+        assert [s["offset"] for s in j.segments("fs_unalloc_scan")] == [4096, 8192]
+
+    with ExtractionJournal(path, dict(IDENTITY, size=1)) as j:
+        assert j.segments("fs_unalloc_scan") == []
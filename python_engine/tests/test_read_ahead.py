@@ -0,0 +1,70 @@
+import pytest
+
+from python_engine.core.image_loader.read_ahead import ReadAhead
+
+DATA = bytes(range(256)) * 64
+
+
+class _Source:
+    def __init__(self, data=DATA, fail_at=None):
+        self.data = data
+        self.fail_at = fail_at
+        self.calls = []
+
+    def read(self, offset, size):
+        self.calls.append((offset, size))
+        if self.fail_at is not None and offset >= self.fail_at:
+            raise IOError("bad sector")
+        return self.data[offset:offset + size]
+
+
+def _read_all(ra, size=1000, limit=len(DATA)):
+    out = []
+    off = 0
+    while off < limit:
+        buf = ra.read(off, min(size, limit - off))
+        if not buf:
+            break
+        out.append(buf)
+        off += len(buf)
+    return b"".join(out)
+
+
+def test_sequential_reads_are_prefetched():
+    src = _Source()
+    with ReadAhead(src.read, depth=3, limit=len(DATA)) as ra:
+        assert _read_all(ra) == DATA
+        assert ra.prefetched > 0
+
+
+def test_limit_truncates_last_block():
+    src = _Source()
+    with ReadAhead(src.read, depth=2, limit=5500) as ra:
+        assert _read_all(ra, limit=5500) == DATA[:5500]
+    # 선읽기가 limit 너머를 읽지 않음
+    assert all(off + size <= 5500 for off, size in src.calls)
+
+
+def test_random_access_falls_back_to_direct_reads():
+    src = _Source()
+    with ReadAhead(src.read, depth=3) as ra:
+        ra.read(0, 1000)
+        ra.read(1000, 1000)
+        # 순차 패턴이 깨지면 선읽기 결과를 버리고 직접 읽음
+        assert ra.read(7000, 500) == DATA[7000:7500]
+        assert ra.read(100, 10) == DATA[100:110]
+        assert ra.read(110, 10) == DATA[110:120]
+
+
+def test_worker_error_is_raised_to_reader():
+    src = _Source(fail_at=4000)
+    with ReadAhead(src.read, depth=2) as ra:
+        with pytest.raises(IOError, match="bad sector"):
+            _read_all(ra)
+
+
+def test_depth_zero_never_starts_worker():
+    src = _Source()
+    with ReadAhead(src.read, depth=0) as ra:
+        assert _read_all(ra) == DATA
+        assert ra.prefetched == 0 and ra._thread is None
@@ -0,0 +1,77 @@
+import hashlib
+import os
+
+import pytest
+
+from python_engine.core.image_loader import result_cache
+from python_engine.core.image_loader.result_cache import ResultCache, content_digests
+
+ITEM = {"name": "a.mp4", "size": 300_000, "crtime": 1, "mtime": 2}
+
+
+class _File:
+    def __init__(self, data):
+        self.data = data
+
+    def read_random(self, offset, size):
+        return self.data[offset:offset + size]
+
+
+def _key(cache, data, item=ITEM):
+    return cache.file_key(item, content_digests(_File(data), len(data), chunk=4096))
+
+
+def test_content_digests_full_file():
+    data = os.urandom(100_000)
+    d = content_digests(_File(data), len(data), chunk=4096)
+    assert d == {"md5": hashlib.md5(data).hexdigest(), "sha256": hashlib.sha256(data).hexdigest()}
+
+
+def test_key_changes_with_middle_bytes(tmp_path):
+    cache = ResultCache(str(tmp_path), 1 << 30, 86400)
+    data = bytearray(os.urandom(ITEM["size"]))
+    before = _key(cache, bytes(data))
+    # 앞뒤 64KiB 밖(중간)만 바뀌어도 다른 키
+    data[150_000] ^= 0xFF
+    assert _key(cache, bytes(data)) != before
+    assert _key(cache, bytes(data), dict(ITEM, mtime=3)) != _key(cache, bytes(data))
+
+
+def test_store_restore_copies(tmp_path):
+    cache = ResultCache(str(tmp_path / "cache"), 1 << 30, 86400)
+    out, out2 = tmp_path / "out", tmp_path / "out2"
+    (out / "v").mkdir(parents=True)
+    p = out / "v" / "a.mp4"
+    p.write_bytes(b"x" * 100)
+    cache.store("k", {"path": str(p), "hashes": {"md5": "m"}}, str(out))
+
+    # 출력 파일을 제자리에서 고쳐도 캐시 사본은 그대로 (하드 링크 아님)
+    with open(p, "r+b") as f:
+        f.write(b"y")
+    restored = cache.restore("k", str(out2))
+    assert restored["path"] == str(out2 / "v" / "a.mp4")
+    assert open(restored["path"], "rb").read() == b"x" * 100
+    assert cache.restore("missing", str(out2)) is None
+
+
+def test_cache_is_opt_in(tmp_path, monkeypatch):
+    monkeypatch.setenv("VIREX_CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(result_cache, "_cache", None)
+    monkeypatch.delenv("VIREX_CACHE", raising=False)
+    assert result_cache.get_result_cache() is None
+
+    monkeypatch.setattr(result_cache, "_cache", None)
+    monkeypatch.setenv("VIREX_CACHE", "1")
+    assert isinstance(result_cache.get_result_cache(), ResultCache)
+
+
+@pytest.mark.parametrize("age_days, kept", [(0, 1), (40, 0)])
+def test_evict_by_age(tmp_path, age_days, kept):
+    cache = ResultCache(str(tmp_path), 1 << 30, 30 * 86400)
+    out = tmp_path / "out"
+    out.mkdir()
+    cache.store("k", {"x": 1}, str(out))
+    entry = os.path.join(cache.root, "files", "k", "result.json")
+    old = os.path.getmtime(entry) - age_days * 86400
+    os.utime(entry, (old, old))
+    assert cache.evict()["entries"] == kept
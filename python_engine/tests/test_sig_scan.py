@@ -0,0 +1,91 @@
+import random
+
+from python_engine.core.recovery.vol_recover.extent_stream import ExtentStream
+from python_engine.core.recovery.vol_recover.sig_scan import SignatureScanner, scan_signatures
+
+WINDOW = 64
+SIGS = [b"RIFF\x10\x00\x00\x00AVI ", b"\x00\x00\x00\x18ftypisom", b"\x00\x00\x00\x01\x67\x42", b"\x00\x00\x01\x65\x88"]
+
+
+def _sample(seed=3, size=4096):
+    rnd = random.Random(seed)
+    data = bytearray(rnd.randbytes(size))
+    # 창 경계 바로 앞뒤에 시그니처를 걸쳐 둠
+    for w in range(WINDOW, size - 16, WINDOW):
+        sig = SIGS[(w // WINDOW) % len(SIGS)]
+        p = w - rnd.randrange(0, len(sig))
+        data[p:p + len(sig)] = sig
+    return bytes(data)
+
+
+def _expected(data, start=0, end=None):
+    end = len(data) if end is None else end
+    avi = [p for p in range(start, end) if data.startswith(b"RIFF", p) and data[p + 8:p + 12] == b"AVI "]
+    mp4 = [p - 4 for p in range(start, end) if data.startswith(b"ftyp", p) and p >= 4]
+    nal = [p + 3 for p in range(start, end) if data.startswith(b"\x00\x00\x01", p)]
+    return avi, mp4, nal
+
+
+def _hits(out):
+    return out["avi"], out["mp4"], list(out["nal"])
+
+
+def test_scan_finds_hits_across_window_seams():
+    data = _sample()
+    out = scan_signatures(data, window=WINDOW)
+    assert _hits(out) == _expected(data)
+    assert len(out["nal_types"]) == len(out["nal"])
+    assert out["avi"] and out["mp4"] and out["nal"]
+
+
+def test_scan_same_for_any_window():
+    data = _sample(seed=5)
+    base = scan_signatures(data, window=1 << 20)
+    for window in (16, 63, WINDOW, 100):
+        out = scan_signatures(data, window=window)
+        assert _hits(out) == _hits(base)
+        assert list(out["nal_types"]) == list(base["nal_types"])
+
+
+def test_scan_range_counts_hits_by_start():
+    # [start, end) 샤드: 시작 위치만 범위 안이면 경계에 걸쳐도 포함, 샤드를 합치면 전체와 같음
+    data = _sample(seed=7)
+    whole = scan_signatures(data, window=WINDOW)
+    merged = {"avi": [], "mp4": [], "nal": []}
+    for a in range(0, len(data), 1000):
+        part = scan_signatures(data, window=WINDOW, start=a, end=a + 1000)
+        for k in merged:
+            merged[k].extend(part[k])
+    assert (merged["avi"], merged["mp4"], merged["nal"]) == _hits(whole)
+
+
+def test_scan_extent_stream_matches_bytes():
+    data = _sample(seed=9)
+
+    class _Reader:
+        def read(self, offset, size):
+            return data[offset:offset + size]
+
+    st = ExtentStream(_Reader(), [(0, 1000), (1000, len(data) - 1000)], window=128)
+    out = scan_signatures(st, window=WINDOW)
+    ref = scan_signatures(data, window=WINDOW)
+    assert _hits(out) == _hits(ref)
+    assert list(out["nal_types"]) == list(ref["nal_types"])
+
+
+def test_signature_scanner_matches_scan_signatures():
+    data = _sample(seed=11)
+    ref = scan_signatures(data, window=WINDOW)
+    for step in (1, 5, 64, 77, len(data)):
+        sc = SignatureScanner(window=WINDOW)
+        for p in range(0, len(data), step):
+            sc.feed(memoryview(data)[p:p + step])
+        out = sc.finish()
+        assert _hits(out) == _hits(ref)
+        assert list(out["nal_types"]) == list(ref["nal_types"])
+        assert out["bytes"] == len(data)
+
+
+def test_signature_scanner_empty():
+    out = SignatureScanner(window=WINDOW).finish()
+    assert _hits(out) == ([], [], []) and out["bytes"] == 0
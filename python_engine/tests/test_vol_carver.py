@@ -0,0 +1,292 @@
+import hashlib
+import json
+import os
+import random
+import struct
+
+from python_engine.core.recovery.vol_recover import vol_carver
+from python_engine.core.recovery.vol_recover.sig_scan import scan_signatures
+
+MB = 1024 * 1024
+
+
+def test_shard_ranges_cover_source(monkeypatch):
+    monkeypatch.setenv("VIREX_CARVE_SHARD_MB", "2")
+    assert vol_carver._shard_ranges(5 * MB) == [(0, 2 * MB), (2 * MB, 4 * MB), (4 * MB, 5 * MB)]
+    assert vol_carver._shard_ranges(2 * MB) == [(0, 2 * MB)]
+    assert vol_carver._shard_ranges(1) == [(0, 1)]
+    # 빈 소스도 작업 하나 (스캔 결과 없음)
+    assert vol_carver._shard_ranges(0) == [(0, 0)]
+
+
+def test_shard_ranges_default(monkeypatch):
+    monkeypatch.delenv("VIREX_CARVE_SHARD_MB", raising=False)
+    size = vol_carver.CARVE_SHARD_MB * MB
+    assert vol_carver._shard_ranges(size + 1) == [(0, size), (size, size + 1)]
+    monkeypatch.setenv("VIREX_CARVE_SHARD_MB", "0")
+    assert vol_carver._shard_ranges(size) == [(0, size)]
+
+
+def test_shard_hits_split_by_start():
+    hits = scan_signatures(b"".join(_mp4(random.Random(1), 50) for _ in range(6)))
+    shards = [(0, 200), (200, 10_000)]
+    parts = [vol_carver._shard_hits(hits, a, b) for a, b in shards]
+    assert parts[0]["mp4"] + parts[1]["mp4"] == hits["mp4"]
+    assert all(a <= p < b for (a, b), part in zip(shards, parts) for p in part["mp4"])
+    assert vol_carver._shard_hits(None, 0, 10) is None
+
+
+def _mp4(rnd, n):
+    ftyp = struct.pack(">I", 16) + b"ftypisom" + b"\0\0\0\0"
+    moov = struct.pack(">I", 8 + 100) + b"moov" + rnd.randbytes(100)
+    mdat = struct.pack(">I", 8 + n) + b"mdat" + rnd.randbytes(n)
+    return ftyp + moov + mdat
+
+
+def test_max_files_is_per_bin_across_shards(tmp_path, monkeypatch, capsys):
+    # 1MB 샤드 3개에 MP4 가 고루 있어도 bin 전체에서 max_files_per_bin 개만 남음
+    monkeypatch.setenv("VIREX_CARVE_SHARD_MB", "1")
+    monkeypatch.setenv("VIREX_CARVE_WORKERS", "1")
+    # 리빌드(ffprobe/ffmpeg)는 이 테스트 대상이 아님
+    monkeypatch.setattr(vol_carver, "rebuild_carved_videos", lambda *a, **k: [])
+    rnd = random.Random(5)
+    parts, size = [], 0
+    while size < 3 * MB:
+        parts.append(_mp4(rnd, 200_000))
+        size += len(parts[-1])
+    bin_dir = tmp_path / "p2_fs_unalloc"
+    bin_dir.mkdir()
+    (bin_dir / "001.bin").write_bytes(b"".join(parts))
+
+    vol_carver.auto_carve_from_dir(str(bin_dir), max_files_per_bin=3)
+
+    events = [json.loads(l) for l in capsys.readouterr().out.splitlines() if l.startswith("{")]
+    counts = [e for e in events if e.get("event") == "carve_counts"]
+    assert counts and counts[0]["mp4"] == 3
+    starts = [e for e in events if e.get("event") == "carve_start"]
+    shards = vol_carver._shard_ranges(size)
+    assert len(shards) > 1
+    assert [tuple(e["shard"]) for e in starts] == shards
+    carved = [f for f in os.listdir(bin_dir / "carved") if f.lower().endswith(".mp4")]
+    assert len(carved) == 3
+
+
+class _Journal:
+    def __init__(self):
+        self.bins = {}
+
+    def carved_bin(self, name):
+        return None
+
+    def record_bin(self, name, item):
+        self.bins[name] = item
+
+
+class _Budget:
+    # admit 번째 호출까지만 허용, 이후는 공간 부족
+    def __init__(self, admit):
+        self.admit = admit
+        self.calls = 0
+
+    def wait_for(self, nbytes, stage, wait=True):
+        self.calls += 1
+        if self.calls > self.admit:
+            raise vol_carver.DiskBudgetExceeded("full")
+
+    def release(self, path, stage):
+        return 0
+
+
+def test_budget_failure_keeps_other_files(tmp_path, monkeypatch, capsys):
+    monkeypatch.setenv("VIREX_CARVE_WORKERS", "1")
+    monkeypatch.setattr(vol_carver, "rebuild_carved_videos", lambda *a, **k: [])
+    budget = _Budget(admit=2)
+    monkeypatch.setattr(vol_carver, "get_disk_budget", lambda: budget)
+    rnd = random.Random(9)
+    bin_dir = tmp_path / "p2_fs_unalloc"
+    bin_dir.mkdir()
+    (bin_dir / "001.bin").write_bytes(b"".join(_mp4(rnd, 5000) for _ in range(4)))
+    journal = _Journal()
+
+    res = vol_carver.auto_carve_from_dir(str(bin_dir), journal=journal)
+
+    item = journal.bins[str(bin_dir / "001.bin")]
+    # 앞의 2개는 유지, 나머지 2개는 실패로 기록되고 부분 파일은 남지 않음
+    assert res["carved_total"] == 2
+    assert [f["kind"] for f in item["failed"]] == ["mp4", "mp4"]
+    assert sorted(os.listdir(bin_dir / "carved")) == ["carved_fixed_0001.mp4", "carved_fixed_0002.mp4"]
+    out = capsys.readouterr().out
+    assert out.count('"carve_failed"') == 2
+
+
+class _Reader:
+    def __init__(self, data):
+        self.data = data
+
+    def read(self, offset, size):
+        return self.data[offset:offset + size]
+
+
+def _carved_digests(root):
+    out = []
+    for dp, _, files in os.walk(root):
+        out += [open(os.path.join(dp, f), "rb").read() for f in files if f.lower().endswith(".mp4")]
+    return sorted(out)
+
+
+def test_stream_matches_list(tmp_path, monkeypatch):
+    # 스캔이 끝나는 대로 넘어오는 구간(None 은 대기)도 목록으로 한 번에 넘긴 것과 같은 결과
+    monkeypatch.setenv("VIREX_CARVE_WORKERS", "1")
+    monkeypatch.setattr(vol_carver, "rebuild_carved_videos", lambda *a, **k: [])
+    rnd = random.Random(3)
+    data = bytes(4096)
+    extents = []
+    for _ in range(3):
+        seg = b"".join(_mp4(rnd, 3000) for _ in range(2))
+        extents.append((len(data), len(seg)))
+        data += seg + bytes(4096)
+    hits = [scan_signatures(data[o:o + n]) for o, n in extents]
+
+    listed = vol_carver.carve_extents(_Reader(data), extents, str(tmp_path / "list"), hits=hits)
+
+    def stream():
+        for ext, h in zip(extents, hits):
+            yield None
+            yield ext, h
+    journal = _Journal()
+    streamed = vol_carver.carve_extents(_Reader(data), [], str(tmp_path / "stream"),
+                                        journal=journal, stream=stream())
+
+    assert streamed["summary"] == listed["summary"] == {"inputs": 3, "carved_total": 6, "rebuilt_total": 0}
+    assert _carved_digests(tmp_path / "stream") == _carved_digests(tmp_path / "list")
+    assert sorted(os.path.basename(b).split("@")[0] for b in journal.bins) == ["001", "002", "003"]
+
+
+def _nal(header, n):
+    # 4바이트 시작 코드 + NAL 헤더 + 채움 (채움 바이트는 HEVC 헤더로 오인되지 않게 하위 3비트 0)
+    return b"\x00\x00\x00\x01" + header + b"\xa8" * n
+
+
+def _carve_jdr(monkeypatch, path, **kw):
+    calls = []
+
+    def pipe(mm, start, end, codec, out_dir, stem):
+        calls.append((start, end, codec, stem))
+        return None, os.path.join(out_dir, stem + ".mp4"), {"md5": "x"}
+    monkeypatch.setattr(vol_carver, "_pipe_es_to_mp4", pipe)
+    items = vol_carver.carve_jdr_from_bin(str(path), out_dir=str(path.parent / "out"), **kw)
+    return calls, items
+
+
+def test_jdr_segments_on_nal_index(tmp_path, monkeypatch):
+    sps, pps, idr, sl = b"\x67", b"\x68", b"\x65", b"\x41"
+    groups = [[(sps, 10), (pps, 4), (idr, 100), (sl, 100)],
+              [(sps, 10), (pps, 4), (idr, 100), (sl, 50)],
+              [(sps, 10), (pps, 4), (idr, 100), (sl, 50)]]
+    data, sps_at, after_idr = b"\x11" * 7, [], []
+    for g in groups:
+        for k, (h, n) in enumerate(g):
+            if h == sps:
+                sps_at.append(len(data) + 4)
+            if k == 3:
+                after_idr.append(len(data) + 4)
+            data += _nal(h, n)
+    path = tmp_path / "001.bin"
+    path.write_bytes(data)
+
+    calls, items = _carve_jdr(monkeypatch, path, max_total_len=300, name_prefix="p2_")
+    # 첫 IDR 앞 SPS 에서 시작, max_total_len 을 넘긴 IDR 다음 NAL 에서 끊고, 남은 구간은 길이 제한까지
+    assert calls == [(sps_at[0], after_idr[1], "h264", "p2_carved_es_0001"),
+                     (sps_at[2], len(data), "h264", "p2_carved_es_0002")]
+    assert [(it["offset"], it["length"], it["ok"]) for it in items] == [
+        (s, e - s, True) for s, e, _, _ in calls]
+    assert items[0]["es_hashes"] == {"md5": "x"}
+
+    # 미리 만든 인덱스를 넘겨도 같은 분할
+    hits = scan_signatures(data)
+    again, _ = _carve_jdr(monkeypatch, path, max_total_len=300, name_prefix="p2_",
+                          nal_offsets=hits["nal"], nal_types=hits["nal_types"])
+    assert again == calls
+    first, _ = _carve_jdr(monkeypatch, path, max_total_len=300, max_files=1)
+    assert [c[:2] for c in first] == [calls[0][:2]]
+
+
+def test_jdr_detects_hevc(tmp_path, monkeypatch):
+    vps, sps, pps, idr = b"\x40\x01", b"\x42\x01", b"\x44\x01", b"\x26\x01"
+    data = b"".join(_nal(h, 20) for h in (vps, sps, pps, idr, idr))
+    path = tmp_path / "002.bin"
+    path.write_bytes(data)
+    calls, _ = _carve_jdr(monkeypatch, path, max_total_len=10_000)
+    assert calls == [(data.index(sps), len(data), "hevc", "carved_es_0001")]
+
+
+class _Ffmpeg:
+    # subprocess.Popen 대체: stdin 으로 받은 ES 를 그대로 출력 mp4 로 씀
+    code = 0
+    broken_after = None
+
+    def __init__(self, cmd, stdin=None, **kw):
+        assert cmd[cmd.index("-i") + 1] == "pipe:0"
+        self.out = cmd[-1]
+        self.got = bytearray()
+        self.stdin = self
+
+    def write(self, buf):
+        if self.broken_after is not None and len(self.got) + len(buf) > self.broken_after:
+            # 일부만 받고 종료한 ffmpeg
+            self.got += buf[:max(0, self.broken_after - len(self.got))]
+            raise BrokenPipeError()
+        self.got += buf
+
+    def close(self):
+        pass
+
+    def wait(self):
+        if self.code == 0:
+            with open(self.out, "wb") as f:
+                f.write(self.got)
+        return self.code
+
+
+def _pipe(tmp_path, monkeypatch, data, **attrs):
+    for k, v in attrs.items():
+        monkeypatch.setattr(_Ffmpeg, k, v)
+    monkeypatch.setattr(vol_carver.subprocess, "Popen", _Ffmpeg)
+    monkeypatch.delenv("VIREX_KEEP_ES", raising=False)
+    monkeypatch.delenv("VIREX_KEEP_INTERMEDIATE", raising=False)
+    return vol_carver._pipe_es_to_mp4(data, 100, 5000, "h264", str(tmp_path), "es_0001")
+
+
+def test_pipe_es_remuxes_without_es_file(tmp_path, monkeypatch):
+    data = random.Random(2).randbytes(6000)
+    es, mp4, hashes = _pipe(tmp_path, monkeypatch, data)
+    assert es is None and not (tmp_path / "es_0001.h264").exists()
+    assert open(mp4, "rb").read() == data[100:5000]
+    assert hashes["md5"] == hashlib.md5(data[100:5000]).hexdigest()
+
+
+def test_pipe_es_keeps_es_when_asked(tmp_path, monkeypatch):
+    data = random.Random(3).randbytes(6000)
+    monkeypatch.setattr(vol_carver, "_keep_raw_es", lambda: True)
+    es, mp4, _ = _pipe(tmp_path, monkeypatch, data)
+    assert open(es, "rb").read() == open(mp4, "rb").read() == data[100:5000]
+
+
+def test_pipe_es_falls_back_to_raw_es(tmp_path, monkeypatch):
+    data = random.Random(4).randbytes(6000)
+    # ffmpeg 실패 / 중간에 파이프 끊김 → 증거 보존용 원본 ES 저장
+    for attrs in ({"code": 1, "broken_after": None}, {"code": 0, "broken_after": 10}):
+        es, mp4, _ = _pipe(tmp_path, monkeypatch, data, **attrs)
+        assert mp4 is None and open(es, "rb").read() == data[100:5000]
+        assert not (tmp_path / "es_0001.mp4").exists()
+        os.remove(es)
+
+
+def test_pipe_es_without_ffmpeg(tmp_path, monkeypatch):
+    data = random.Random(5).randbytes(6000)
+    monkeypatch.setattr(vol_carver, "_ffmpeg_path", lambda: str(tmp_path / "no-ffmpeg"))
+    monkeypatch.delenv("VIREX_KEEP_ES", raising=False)
+    es, mp4, hashes = vol_carver._pipe_es_to_mp4(data, 0, 6000, "hevc", str(tmp_path), "es_0002")
+    assert mp4 is None and es.endswith(".h265")
+    assert open(es, "rb").read() == data
+    assert hashes["sha256"] == hashlib.sha256(data).hexdigest()
@@ -0,0 +1,76 @@
+import io
+import time
+
+import pytest
+
+from python_engine.core.recovery.utils.write_behind import AsyncFile, open_output
+
+
+class _FailingRaw(io.BytesIO):
+    # n 번째 write 부터 디스크 오류
+    def __init__(self, fail_at):
+        super().__init__()
+        self.fail_at = fail_at
+        self.writes = 0
+
+    def write(self, buf):
+        self.writes += 1
+        if self.writes >= self.fail_at:
+            raise OSError(28, "No space left on device")
+        return super().write(buf)
+
+
+def test_writes_in_order(tmp_path):
+    path = tmp_path / "out.bin"
+    with AsyncFile(str(path)) as f:
+        for n in range(100):
+            f.write(bytes([n]) * 1000)
+    assert path.read_bytes() == b"".join(bytes([n]) * 1000 for n in range(100))
+
+
+def test_external_buffer_is_copied(tmp_path):
+    # 큐에 넣은 뒤 원본 버퍼를 바꿔도 기록 내용은 write() 시점 값
+    path = tmp_path / "out.bin"
+    buf = bytearray(b"a" * 4096)
+    with AsyncFile(str(path)) as f:
+        f.write(memoryview(buf))
+        buf[:] = b"b" * 4096
+    assert path.read_bytes() == b"a" * 4096
+
+
+def test_error_is_raised_to_producer(tmp_path):
+    f = AsyncFile(str(tmp_path / "out.bin"))
+    f.raw.close()
+    f.raw = _FailingRaw(fail_at=2)
+    f.write(b"x" * 10)
+    f.write(b"y" * 10)
+    # 백그라운드 오류는 close() 에서 원래 예외로 한 번 올라옴
+    with pytest.raises(OSError) as exc:
+        f.close()
+    assert exc.value.errno == 28
+
+
+def test_writes_after_error_are_rejected(tmp_path):
+    f = AsyncFile(str(tmp_path / "out.bin"))
+    f.raw.close()
+    f.raw = _FailingRaw(fail_at=1)
+    f.write(b"x")
+    # 기록 스레드가 오류를 남길 때까지 대기
+    deadline = time.time() + 5
+    while f.error is None and time.time() < deadline:
+        time.sleep(0.01)
+    with pytest.raises(OSError) as first:
+        f.write(b"y")
+    assert first.value.errno == 28
+    with pytest.raises(OSError, match="earlier write"):
+        f.write(b"z")
+    f.close()
+
+
+def test_open_output_can_be_disabled(tmp_path, monkeypatch):
+    monkeypatch.setenv("VIREX_WRITE_BEHIND", "0")
+    with open_output(str(tmp_path / "a.bin")) as f:
+        assert not isinstance(f, AsyncFile)
+    monkeypatch.setenv("VIREX_WRITE_BEHIND", "1")
+    with open_output(str(tmp_path / "b.bin")) as f:
+        assert isinstance(f, AsyncFile)